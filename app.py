@@ -1,17 +1,28 @@
 # app.py
-from fastapi import FastAPI, Depends, Request, HTTPException
+from fastapi import FastAPI, Depends, Request, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update
+import asyncio
 import logging
 import os
 
-from db.db import init_db_async, get_db
+from db.db import warm_pool_async, get_db
+from db.presence import seed_online_index, start_presence_flusher, stop_presence_flusher
 from db.models import GameStats, User
-from firebase_utils import initialize_firebase
-from firebase_utils import get_user_from_token
+from db.models.game_stats import GAME_FIELDS, resolve_game_fields, game_columns, serialize_game
+from db.queries import GameFilters, final_games_query, load_game_documents, stitch_page
+from utils.firebase_utils import decode_id_token_async, get_firebase_app
+from utils import fast_json
+from utils.pagination import encode_cursor, decode_cursor
+from utils.response_cache import game_stats_cache, etag_matches
+from utils.invalidation import publish, start_listener, stop_listener
+from utils.user_cache import USER_CHANNEL
+from utils.google_certs import start_cert_refresh, stop_cert_refresh
+from utils.request_logging import RequestLogMiddleware, start_log_listener, stop_log_listener
+from utils.trace_writer import trace_writer
 
 # ✅ Routes
 from routes import (
@@ -26,22 +37,15 @@ from routes import (
     chain_id,
     traffic_route,
     user_wallet,
+    export_routes_async,
+    player_routes_async,
+    leaderboard_routes_async,
+    meta_routes_async,
+    presence_routes_async,
 )
 
-print(f"DATABASE_URL: {os.getenv('DATABASE_URL')}")
-
-class LogRequestMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        print(f"📩 Incoming Request: {request.method} {request.url}")
-        if "authorization" in request.headers:
-            token_preview = request.headers["authorization"][:40]
-            print(f"🔑 Auth Header (first 40 chars): {token_preview}...")
-        else:
-            print("⚠️ No Authorization header present.")
-        return await call_next(request)
-
 app = FastAPI()
-app.add_middleware(LogRequestMiddleware)
+app.add_middleware(RequestLogMiddleware)
 
 # ✅ Add CORS
 app.add_middleware(
@@ -52,13 +56,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ───────────────────────────────────────────────
+# 🚀 Startup: nothing here waits on the network
+# ───────────────────────────────────────────────
+_warmup_task = None
+
+ONLINE_SEED_RETRY = 10
+
+async def warm_up():
+    """Fill the DB pool, initialise Firebase and seed the online index while the worker already serves."""
+    loop = asyncio.get_running_loop()
+    firebase = loop.run_in_executor(None, get_firebase_app)
+    await warm_pool_async()
+    try:
+        await firebase
+    except Exception as e:
+        logging.warning(f"⚠️ Firebase warmup failed, will retry on first use: {e}")
+
+    # online_users reads the database until this succeeds
+    while True:
+        try:
+            seeded = await seed_online_index()
+            logging.info(f"🟢 Online index seeded with {seeded} users.")
+            return
+        except Exception as e:
+            logging.warning(f"🔁 Online index seed failed: {e}")
+            await asyncio.sleep(ONLINE_SEED_RETRY)
+
 @app.on_event("startup")
 async def startup_event():
-    initialize_firebase()
-    await init_db_async()
-    for route in app.routes:
-        if "/user" in route.path:
-            print(f"🔍 {route.methods} → {route.path} [{route.name}]")
+    global _warmup_task
+    start_log_listener()
+    _warmup_task = asyncio.create_task(warm_up())
+    start_listener()
+    start_cert_refresh()
+    start_presence_flusher()
+    presence_routes_async.presence_hub.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    await presence_routes_async.presence_hub.stop()
+    await stop_presence_flusher()
+    await stop_listener()
+    await stop_cert_refresh()
+    trace_writer.stop()
+    stop_log_listener()
 
 # ✅ Register routers
 app.include_router(user_register.router, prefix="/api/user")
@@ -72,31 +116,98 @@ app.include_router(admin_routes_async.router)
 app.include_router(bets.router)
 app.include_router(chain_id.router)
 app.include_router(traffic_route.router)
+app.include_router(export_routes_async.router)
+app.include_router(player_routes_async.router)
+app.include_router(leaderboard_routes_async.router)
+app.include_router(meta_routes_async.router)
+app.include_router(presence_routes_async.router)
 
 @app.get("/")
 def root():
     return {"message": "AoE2 Betting Backend is running!"}
 
+DEFAULT_GAME_PAGE_SIZE = 50
+MAX_GAME_PAGE_SIZE = 200
+
 @app.get("/api/game_stats")
-async def get_game_stats(db_gen=Depends(get_db)):
+async def get_game_stats(
+    request: Request,
+    limit: int = Query(DEFAULT_GAME_PAGE_SIZE, ge=1, le=MAX_GAME_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    fields: str | None = Query(None),
+    filters: GameFilters = Depends(),
+    db_gen=Depends(get_db),
+):
+    """
+    Final games, newest first, one keyset page at a time.
+
+    Pages walk (timestamp, id) backed by ix_game_stats_final_timestamp_id,
+    so any page costs the same regardless of history size. Pass the
+    returned `next` cursor back to fetch the following page.
+
+    Serialized pages are cached per query with a strong ETag until a final
+    is ingested or deleted; a matching If-None-Match gets a 304 without
+    touching the database.
+
+    `fields` is a preset (`summary`, `full`) or a comma-separated list of
+    field names; only those columns are selected and serialized. Full
+    listings stitch the documents pre-encoded at ingest, so no game is
+    decoded or re-encoded on the way out.
+
+    Optional filters (player, civ, winner, map, map_size, played_after,
+    played_before, min_duration, max_duration) combine with all of the
+    above and are each backed by an index on game_stats. `civ` takes a
+    civ name or the parser's numeric civ ID.
+    """
+    try:
+        selected = resolve_game_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cache_key = (limit, cursor, selected, filters)
+    cached = game_stats_cache.get(cache_key)
+    if cached:
+        etag, body = cached
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    generation = game_stats_cache.generation
     try:
         async with db_gen as db:
-            result = await db.execute(
-                select(GameStats)
-                .where(GameStats.is_final == True)
-                .order_by(GameStats.timestamp.desc())
+            full = selected == GAME_FIELDS
+            columns = (
+                [GameStats.document, GameStats.timestamp, GameStats.id]
+                if full else game_columns(selected)
+            )
+            result = await db.execute(final_games_query(columns, filters, position, limit + 1))
+            games = result.all()
+            page, more = games[:limit], len(games) > limit
+
+            # uq_replay_final allows one final row per replay_hash, so every
+            # row Postgres returns here is already unique.
+            logging.getLogger(__name__).info(f"📊 Returning {len(page)} unique games from DB")
+            if full:
+                fragments = await load_game_documents(db, page)
+            else:
+                fragments = [fast_json.dumps(serialize_game(g, selected)) for g in page]
+            body = stitch_page(
+                fragments,
+                encode_cursor(page[-1].timestamp, page[-1].id) if more else None,
             )
-            games = result.scalars().all()
-            unique_games = {}
-            for game in games:
-                if game.replay_hash not in unique_games:
-                    unique_games[game.replay_hash] = game
-
-            logging.getLogger(__name__).info(f"📊 Returning {len(unique_games)} unique games from DB")
-            return [g.to_dict() for g in unique_games.values()]
     except Exception as e:
         logging.error(f"❌ Failed to fetch game stats: {e}", exc_info=True)
-        return []
+        return {"games": [], "next": None}
+
+    etag = game_stats_cache.put(cache_key, body, generation)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 # ✅ NEW: Link Wallet Route
 @app.post("/api/user/link_wallet")
@@ -113,7 +224,10 @@ async def link_wallet(request: Request, db: AsyncSession = Depends(get_db)):
             raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
 
         token = auth_header.split("Bearer ")[1]
-        user_info = get_user_from_token(token)
+        try:
+            user_info = await decode_id_token_async(token)
+        except Exception:
+            user_info = None
         if not user_info or "uid" not in user_info:
             raise HTTPException(status_code=401, detail="Invalid Firebase token")
 
@@ -130,6 +244,7 @@ async def link_wallet(request: Request, db: AsyncSession = Depends(get_db)):
             .where(User.id == user.id)
             .values(wallet_address=address)
         )
+        await publish(db, USER_CHANNEL, user.uid)
         await db.commit()
         return {"message": "Wallet linked successfully"}
     except Exception as e:
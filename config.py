@@ -1,7 +1,10 @@
 import json
 import os
+import logging
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 env_loaded = False
 
@@ -13,7 +16,7 @@ override_path = os.path.join(BASE_DIR, ".env.override")
 if ENV != "production" and os.path.exists(override_path):
     load_dotenv(dotenv_path=override_path)
     env_loaded = True
-    print("✅ Loaded override from .env.override (dev only)")
+    logger.info("✅ Loaded override from .env.override (dev only)")
 
 # ✅ 2. Load env-specific file (production/dev/etc)
 if not env_loaded:
@@ -27,15 +30,15 @@ if not env_loaded:
     if os.path.exists(env_path):
         load_dotenv(dotenv_path=env_path)
         env_loaded = True
-        print(f"✅ Loaded environment: {ENV} from {env_file}")
+        logger.info(f"✅ Loaded environment: {ENV} from {env_file}")
     else:
-        print(f"⚠️ No env file found for {ENV}. Proceeding with defaults.")
+        logger.warning(f"⚠️ No env file found for {ENV}. Proceeding with defaults.")
 
 # ✅ 3. Load .env.local last, but only in dev mode
 local_path = os.path.join(BASE_DIR, ".env.local")
 if ENV == "development" and os.path.exists(local_path):
     load_dotenv(dotenv_path=local_path, override=True)
-    print("✅ Loaded .env.local (final override layer for dev)")
+    logger.info("✅ Loaded .env.local (final override layer for dev)")
 
 # --- Exports ---
 def get_fastapi_api_url():
@@ -59,7 +62,7 @@ def load_config():
     except Exception as e:
         raise RuntimeError(f"❌ Failed to load config.json: {e}")
 
-# ✅ Debug print
-print(f"🚀 ENV is: {ENV}")
-print(f"🌐 FASTAPI_API_URL is: {os.getenv('FASTAPI_API_URL')}")
-print(f"🐘 DATABASE_URL: {os.getenv('DATABASE_URL')}")
+# ✅ Debug output (logging, so workers don't pay for it unless asked)
+logger.debug(f"🚀 ENV is: {ENV}")
+logger.debug(f"🌐 FASTAPI_API_URL is: {os.getenv('FASTAPI_API_URL')}")
+logger.debug(f"🐘 DATABASE_URL: {os.getenv('DATABASE_URL')}")
@@ -65,6 +65,34 @@ async def init_db_async():
             logging.error(f"❌ DB init failed: {e}")
             raise
 
+# ────────────────────────────────────────────────────────────────
+# 🔥 Background pool warmup (startup never waits on the database)
+# ────────────────────────────────────────────────────────────────
+WARM_CONNECTIONS = int(os.getenv("DB_WARM_CONNECTIONS", "5"))
+
+async def warm_pool_async(connections: int = WARM_CONNECTIONS, retries: int = 5):
+    """
+    Open `connections` pooled connections concurrently so the first requests
+    after a restart skip the TCP/TLS/auth handshake. Failures are logged and
+    retried; requests simply connect on demand in the meantime.
+    """
+    from sqlalchemy import text
+
+    async def touch():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    for attempt in range(retries):
+        try:
+            await asyncio.gather(*(touch() for _ in range(connections)))
+            logging.info(f"🔥 Warmed {connections} pooled DB connections.")
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"🔁 DB pool warmup failed ({attempt + 1}/{retries}): {e}")
+            await asyncio.sleep(2)
+
 # ────────────────────────────────────────────────────────────────
 # 🤝 DB Session Dependency
 # ────────────────────────────────────────────────────────────────
@@ -0,0 +1,178 @@
+# db/ingest.py
+
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import select, func, Integer, String, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import GameStats, User, PlayerStats, HeadToHead, CivMetaRollup
+from db.models.civ_meta import version_bucket, month_bucket
+from db.models.game_player import game_player_rows
+from db.models.player_stats import RECENT_FORM_LENGTH
+from db.ratings import rate_final
+from utils.civs import civ_name
+from utils.rating import split_sides
+
+# ───────────────────────────────────────────────
+# 🏁 Derived tables written alongside each final
+# ───────────────────────────────────────────────
+async def linked_uids(db: AsyncSession, names) -> dict:
+    """Map in-game names to registered users' uids."""
+    names = [n for n in set(names) if n]
+    if not names:
+        return {}
+    result = await db.execute(
+        select(User.in_game_name, User.uid).where(User.in_game_name.in_(names))
+    )
+    return dict(result.all())
+
+
+def _player_names(game: GameStats):
+    return (p.get("name") for p in game.players or [] if isinstance(p, dict))
+
+
+def _bump_counter(column, key: str, amount: int):
+    """`column || {key: column[key] + amount}` on a JSONB object of counters."""
+    # A text key: `->>` with an integer is an array index and yields NULL here
+    key = literal(str(key), String)
+    current = func.coalesce(column.op("->>")(key).cast(Integer), 0)
+    return column.op("||")(func.jsonb_build_object(key, current + amount))
+
+
+def player_stats_upsert(game: GameStats, player):
+    """Add one game to a player's counters, creating the row on first sight."""
+    civ = civ_name(player.civilization)
+    won = 1 if player.winner else 0
+    has_duration = game.duration is not None
+    stmt = pg_insert(PlayerStats).values(
+        name=player.name,
+        games=1,
+        wins=won,
+        duration_total=game.duration if has_duration else 0,
+        duration_games=1 if has_duration else 0,
+        civ_games={civ: 1},
+        civ_wins={civ: won},
+        recent_form="W" if won else "L",
+        last_played_on=game.played_on,
+        updated_at=datetime.utcnow(),
+    )
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[PlayerStats.name],
+        set_={
+            "games": PlayerStats.games + excluded.games,
+            "wins": PlayerStats.wins + excluded.wins,
+            "duration_total": PlayerStats.duration_total + excluded.duration_total,
+            "duration_games": PlayerStats.duration_games + excluded.duration_games,
+            "civ_games": _bump_counter(PlayerStats.civ_games, civ, 1),
+            "civ_wins": _bump_counter(PlayerStats.civ_wins, civ, won),
+            "recent_form": func.left(excluded.recent_form + PlayerStats.recent_form, RECENT_FORM_LENGTH),
+            "last_played_on": func.greatest(PlayerStats.last_played_on, excluded.last_played_on),
+            "updated_at": excluded.updated_at,
+        },
+    )
+
+
+def head_to_head_rows(game: GameStats, players) -> list:
+    """
+    One head_to_head increment per (winner, loser) pair in both
+    orientations; teammates are not opponents. Shared with
+    scripts/rebuild_head_to_head.py so both count the same pairs.
+    """
+    winners, losers = split_sides(
+        {"name": p.name, "winner": p.winner} for p in players
+    )
+    has_duration = game.duration is not None
+    now = datetime.utcnow()
+    rows = []
+    for winner in winners:
+        for loser in losers:
+            for player, opponent, won in ((winner, loser, 1), (loser, winner, 0)):
+                rows.append({
+                    "player": player,
+                    "opponent": opponent,
+                    "games": 1,
+                    "wins": won,
+                    "losses": 1 - won,
+                    "duration_total": game.duration if has_duration else 0,
+                    "duration_games": 1 if has_duration else 0,
+                    "last_played_on": game.played_on,
+                    "updated_at": now,
+                })
+    return rows
+
+
+def head_to_head_upsert(game: GameStats, players):
+    """Add the game's head_to_head_rows; None when the game has no two sides."""
+    rows = head_to_head_rows(game, players)
+    if not rows:
+        return None
+    # Sorted keys give every ingest the same row-lock order
+    rows.sort(key=lambda r: (r["player"], r["opponent"]))
+    stmt = pg_insert(HeadToHead).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[HeadToHead.player, HeadToHead.opponent],
+        set_={
+            "games": HeadToHead.games + excluded.games,
+            "wins": HeadToHead.wins + excluded.wins,
+            "losses": HeadToHead.losses + excluded.losses,
+            "duration_total": HeadToHead.duration_total + excluded.duration_total,
+            "duration_games": HeadToHead.duration_games + excluded.duration_games,
+            "last_played_on": func.greatest(HeadToHead.last_played_on, excluded.last_played_on),
+            "updated_at": excluded.updated_at,
+        },
+    )
+
+
+def civ_meta_upsert(game: GameStats, players):
+    """Add a final's civ picks and wins to its (map, civ, version, month) rollup rows."""
+    picks, wins = Counter(), Counter()
+    for player in players:
+        civ = civ_name(player.civilization)
+        picks[civ] += 1
+        wins[civ] += 1 if player.winner else 0
+    if not picks:
+        return None
+    key = {
+        "map": ((game.map or {}).get("name") or "Unknown")[:100],
+        "version": version_bucket(game.game_version),
+        "month": month_bucket(game.played_on, game.timestamp),
+    }
+    stmt = pg_insert(CivMetaRollup).values([
+        {**key, "civilization": civ, "picks": picks[civ], "wins": wins[civ]}
+        for civ in sorted(picks)
+    ])
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            CivMetaRollup.map, CivMetaRollup.civilization,
+            CivMetaRollup.version, CivMetaRollup.month,
+        ],
+        set_={
+            "picks": CivMetaRollup.picks + excluded.picks,
+            "wins": CivMetaRollup.wins + excluded.wins,
+        },
+    )
+
+
+async def record_final(db: AsyncSession, game: GameStats) -> None:
+    """
+    Write everything derived from a final inside the ingest transaction.
+    `game` must already be flushed so its id is set.
+    """
+    uids = await linked_uids(db, _player_names(game))
+    players = game_player_rows(game, uids)
+    db.add_all(players)
+
+    # Fixed lock order so concurrent ingests sharing players cannot deadlock
+    for player in sorted(players, key=lambda p: p.name):
+        await db.execute(player_stats_upsert(game, player))
+
+    for upsert in (head_to_head_upsert(game, players), civ_meta_upsert(game, players)):
+        if upsert is not None:
+            await db.execute(upsert)
+
+    await rate_final(db, game, players)
@@ -1,5 +1,14 @@
 from .base import Base
 from .user import User
 from .game_stats import GameStats
+from .game_player import GamePlayer
+from .player_stats import PlayerStats
+from .rating import PlayerRating, RatingEvent, RatingTreeNode
+from .head_to_head import HeadToHead
+from .civ_meta import CivMetaRollup
 
-__all__ = ["Base", "User", "GameStats"]
+__all__ = [
+    "Base", "User", "GameStats", "GamePlayer", "PlayerStats",
+    "PlayerRating", "RatingEvent", "RatingTreeNode", "HeadToHead",
+    "CivMetaRollup",
+]
@@ -0,0 +1,33 @@
+# db/models/civ_meta.py
+
+from datetime import date, datetime
+from sqlalchemy import Column, String, Integer, Date
+from .base import Base
+
+
+class CivMetaRollup(Base):
+    """
+    Civ picks and wins per (map, civ, version, month), bumped at final ingest.
+    Meta endpoints read only this table; scripts/rebuild_civ_meta.py
+    recomputes it from game_players.
+    """
+    __tablename__ = "civ_meta_rollup"
+
+    map = Column(String(100), primary_key=True)
+    civilization = Column(String(50), primary_key=True)
+    version = Column(String(50), primary_key=True)
+    month = Column(Date, primary_key=True)
+    picks = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CivMetaRollup {self.map}/{self.civilization}/{self.version}/{self.month}>"
+
+
+def version_bucket(game_version: str | None) -> str:
+    return (game_version or "Unknown")[:50]
+
+
+def month_bucket(played_on: datetime | None, fallback: datetime | None = None) -> date:
+    moment = played_on or fallback or datetime.utcnow()
+    return moment.date().replace(day=1)
@@ -0,0 +1,58 @@
+# db/models/game_player.py
+
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, Index
+from .base import Base
+from utils.civs import civ_name
+
+
+class GamePlayer(Base):
+    """One row per player slot of a final game, normalized out of GameStats.players."""
+    __tablename__ = "game_players"
+
+    game_id = Column(Integer, ForeignKey("game_stats.id", ondelete="CASCADE"), primary_key=True)
+    slot = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    civilization = Column(String(50))  # civ name (utils/civs.py), not the parser's ID
+    team = Column(Integer, nullable=True)  # not sent by the replay parser yet; always NULL
+    winner = Column(Boolean, default=False)
+    score = Column(Integer, nullable=True)
+    user_uid = Column(String, ForeignKey("users.uid", ondelete="SET NULL"), nullable=True, index=True)
+    # Copied from the game so "player X, newest first" is one index range scan
+    played_on = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Also serves plain name lookups (leading column)
+        Index("ix_game_players_name_played_on", "name", "played_on"),
+        Index("ix_game_players_civilization", "civilization"),
+    )
+
+    def __repr__(self):
+        return f"<GamePlayer {self.name} in game {self.game_id}>"
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def game_player_rows(game, uids_by_name: dict) -> list:
+    """Build GamePlayer rows for a flushed final; `uids_by_name` maps in-game names to users."""
+    rows = []
+    for slot, player in enumerate(game.players or []):
+        if not isinstance(player, dict):
+            continue
+        name = player.get("name") or "Unknown"
+        rows.append(GamePlayer(
+            game_id=game.id,
+            slot=slot,
+            name=name,
+            civilization=civ_name(player.get("civilization")),
+            team=_as_int(player.get("team")),
+            winner=bool(player.get("winner")),
+            score=_as_int(player.get("score")),
+            user_uid=uids_by_name.get(name),
+            played_on=game.played_on,
+        ))
+    return rows
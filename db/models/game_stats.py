@@ -1,16 +1,11 @@
 from datetime import datetime
-import os, json
-from pprint import pformat
-from logging import getLogger
 from sqlalchemy import (
-    Column, String, Boolean, Integer, DateTime,
-    UniqueConstraint, Index, ForeignKey
+    Column, String, Boolean, Integer, DateTime, LargeBinary,
+    UniqueConstraint, Index, ForeignKey, literal_column, text
 )
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from .base import Base
-
-def is_render():
-    return os.getenv("RENDER") == "1"
+from utils import fast_json
 
 class GameStats(Base):
     __tablename__ = "game_stats"
@@ -21,15 +16,19 @@ class GameStats(Base):
     replay_hash = Column(String(64), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     game_version = Column(String(50))
-    map = Column(String(100))
+    map = Column(JSONB)
     game_type = Column(String(50))
     duration = Column(Integer)
     game_duration = Column(Integer)
     winner = Column(String(100))
-    players = Column(JSON)
-    event_types = Column(JSON)
-    key_events = Column(JSON)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    players = Column(JSONB)
+    event_types = Column(JSONB)
+    key_events = Column(JSONB)
+    # Keyset listings page on (timestamp, id), so it must never be NULL
+    timestamp = Column(
+        DateTime, nullable=False, default=datetime.utcnow,
+        server_default=text("(now() AT TIME ZONE 'utc')"),
+    )
     played_on = Column(DateTime, nullable=True)
     parse_iteration = Column(Integer, default=0)
     is_final = Column(Boolean, default=False)
@@ -37,81 +36,99 @@ class GameStats(Base):
     parse_source = Column(String(20), default="unknown")
     parse_reason = Column(String(50), default="unspecified")
     original_filename = Column(String(255), nullable=True)
+    # API-facing JSON for finals, encoded once at ingest (see encode_document)
+    document = Column(LargeBinary, nullable=True)
 
     __table_args__ = (
         Index("ix_replay_iteration", "replay_file", "parse_iteration"),
         Index("ix_replay_hash_iteration", "replay_hash", "parse_iteration"),
         UniqueConstraint("replay_hash", "is_final", name="uq_replay_final"),
+        Index("ix_game_stats_final_timestamp_id", is_final, timestamp.desc(), id.desc()),
+        # Listing filters (db/queries.GameFilters)
+        Index(
+            "ix_game_stats_players",
+            players,
+            postgresql_using="gin",
+            postgresql_ops={"players": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_game_stats_map_name_played_on",
+            map.op("->>")(literal_column("'name'")),
+            played_on,
+        ),
+        Index("ix_game_stats_map_size", map.op("->>")(literal_column("'size'"))),
+        Index("ix_game_stats_played_on", played_on),
+        Index("ix_game_stats_duration", duration),
+        Index("ix_game_stats_winner", winner),
     )
 
     def __repr__(self):
         return f"<GameStats {self.replay_hash} - Final: {self.is_final}>"
 
     def to_dict(self):
-        logger = getLogger(__name__)
-        trace_enabled = os.getenv("ENABLE_TRACE_LOGS", "true").lower() == "true"
-
-        try:
-            map_data = json.loads(self.map) if isinstance(self.map, str) else self.map
-        except Exception:
-            map_data = {"name": "Unknown", "size": "Unknown"}
-
-        try:
-            players = json.loads(self.players) if isinstance(self.players, str) else self.players
-        except Exception:
-            players = []
-
-        resigns = len([e for e in (self.event_types or []) if e == "resign"])
-        anomalies = any(k for k in (self.key_events or {}) if "anomaly" in k.lower())
-
-        trace_block = (
-            "\n📊 Final Game Parsed\n"
-            f"📁 File: {self.replay_file}\n"
-            f"📎 Original: {self.original_filename or 'N/A'}\n"
-            f"🏷️  Hash: {self.replay_hash}\n"
-            f"⚙️  Source: {self.parse_source or 'unknown'}\n"
-            f"🧪 Reason: {self.parse_reason or 'unspecified'}\n"
-            f"⏱️  Duration: {self.duration} sec\n"
-            f"🗺️  Map: {map_data.get('name', 'Unknown')} ({map_data.get('size', 'Unknown')})\n"
-            f"🏆 Winner: {self.winner or 'Unknown'}\n"
-            f"🧩 Iteration: {self.parse_iteration}\n"
-            f"🚪 Resigns: {resigns}\n"
-            f"🚨 Anomalies: {'Yes' if anomalies else 'No'}\n"
-            f"❌ Disconnect: {'Yes' if self.disconnect_detected else 'No'}\n"
-            f"👥 Players:\n{pformat(players)}"
-        )
-
-        if trace_enabled and not is_render():
-            logger.debug(trace_block)
-            try:
-                trace_path = self.replay_file + ".trace"
-                with open(trace_path, "w") as f:
-                    f.write(trace_block + "\n")
-                with open("trace.index", "a") as idx:
-                    idx.write(f"{datetime.utcnow().isoformat()} - {self.replay_file}\n")
-            except Exception as e:
-                logger.warning(f"❌ Failed to write trace files: {e}")
-
-        return {
-            "id": self.id,
-            "user_uid": self.user_uid,
-            "replay_file": self.replay_file,
-            "replay_hash": self.replay_hash,
-            "game_version": self.game_version,
-            "map": map_data,
-            "game_type": self.game_type,
-            "duration": self.duration,
-            "game_duration": self.game_duration,
-            "winner": self.winner,
-            "players": players,
-            "event_types": self.event_types,
-            "key_events": self.key_events,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
-            "played_on": self.played_on.isoformat() if self.played_on else None,
-            "parse_iteration": self.parse_iteration,
-            "is_final": self.is_final,
-            "disconnect_detected": self.disconnect_detected,
-            "parse_source": self.parse_source,
-            "parse_reason": self.parse_reason,
-            "original_filename": self.original_filename,
-        }
+        return serialize_game(self)
+
+    def encode_document(self) -> bytes:
+        """Pre-encode the full API document; ids/defaults must be flushed first."""
+        return fast_json.dumps(serialize_game(self))
+
+
+# ───────────────────────────────────────────────
+# 🧩 Field projection for listings
+# ───────────────────────────────────────────────
+GAME_FIELDS = (
+    "id", "user_uid", "replay_file", "replay_hash", "game_version", "map",
+    "game_type", "duration", "game_duration", "winner", "players",
+    "event_types", "key_events", "timestamp", "played_on", "parse_iteration",
+    "is_final", "disconnect_detected", "parse_source", "parse_reason",
+    "original_filename",
+)
+
+GAME_FIELD_PRESETS = {
+    "summary": ("id", "map", "winner", "duration", "played_on", "timestamp"),
+    "full": GAME_FIELDS,
+}
+
+
+def resolve_game_fields(spec: str | None) -> tuple:
+    """
+    Turn `?fields=` into an ordered tuple of field names.
+
+    Accepts a preset name (`summary`, `full`) or a comma-separated list of
+    field names; raises ValueError for anything unknown.
+    """
+    if not spec:
+        return GAME_FIELDS
+    if spec in GAME_FIELD_PRESETS:
+        return GAME_FIELD_PRESETS[spec]
+    fields = tuple(dict.fromkeys(f.strip() for f in spec.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in GAME_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or spec}")
+    return fields
+
+
+def game_columns(fields: tuple) -> list:
+    """Columns to SELECT for `fields`, plus the keyset columns pagination needs."""
+    names = dict.fromkeys((*fields, "timestamp", "id"))
+    return [getattr(GameStats, name) for name in names]
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+_DECODERS = {
+    "timestamp": _isoformat,
+    "played_on": _isoformat,
+}
+
+
+def serialize_game(game, fields: tuple = GAME_FIELDS) -> dict:
+    """Serialize a GameStats entity or a column-level Row with the same attributes."""
+    out = {}
+    for name in fields:
+        value = getattr(game, name)
+        decode = _DECODERS.get(name)
+        out[name] = decode(value) if decode else value
+    return out
@@ -0,0 +1,41 @@
+# db/models/head_to_head.py
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime
+from .base import Base
+
+
+class HeadToHead(Base):
+    """
+    Matchup counters between two opponents, stored in both orientations so
+    a pair is one primary-key lookup and a player's opponents are one
+    primary-key prefix range. `wins` are `player`'s wins over `opponent`.
+    """
+    __tablename__ = "head_to_head"
+
+    player = Column(String(100), primary_key=True)
+    opponent = Column(String(100), primary_key=True)
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+    duration_total = Column(BigInteger, nullable=False, default=0)
+    duration_games = Column(Integer, nullable=False, default=0)
+    last_played_on = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<HeadToHead {self.player} vs {self.opponent} {self.wins}-{self.losses}>"
+
+    def to_dict(self):
+        return {
+            "player": self.player,
+            "opponent": self.opponent,
+            "games": self.games,
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate": round(self.wins / self.games, 4) if self.games else None,
+            "average_duration": (
+                round(self.duration_total / self.duration_games) if self.duration_games else None
+            ),
+            "last_played_on": self.last_played_on.isoformat() if self.last_played_on else None,
+        }
@@ -0,0 +1,72 @@
+# db/models/player_stats.py
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import Base
+
+RECENT_FORM_LENGTH = 10
+FAVORITE_CIVS = 3
+
+
+class PlayerStats(Base):
+    """
+    Per-player profile counters, bumped in the final-ingest transaction
+    (db/ingest.py) and recomputable with scripts/rebuild_player_stats.py.
+    """
+    __tablename__ = "player_stats"
+
+    name = Column(String(100), primary_key=True)
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    duration_total = Column(BigInteger, nullable=False, default=0)
+    duration_games = Column(Integer, nullable=False, default=0)  # games with a known duration
+    civ_games = Column(JSONB, nullable=False, default=dict)      # {civ: games}
+    civ_wins = Column(JSONB, nullable=False, default=dict)       # {civ: wins}
+    recent_form = Column(String(RECENT_FORM_LENGTH), nullable=False, default="")  # newest first, "W"/"L"
+    last_played_on = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Name search over everyone seen in a final (db/queries.search_player_names)
+        Index(
+            "ix_player_stats_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_player_stats_name_prefix",
+            func.lower(name).label("lower_name"),
+            postgresql_ops={"lower_name": "text_pattern_ops"},
+        ),
+    )
+
+    def __repr__(self):
+        return f"<PlayerStats {self.name} {self.wins}/{self.games}>"
+
+    def to_dict(self):
+        civ_games = self.civ_games or {}
+        civ_wins = self.civ_wins or {}
+        favorites = sorted(civ_games.items(), key=lambda item: (-item[1], item[0]))[:FAVORITE_CIVS]
+        return {
+            "name": self.name,
+            "games": self.games,
+            "wins": self.wins,
+            "losses": self.games - self.wins,
+            "win_rate": round(self.wins / self.games, 4) if self.games else None,
+            "average_duration": (
+                round(self.duration_total / self.duration_games) if self.duration_games else None
+            ),
+            "favorite_civs": [
+                {
+                    "civilization": civ,
+                    "games": games,
+                    "wins": civ_wins.get(civ, 0),
+                    "win_rate": round(civ_wins.get(civ, 0) / games, 4),
+                }
+                for civ, games in favorites
+            ],
+            "recent_form": self.recent_form,
+            "last_played_on": self.last_played_on.isoformat() if self.last_played_on else None,
+        }
@@ -0,0 +1,41 @@
+# db/models/rating.py
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import Base
+
+
+class PlayerRating(Base):
+    __tablename__ = "player_ratings"
+
+    name = Column(String(100), primary_key=True)
+    rating = Column(Float, nullable=False)
+    games = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Leaderboard pages walk this index in order
+        Index("ix_player_ratings_rating_name", rating.desc(), name),
+    )
+
+    def __repr__(self):
+        return f"<PlayerRating {self.name} {self.rating:.0f}>"
+
+
+class RatingEvent(Base):
+    """One row per rated final; the primary key makes rating idempotent per replay."""
+    __tablename__ = "rating_events"
+
+    replay_hash = Column(String(64), primary_key=True)
+    game_id = Column(Integer, ForeignKey("game_stats.id", ondelete="CASCADE"), nullable=False)
+    deltas = Column(JSONB, nullable=False)  # {name: rating change}
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RatingTreeNode(Base):
+    """Fenwick tree over rating buckets (utils/rating.py); rank queries read ~12 rows."""
+    __tablename__ = "rating_tree"
+
+    node = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,7 +1,7 @@
 # db/models/user.py
 
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, Integer, DateTime
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Index, func
 from .base import Base
 
 class User(Base):
@@ -19,6 +19,23 @@ class User(Base):
     last_seen = Column(DateTime, default=None)
     is_admin = Column(Boolean, default=False)  # ✅ required for admin access
 
+    __table_args__ = (
+        # Cold-start seed of the online index (db/presence.seed_online_index)
+        Index("ix_users_last_seen", last_seen),
+        # Name search (db/queries.search_player_names)
+        Index(
+            "ix_users_in_game_name_trgm",
+            in_game_name,
+            postgresql_using="gin",
+            postgresql_ops={"in_game_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_in_game_name_prefix",
+            func.lower(in_game_name).label("lower_name"),
+            postgresql_ops={"lower_name": "text_pattern_ops"},
+        ),
+    )
+
     def __repr__(self):
         return f"<User {self.uid}>"
 
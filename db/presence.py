@@ -0,0 +1,224 @@
+# db/presence.py
+
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, String, column, or_, select, update, values
+
+from db.db import async_session
+from db.models import User
+from utils import fast_json
+from utils.invalidation import publish, subscribe
+from utils.online_index import online_index, epoch
+
+# ───────────────────────────────────────────────
+# 🟢 Coalesced last_seen writes
+# ───────────────────────────────────────────────
+#
+# Pings only record `uid → latest timestamp` in memory. A per-worker task
+# flushes the uids pinged since the previous flush with one
+# UPDATE ... FROM (VALUES ...) every PRESENCE_MAX_STALENESS seconds, so a
+# user's last_seen lags by at most that much and a client pinging every few
+# seconds costs one row write per interval instead of one per ping.
+#
+# Each flush also announces its uids on PRESENCE_CHANNEL, so every worker's
+# online index (utils/online_index.py) learns about pings it did not serve.
+# An entry with no timestamp removes the uid instead (deleted users), and
+# one with a fifth element is a leave: the user's last WebSocket closed at
+# that timestamp and they expire that many seconds later unless seen again.
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_MAX_STALENESS = float(os.getenv("PRESENCE_MAX_STALENESS", "30"))
+FLUSH_BATCH_SIZE = 1000
+PRESENCE_CHANNEL = "presence"
+NOTIFY_PAYLOAD_LIMIT = 7000   # bytes; Postgres caps NOTIFY payloads at 8000
+
+
+def presence_update(seen: dict):
+    """Bulk UPDATE for `{uid: seen_at}`; never moves last_seen backwards."""
+    rows = values(
+        column("uid", String), column("seen_at", DateTime), name="presence",
+    ).data(sorted(seen.items()))
+    return (
+        update(User)
+        .where(User.uid == rows.c.uid)
+        .where(or_(User.last_seen.is_(None), User.last_seen < rows.c.seen_at))
+        .values(last_seen=rows.c.seen_at)
+    )
+
+
+def _presence_entries(items, leaves):
+    for uid, seen_at in items:
+        profile = online_index.profile(uid) or {}
+        yield [uid, round(epoch(seen_at), 3), profile.get("in_game_name"), profile.get("verified")]
+    for uid, (left_at, grace) in leaves:
+        yield [uid, round(epoch(left_at), 3), None, None, grace]
+
+
+def presence_payloads(items, leaves=()):
+    """Chunk `(uid, seen_at)` pairs plus their known profile, then leaves, into NOTIFY-sized JSON arrays."""
+    chunk, size = [], 2
+    for entry in _presence_entries(items, leaves):
+        encoded = len(fast_json.dumps(entry)) + 1
+        if chunk and size + encoded > NOTIFY_PAYLOAD_LIMIT:
+            yield fast_json.dumps(chunk).decode("utf-8")
+            chunk, size = [], 2
+        chunk.append(entry)
+        size += encoded
+    if chunk:
+        yield fast_json.dumps(chunk).decode("utf-8")
+
+
+def _on_presence(payload: str) -> None:
+    # An empty payload means the listener reconnected; pings missed
+    # meanwhile come back with the users' next flush.
+    if not payload:
+        return
+    for uid, seen_at, name, verified, *leave in fast_json.loads(payload):
+        if leave:
+            online_index.expire_soon(uid, leave[0], left_at=seen_at)
+            continue
+        if seen_at is None:
+            presence.forget(uid)
+            online_index.discard(uid)
+            continue
+        profile = {"uid": uid, "in_game_name": name, "verified": verified} if name is not None else None
+        online_index.touch(uid, seen_at, profile)
+
+
+async def publish_removal(db, uid: str) -> None:
+    """Drop `uid` from every worker's online index and pending writes once `db` commits."""
+    await publish(db, PRESENCE_CHANNEL, fast_json.dumps([[uid, None, None, None]]).decode("utf-8"))
+
+
+subscribe(PRESENCE_CHANNEL, _on_presence)
+
+
+class PresenceBuffer:
+    def __init__(self, channel: str | None = None):
+        self.channel = channel
+        self._pending = {}
+        self._leaves = {}         # uid -> (left_at, grace); announced, never written
+        self.recorded = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.failures = 0
+
+    def record(self, uid: str, seen_at: datetime | None = None) -> datetime:
+        seen_at = seen_at or datetime.utcnow()
+        self._merge(uid, seen_at)
+        self.recorded += 1
+        return seen_at
+
+    def leave(self, uid: str, grace: float, left_at: datetime | None = None) -> None:
+        """Announce with the next flush that `uid`'s last WebSocket closed."""
+        self._leaves[uid] = (left_at or datetime.utcnow(), grace)
+
+    def forget(self, uid: str) -> None:
+        self._pending.pop(uid, None)
+        self._leaves.pop(uid, None)
+
+    def _merge(self, uid: str, seen_at: datetime) -> None:
+        previous = self._pending.get(uid)
+        if previous is None or seen_at > previous:
+            self._pending[uid] = seen_at
+
+    async def flush(self, session_factory) -> int:
+        """Write everything pending; on failure the batch is merged back for the next try."""
+        if not self._pending and not self._leaves:
+            return 0
+        pending, self._pending = self._pending, {}
+        leaves, self._leaves = self._leaves, {}
+        items = list(pending.items())
+        written = 0
+        try:
+            async with session_factory() as db:
+                for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                    batch = dict(items[start:start + FLUSH_BATCH_SIZE])
+                    result = await db.execute(presence_update(batch))
+                    written += result.rowcount
+                if self.channel:
+                    for payload in presence_payloads(items, leaves.items()):
+                        await publish(db, self.channel, payload)
+                await db.commit()
+        except BaseException:  # cancellation too: stop_presence_flusher retries it
+            self.failures += 1
+            for uid, seen_at in items:
+                self._merge(uid, seen_at)
+            for uid, leave in leaves.items():
+                self._leaves.setdefault(uid, leave)
+            raise
+        self.flushes += 1
+        self.rows_written += written
+        return written
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "pending_leaves": len(self._leaves),
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "failures": self.failures,
+            "max_staleness": PRESENCE_MAX_STALENESS,
+        }
+
+
+presence = PresenceBuffer(PRESENCE_CHANNEL)
+
+
+async def seed_online_index(session_factory=async_session) -> int:
+    """Cold start only: load recently seen users, then serve online_users from memory."""
+    since = datetime.utcnow() - timedelta(seconds=online_index.window)
+    async with session_factory() as db:
+        result = await db.execute(
+            select(User.uid, User.in_game_name, User.verified, User.last_seen)
+            .where(User.last_seen > since)
+        )
+        rows = result.all()
+    for uid, name, verified, last_seen in rows:
+        online_index.touch(uid, epoch(last_seen), {"uid": uid, "in_game_name": name, "verified": verified})
+    online_index.ready = True
+    return len(rows)
+
+
+# ───────────────────────────────────────────────
+# ⏱️ Flusher task (one per worker)
+# ───────────────────────────────────────────────
+_flush_task = None
+
+
+async def _flush_forever(buffer: PresenceBuffer, session_factory):
+    while True:
+        await asyncio.sleep(PRESENCE_MAX_STALENESS)
+        try:
+            await buffer.flush(session_factory)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"🔁 Presence flush failed, will retry: {e}")
+
+
+def start_presence_flusher() -> None:
+    global _flush_task
+    if _flush_task is None:
+        _flush_task = asyncio.create_task(_flush_forever(presence, async_session))
+
+
+async def stop_presence_flusher() -> None:
+    """Cancel the task, then write whatever is still pending."""
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    try:
+        await presence.flush(async_session)
+    except Exception as e:
+        logger.warning(f"❌ Final presence flush failed: {e}")
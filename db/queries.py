@@ -0,0 +1,255 @@
+# db/queries.py
+
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import select, func, cast, literal, literal_column, tuple_, or_, union_all, true, false
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import GameStats, HeadToHead, CivMetaRollup, User, PlayerStats
+from utils import fast_json
+from utils.civs import civ_values
+
+# ───────────────────────────────────────────────
+# 📄 Pre-encoded game documents
+# ───────────────────────────────────────────────
+async def load_game_documents(db: AsyncSession, rows) -> list[bytes]:
+    """
+    Return the stored JSON document for each row (rows need `id` and
+    `document`). Rows ingested before documents existed are loaded and
+    encoded on the fly; run scripts/backfill_game_documents.py to stop that.
+    """
+    missing = [row.id for row in rows if row.document is None]
+    legacy = {}
+    if missing:
+        result = await db.execute(select(GameStats).where(GameStats.id.in_(missing)))
+        legacy = {game.id: game.encode_document() for game in result.scalars()}
+    return [row.document if row.document is not None else legacy[row.id] for row in rows]
+
+
+def stitch_page(fragments: list[bytes], next_cursor: str | None) -> bytes:
+    """Join encoded games into a listing body without decoding them."""
+    return b'{"games":[' + b",".join(fragments) + b'],"next":' + fast_json.dumps(next_cursor) + b"}"
+
+
+# ───────────────────────────────────────────────
+# 🔎 Listing query + indexed filters
+# ───────────────────────────────────────────────
+#
+# The map keys are inlined rather than bound so these expressions match
+# the expression indexes on game_stats under prepared statements too.
+MAP_NAME = GameStats.map.op("->>")(literal_column("'name'"))
+MAP_SIZE = GameStats.map.op("->>")(literal_column("'size'"))
+
+
+def _players_contain(member: dict):
+    return GameStats.players.op("@>")(cast(literal(json.dumps([member])), JSONB))
+
+
+@dataclass(frozen=True)
+class GameFilters:
+    """Query-string filters for game listings (usable as `Depends()`)."""
+    player: str | None = None
+    civ: str | None = None
+    winner: str | None = None
+    map: str | None = None
+    map_size: str | None = None
+    played_after: datetime | None = None
+    played_before: datetime | None = None
+    min_duration: int | None = None
+    max_duration: int | None = None
+
+    def clauses(self) -> list:
+        clauses = []
+        # player + civ together mean "this player played this civ"; a civ
+        # is matched by its ID (as the parser stores it) or by name
+        member = {"name": self.player} if self.player else {}
+        if self.civ:
+            clauses.append(or_(*(
+                _players_contain({**member, "civilization": value}) for value in civ_values(self.civ)
+            )))
+        elif member:
+            clauses.append(_players_contain(member))
+        if self.winner:
+            clauses.append(GameStats.winner == self.winner)
+        if self.map:
+            clauses.append(MAP_NAME == self.map)
+        if self.map_size:
+            clauses.append(MAP_SIZE == self.map_size)
+        if self.played_after:
+            clauses.append(GameStats.played_on >= self.played_after)
+        if self.played_before:
+            clauses.append(GameStats.played_on < self.played_before)
+        if self.min_duration is not None:
+            clauses.append(GameStats.duration >= self.min_duration)
+        if self.max_duration is not None:
+            clauses.append(GameStats.duration <= self.max_duration)
+        return clauses
+
+
+def final_games_query(columns, filters: GameFilters | None = None, position=None, limit: int | None = None):
+    """Finals newest first by (timestamp, id), after the keyset `position` if given."""
+    query = select(*columns).where(GameStats.is_final.is_(True))
+    if filters:
+        query = query.where(*filters.clauses())
+    if position:
+        query = query.where(tuple_(GameStats.timestamp, GameStats.id) < tuple_(*position))
+    query = query.order_by(GameStats.timestamp.desc(), GameStats.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+# ───────────────────────────────────────────────
+# 🤝 Head-to-head lookups
+# ───────────────────────────────────────────────
+async def head_to_head_record(db: AsyncSession, player: str, opponent: str) -> dict:
+    """`player`'s record against `opponent` (zeros when they never met); one PK lookup."""
+    row = await db.get(HeadToHead, (player, opponent))
+    if row is None:
+        return HeadToHead(player=player, opponent=opponent, games=0, wins=0, losses=0,
+                          duration_total=0, duration_games=0).to_dict()
+    return row.to_dict()
+
+
+async def opponents_of(db: AsyncSession, player: str) -> list[dict]:
+    """Every opponent of `player`, most played first; one PK prefix range scan."""
+    result = await db.execute(select(HeadToHead).where(HeadToHead.player == player))
+    rows = sorted(result.scalars(), key=lambda r: (-r.games, r.opponent))
+    return [row.to_dict() for row in rows]
+
+
+# ───────────────────────────────────────────────
+# 🧭 Civ meta (reads civ_meta_rollup only)
+# ───────────────────────────────────────────────
+def civ_meta_query(map: str | None = None, version: str | None = None,
+                   since: date | None = None, until: date | None = None):
+    """Picks and wins per civ over the rollup rows matching the filters."""
+    query = select(
+        CivMetaRollup.civilization,
+        func.sum(CivMetaRollup.picks).label("picks"),
+        func.sum(CivMetaRollup.wins).label("wins"),
+    )
+    if map:
+        query = query.where(CivMetaRollup.map == map)
+    if version:
+        query = query.where(CivMetaRollup.version == version)
+    if since:
+        query = query.where(CivMetaRollup.month >= since)
+    if until:
+        query = query.where(CivMetaRollup.month <= until)
+    return query.group_by(CivMetaRollup.civilization)
+
+
+async def civ_meta(db: AsyncSession, **filters) -> dict:
+    rows = (await db.execute(civ_meta_query(**filters))).all()
+    total = sum(row.picks for row in rows)
+    civs = [
+        {
+            "civilization": row.civilization,
+            "picks": row.picks,
+            "wins": row.wins,
+            "pick_rate": round(row.picks / total, 4) if total else None,
+            "win_rate": round(row.wins / row.picks, 4) if row.picks else None,
+        }
+        for row in rows
+    ]
+    civs.sort(key=lambda c: (-c["picks"], c["civilization"]))
+    return {"total_picks": total, "civilizations": civs}
+
+
+async def civ_meta_monthly(db: AsyncSession, civilization: str, map: str | None = None,
+                           version: str | None = None) -> list[dict]:
+    """One civ's picks and wins per month, oldest first."""
+    query = (
+        select(
+            CivMetaRollup.month,
+            func.sum(CivMetaRollup.picks).label("picks"),
+            func.sum(CivMetaRollup.wins).label("wins"),
+        )
+        .where(CivMetaRollup.civilization == civilization)
+        .group_by(CivMetaRollup.month)
+        .order_by(CivMetaRollup.month)
+    )
+    if map:
+        query = query.where(CivMetaRollup.map == map)
+    if version:
+        query = query.where(CivMetaRollup.version == version)
+    return [
+        {
+            "month": row.month.strftime("%Y-%m"),
+            "picks": row.picks,
+            "wins": row.wins,
+            "win_rate": round(row.wins / row.picks, 4) if row.picks else None,
+        }
+        for row in (await db.execute(query)).all()
+    ]
+
+
+# ───────────────────────────────────────────────
+# 🔤 Player name search (registered + seen in finals)
+# ───────────────────────────────────────────────
+#
+# Prefix matches use the lower(name) text_pattern_ops indexes; they rely
+# on LIKE's default backslash escape, since an explicit ESCAPE clause
+# hides the prefix from the planner. Queries of TRIGRAM_MIN_LENGTH+
+# characters also match by trigram similarity through the gin_trgm_ops
+# indexes. Prefix hits rank first, then by similarity. Every branch of the
+# union carries its own ORDER BY ... LIMIT, so a common fragment cannot
+# pull thousands of candidates into the outer GROUP BY.
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _like_prefix(q: str) -> str:
+    escaped = q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _name_matches(column, registered, q: str, prefix: str, limit: int) -> list:
+    is_prefix = func.lower(column).like(prefix)
+    query = select(column.label("name"), (true() if registered else false()).label("registered"))
+    if len(q) < TRIGRAM_MIN_LENGTH:
+        return [query.where(is_prefix).order_by(func.lower(column)).limit(limit)]
+    # Prefix and trigram hits are bounded separately: prefix hits outrank
+    # any similarity, so they must not compete for the same LIMIT
+    by_similarity = func.similarity(column, q).desc()
+    return [
+        query.where(is_prefix).order_by(by_similarity).limit(limit),
+        query.where(column.op("%")(q)).order_by(by_similarity).limit(limit),
+    ]
+
+
+def search_player_names_query(q: str, limit: int):
+    prefix = _like_prefix(q)
+    candidates = union_all(
+        *_name_matches(User.in_game_name, True, q, prefix, limit),
+        *_name_matches(PlayerStats.name, False, q, prefix, limit),
+    ).subquery()
+    name = candidates.c.name
+    is_prefix = func.bool_or(func.lower(name).like(prefix))
+    score = func.max(func.similarity(name, q))
+    return (
+        select(
+            name,
+            func.bool_or(candidates.c.registered).label("registered"),
+            is_prefix.label("prefix"),
+            score.label("score"),
+        )
+        .group_by(name)
+        .order_by(is_prefix.desc(), score.desc(), name)
+        .limit(limit)
+    )
+
+
+async def search_player_names(db: AsyncSession, q: str, limit: int) -> list[dict]:
+    result = await db.execute(search_player_names_query(q, limit))
+    return [
+        {
+            "name": row.name,
+            "registered": row.registered,
+            "score": round(row.score, 4) if row.score is not None else None,
+        }
+        for row in result.all()
+    ]
@@ -0,0 +1,140 @@
+# db/ratings.py
+
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import GameStats, PlayerRating, RatingEvent, RatingTreeNode
+from utils.rating import (
+    INITIAL_RATING,
+    RATING_BUCKETS,
+    elo_deltas,
+    split_sides,
+    rating_bucket,
+    fenwick_node_deltas,
+    fenwick_prefix_nodes,
+    rank_from_nodes,
+)
+
+# Serializes every rating writer (ingest + rebuild) across workers, so
+# updates apply in commit order and rating_tree rows never deadlock.
+RATING_LOCK_KEY = 0x5241_5445  # "RATE"
+
+
+async def lock_ratings(db: AsyncSession) -> None:
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": RATING_LOCK_KEY})
+
+
+async def bump_tree(db: AsyncSession, node_deltas: dict) -> None:
+    if not node_deltas:
+        return
+    stmt = pg_insert(RatingTreeNode).values(
+        [{"node": node, "count": delta} for node, delta in sorted(node_deltas.items())]
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[RatingTreeNode.node],
+        set_={"count": RatingTreeNode.count + stmt.excluded.count},
+    ))
+
+
+# ───────────────────────────────────────────────
+# ⚖️ Rate a final (called from db/ingest.record_final)
+# ───────────────────────────────────────────────
+async def rate_final(db: AsyncSession, game: GameStats, players) -> dict:
+    """
+    Apply Elo changes for a final once per replay_hash; returns the deltas
+    (empty when the game is unrated or was already rated).
+    """
+    winners, losers = split_sides(
+        {"name": p.name, "winner": p.winner} for p in players
+    )
+    if not winners or not losers:
+        return {}
+
+    await lock_ratings(db)
+    result = await db.execute(
+        select(PlayerRating).where(PlayerRating.name.in_(winners + losers))
+    )
+    current = {row.name: row for row in result.scalars()}
+    rating = lambda name: current[name].rating if name in current else INITIAL_RATING
+    deltas = elo_deltas(
+        {name: rating(name) for name in winners},
+        {name: rating(name) for name in losers},
+    )
+
+    claimed = await db.execute(
+        pg_insert(RatingEvent)
+        .values(replay_hash=game.replay_hash, game_id=game.id, deltas=deltas)
+        .on_conflict_do_nothing(index_elements=[RatingEvent.replay_hash])
+        .returning(RatingEvent.replay_hash)
+    )
+    if claimed.first() is None:
+        return {}
+
+    buckets = Counter()
+    now = datetime.utcnow()
+    for name, delta in sorted(deltas.items()):
+        row = current.get(name)
+        if row is None:
+            row = PlayerRating(name=name, rating=INITIAL_RATING, games=0)
+            db.add(row)
+        else:
+            buckets[rating_bucket(row.rating)] -= 1
+        row.rating += delta
+        row.games += 1
+        row.updated_at = now
+        buckets[rating_bucket(row.rating)] += 1
+    await bump_tree(db, fenwick_node_deltas(buckets))
+    return deltas
+
+
+# ───────────────────────────────────────────────
+# 🏆 Leaderboard reads
+# ───────────────────────────────────────────────
+async def _tree_counts(db: AsyncSession, nodes) -> dict:
+    result = await db.execute(
+        select(RatingTreeNode.node, RatingTreeNode.count)
+        .where(RatingTreeNode.node.in_(sorted(set(nodes))))
+    )
+    return dict(result.all())
+
+
+async def rank_of_rating(db: AsyncSession, rating: float) -> tuple[int, int]:
+    """(rank, rated player count) for `rating`, in O(log buckets) row reads."""
+    bucket = rating_bucket(rating)
+    top = fenwick_prefix_nodes(RATING_BUCKETS - 1)
+    counts = await _tree_counts(db, top + fenwick_prefix_nodes(bucket))
+    total = sum(counts.get(n, 0) for n in top)
+    return rank_from_nodes(counts, bucket), total
+
+
+async def leaderboard_page(db: AsyncSession, limit: int, offset: int) -> tuple[list, int]:
+    """A page of standings with competition ranks, plus the rated player count."""
+    result = await db.execute(
+        select(PlayerRating)
+        .order_by(PlayerRating.rating.desc(), PlayerRating.name)
+        .offset(offset)
+        .limit(limit)
+    )
+    rows = result.scalars().all()
+    if not rows:
+        return [], (await rank_of_rating(db, 0))[1]
+
+    # Only the first row needs the tree; later rows share its rank while in
+    # the same bucket and otherwise rank by position.
+    rank, total = await rank_of_rating(db, rows[0].rating)
+    entries, previous = [], rating_bucket(rows[0].rating)
+    for position, row in enumerate(rows, start=offset + 1):
+        bucket = rating_bucket(row.rating)
+        if bucket != previous:
+            rank, previous = position, bucket
+        entries.append({
+            "rank": rank,
+            "name": row.name,
+            "rating": round(row.rating, 1),
+            "games": row.games,
+        })
+    return entries, total
@@ -1,16 +1,46 @@
 # dependencies/auth.py
+import logging
+
 from fastapi import Request, HTTPException, status
-from firebase_admin import auth, credentials, initialize_app
-import firebase_admin
 
-# ✅ Initialize Firebase only once
-if not firebase_admin._apps:
-    cred = credentials.Certificate("secrets/serviceAccountKey.json")  # Path must be valid on VPS
-    initialize_app(cred)
+from utils.token_cache import TokenCache, token_cache
+# Firebase is initialised lazily, once, by utils.firebase_utils
+from utils.firebase_utils import decode_id_token_async
 
-async def get_firebase_user(request: Request):
-    print("🔎 Incoming Headers:", dict(request.headers))
+logger = logging.getLogger(__name__)
+
+
+def _invalid_token():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired Firebase token",
+    )
+
+
+async def verify_token_cached(id_token: str) -> dict:
+    """Claims for `id_token`, via the token cache; raises a 401 HTTPException."""
+    # ♻️ Cached verification result: skips the signature check entirely
+    decoded_token = token_cache.get(id_token)
+    if decoded_token is TokenCache.REJECTED:
+        raise _invalid_token()
 
+    if decoded_token is None:
+        try:
+            # Signature check runs on the verify executor, not the event loop
+            decoded_token = await decode_id_token_async(id_token)
+        except Exception as e:
+            from firebase_admin import auth
+            logger.warning(f"❌ Token verification failed: {type(e).__name__}: {e}")
+            # A failed cert fetch says nothing about the token; don't remember it
+            if not isinstance(e, auth.CertificateFetchError):
+                token_cache.reject(id_token)
+            raise _invalid_token()
+        token_cache.put(id_token, decoded_token)
+        logger.debug(f"✅ Firebase verified UID: {decoded_token.get('uid')}")
+    return decoded_token
+
+
+async def get_firebase_user(request: Request):
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(
@@ -19,21 +49,9 @@ async def get_firebase_user(request: Request):
         )
 
     id_token = auth_header.removeprefix("Bearer ").strip()
-    print(f"🧪 Received Firebase token: {id_token[:40]}...")
-
-    try:
-        decoded_token = auth.verify_id_token(id_token)
-        uid = decoded_token.get("uid")
-        email = decoded_token.get("email", "")
-        is_anon = decoded_token.get("firebase", {}).get("sign_in_provider") == "anonymous"
-
-        print(f"✅ Firebase verified UID: {uid} | Email: {email}")
-        return {"uid": uid, "email": email, "is_anonymous": is_anon}
-    except Exception as e:
-        import traceback
-        print("❌ Token verification failed:")
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired Firebase token",
-        )
+    decoded_token = await verify_token_cached(id_token)
+
+    uid = decoded_token.get("uid")
+    email = decoded_token.get("email", "")
+    is_anon = decoded_token.get("firebase", {}).get("sign_in_provider") == "anonymous"
+    return {"uid": uid, "email": email, "is_anonymous": is_anon}
@@ -4,7 +4,7 @@ module.exports = {
       name: "api-prodf",
       cwd: "/var/www/api-prodf",
       script: "/var/www/api-prodf/venv/bin/python3",
-      args: "-m uvicorn app:app --host 0.0.0.0 --port 8003",
+      args: "-m uvicorn app:app --host 0.0.0.0 --port 8003 --no-access-log",
       env: {
         GOOGLE_APPLICATION_CREDENTIALS: "/var/www/api-prodf/secrets/serviceAccountKey.json",
         GOOGLE_CLOUD_PROJECT: "aoe2hd"
@@ -0,0 +1,34 @@
+"""Add civ_meta_rollup analytics table
+
+Revision ID: a3e9d7f4c128
+Revises: f1d6a8c3b295
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e9d7f4c128'
+down_revision = 'f1d6a8c3b295'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate with scripts/rebuild_civ_meta.py
+    op.create_table(
+        'civ_meta_rollup',
+        sa.Column('map', sa.String(length=100), nullable=False),
+        sa.Column('civilization', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.String(length=50), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('picks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('wins', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('map', 'civilization', 'version', 'month'),
+    )
+
+
+def downgrade():
+    op.drop_table('civ_meta_rollup')
@@ -0,0 +1,148 @@
+"""Convert game_stats JSON columns to native JSONB
+
+Revision ID: b52e8d1f0a47
+Revises: f3c81e6d9a24
+Create Date: 2026-10-19 14:20:00.000000
+
+map (varchar) and players (json) held json.dumps() strings, i.e. JSON
+strings containing JSON. Rewriting them with ALTER COLUMN TYPE would hold
+an ACCESS EXCLUSIVE lock for the whole table rewrite, so instead:
+
+  1. add nullable *_jsonb shadow columns (metadata only) plus a trigger
+     that keeps them in sync with writes from workers still on old code;
+  2. backfill the shadow columns in committed id-range batches;
+  3. build the filter indexes on them CONCURRENTLY;
+  4. swap: drop the old columns and rename, a short metadata-only lock.
+
+Roll the application out after this migration has finished.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b52e8d1f0a47'
+down_revision = 'f3c81e6d9a24'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+COLUMNS = ('map', 'players', 'event_types', 'key_events')
+
+# Unwraps one level of string encoding; unparseable text becomes NULL.
+NORMALIZE_FUNCTION = """
+CREATE OR REPLACE FUNCTION game_stats_jsonb(raw text) RETURNS jsonb
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    doc jsonb;
+BEGIN
+    IF raw IS NULL THEN
+        RETURN NULL;
+    END IF;
+    BEGIN
+        doc := raw::jsonb;
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END;
+    IF jsonb_typeof(doc) = 'string' THEN
+        BEGIN
+            doc := (doc #>> '{}')::jsonb;
+        EXCEPTION WHEN others THEN
+            NULL;  -- a plain string value, keep it as is
+        END;
+    END IF;
+    RETURN doc;
+END $$
+"""
+
+# Same fallbacks the API used to apply when decoding on read.
+CONVERSIONS = {
+    'map': """CASE WHEN map IS NOT NULL THEN COALESCE(
+                  game_stats_jsonb(map), '{"name": "Unknown", "size": "Unknown"}') END""",
+    'players': "CASE WHEN players IS NOT NULL THEN COALESCE(game_stats_jsonb(players::text), '[]') END",
+    'event_types': "game_stats_jsonb(event_types::text)",
+    'key_events': "game_stats_jsonb(key_events::text)",
+}
+
+SYNC_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION game_stats_sync_jsonb() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.map_jsonb := CASE WHEN NEW.map IS NOT NULL THEN COALESCE(
+        game_stats_jsonb(NEW.map), '{"name": "Unknown", "size": "Unknown"}') END;
+    NEW.players_jsonb := CASE WHEN NEW.players IS NOT NULL THEN COALESCE(
+        game_stats_jsonb(NEW.players::text), '[]') END;
+    NEW.event_types_jsonb := game_stats_jsonb(NEW.event_types::text);
+    NEW.key_events_jsonb := game_stats_jsonb(NEW.key_events::text);
+    RETURN NEW;
+END $$
+"""
+
+# Built on the shadow columns, renamed during the swap
+NEW_INDEXES = {
+    'ix_game_stats_players': "USING gin (players_jsonb jsonb_path_ops)",
+    'ix_game_stats_map_name_played_on': "((map_jsonb ->> 'name'), played_on)",
+    'ix_game_stats_map_size': "((map_jsonb ->> 'size'))",
+}
+
+# Expression indexes from f3c81e6d9a24; dropped along with the old columns
+OLD_INDEXES = {
+    'ix_game_stats_players_doc':
+        "USING gin (CAST(players #>> '{}' AS JSONB) jsonb_path_ops)",
+    'ix_game_stats_map_name_played_on':
+        "((CAST(map AS JSONB) ->> 'name'), played_on)",
+    'ix_game_stats_map_size':
+        "((CAST(map AS JSONB) ->> 'size'))",
+}
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # 1. Shadow columns + sync trigger, in one transaction so no write slips between them
+    op.execute(NORMALIZE_FUNCTION)
+    for column in COLUMNS:
+        op.add_column('game_stats', sa.Column(f'{column}_jsonb', sa.dialects.postgresql.JSONB(), nullable=True))
+    op.execute(SYNC_TRIGGER_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER game_stats_sync_jsonb "
+        "BEFORE INSERT OR UPDATE OF map, players, event_types, key_events ON game_stats "
+        "FOR EACH ROW EXECUTE FUNCTION game_stats_sync_jsonb()"
+    )
+
+    with op.get_context().autocommit_block():
+        # 2. Backfill; every batch commits on its own and only locks its rows
+        max_id = conn.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM game_stats")).scalar()
+        assignments = ", ".join(f"{column}_jsonb = {CONVERSIONS[column]}" for column in COLUMNS)
+        for low in range(0, max_id, BATCH_SIZE):
+            conn.execute(
+                sa.text(f"UPDATE game_stats SET {assignments} WHERE id > :low AND id <= :high"),
+                {"low": low, "high": low + BATCH_SIZE},
+            )
+
+        # 3. Indexes on the shadow columns, without blocking writes
+        for name, definition in NEW_INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}_new ON game_stats {definition}")
+
+    # 4. Swap; fail fast rather than queue behind long readers
+    op.execute("SET LOCAL lock_timeout = '10s'")
+    op.execute("DROP TRIGGER game_stats_sync_jsonb ON game_stats")
+    op.execute("DROP FUNCTION game_stats_sync_jsonb()")
+    for column in COLUMNS:
+        op.drop_column('game_stats', column)
+        op.alter_column('game_stats', f'{column}_jsonb', new_column_name=column)
+    for name in NEW_INDEXES:
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+    op.execute("DROP FUNCTION game_stats_jsonb(text)")
+
+
+def downgrade():
+    # Offline rewrite back to the old string-encoded layout
+    for name in NEW_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("ALTER TABLE game_stats ALTER COLUMN map TYPE varchar(100) USING map::text")
+    op.execute("ALTER TABLE game_stats ALTER COLUMN players TYPE json USING to_json(players::text)")
+    op.execute("ALTER TABLE game_stats ALTER COLUMN event_types TYPE json USING event_types::json")
+    op.execute("ALTER TABLE game_stats ALTER COLUMN key_events TYPE json USING key_events::json")
+    for name, definition in OLD_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON game_stats {definition}")
@@ -0,0 +1,36 @@
+"""Add trigram and prefix indexes for player name search
+
+Revision ID: b7c2e4d9f061
+Revises: a3e9d7f4c128
+Create Date: 2026-10-19 19:15:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c2e4d9f061'
+down_revision = 'a3e9d7f4c128'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_users_in_game_name_trgm': "users USING gin (in_game_name gin_trgm_ops)",
+    'ix_users_in_game_name_prefix': "users (lower(in_game_name) text_pattern_ops)",
+    'ix_player_stats_name_trgm': "player_stats USING gin (name gin_trgm_ops)",
+    'ix_player_stats_name_prefix': "player_stats (lower(name) text_pattern_ops)",
+}
+
+
+def upgrade():
+    # pg_trgm ships with Postgres contrib; creating it needs a privileged role
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
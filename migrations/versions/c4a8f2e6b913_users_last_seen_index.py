@@ -0,0 +1,27 @@
+"""Index users.last_seen for the online-users cold-start query
+
+Revision ID: c4a8f2e6b913
+Revises: b7c2e4d9f061
+Create Date: 2026-10-19 21:40:00.000000
+
+Only read when a worker seeds its in-memory online index, or while that
+seed has not finished; steady-state /api/user/online_users never queries.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a8f2e6b913'
+down_revision = 'b7c2e4d9f061'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_last_seen ON users (last_seen)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_last_seen")
@@ -0,0 +1,44 @@
+"""Add normalized game_players table
+
+Revision ID: c6a1f93e2d58
+Revises: b52e8d1f0a47
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a1f93e2d58'
+down_revision = 'b52e8d1f0a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # New, empty table: plain index builds are fine here.
+    # Existing finals are filled by scripts/backfill_game_players.py.
+    op.create_table(
+        'game_players',
+        sa.Column('game_id', sa.Integer(), sa.ForeignKey('game_stats.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('slot', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('civilization', sa.String(length=50), nullable=True),
+        sa.Column('team', sa.Integer(), nullable=True),
+        sa.Column('winner', sa.Boolean(), nullable=True),
+        sa.Column('score', sa.Integer(), nullable=True),
+        sa.Column('user_uid', sa.String(), sa.ForeignKey('users.uid', ondelete='SET NULL'), nullable=True),
+        sa.Column('played_on', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('game_id', 'slot'),
+    )
+    op.create_index('ix_game_players_name_played_on', 'game_players', ['name', 'played_on'])
+    op.create_index('ix_game_players_civilization', 'game_players', ['civilization'])
+    op.create_index('ix_game_players_user_uid', 'game_players', ['user_uid'])
+
+
+def downgrade():
+    op.drop_index('ix_game_players_user_uid', table_name='game_players')
+    op.drop_index('ix_game_players_civilization', table_name='game_players')
+    op.drop_index('ix_game_players_name_played_on', table_name='game_players')
+    op.drop_table('game_players')
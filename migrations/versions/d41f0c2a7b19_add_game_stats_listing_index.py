@@ -0,0 +1,39 @@
+"""Add keyset listing index on game_stats
+
+Revision ID: d41f0c2a7b19
+Revises: 173e2e09e57f
+Create Date: 2026-10-19 09:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f0c2a7b19'
+down_revision = '173e2e09e57f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY keeps game_stats writable while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_game_stats_final_timestamp_id',
+            'game_stats',
+            ['is_final', sa.text('"timestamp" DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_game_stats_final_timestamp_id',
+            table_name='game_stats',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
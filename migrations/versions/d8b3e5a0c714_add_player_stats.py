@@ -0,0 +1,38 @@
+"""Add player_stats profile aggregates
+
+Revision ID: d8b3e5a0c714
+Revises: c6a1f93e2d58
+Create Date: 2026-10-19 16:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3e5a0c714'
+down_revision = 'c6a1f93e2d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate with scripts/rebuild_player_stats.py once game_players is backfilled
+    op.create_table(
+        'player_stats',
+        sa.Column('name', sa.String(length=100), primary_key=True),
+        sa.Column('games', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('wins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_total', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('duration_games', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('civ_games', postgresql.JSONB(), nullable=False, server_default='{}'),
+        sa.Column('civ_wins', postgresql.JSONB(), nullable=False, server_default='{}'),
+        sa.Column('recent_form', sa.String(length=10), nullable=False, server_default=''),
+        sa.Column('last_played_on', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('player_stats')
@@ -0,0 +1,75 @@
+"""Make game_stats.timestamp NOT NULL for keyset pagination
+
+Revision ID: d9e2a7c5f310
+Revises: c4a8f2e6b913
+Create Date: 2026-10-19 23:05:00.000000
+
+Listings page on (timestamp, id); a page ending on a NULL timestamp
+produced a cursor the row-value comparison could not continue from.
+
+Every step commits on its own, so no lock is held across the table scans:
+
+  1. SET DEFAULT, a short metadata-only lock, so new rows get a value;
+  2. backfill NULLs from played_on (else now) in committed id-range
+     batches, clearing their stored documents so they are re-encoded;
+  3. ADD CONSTRAINT ... CHECK NOT VALID (short lock, no scan);
+  4. VALIDATE it, which scans under SHARE UPDATE EXCLUSIVE only, so
+     reads and writes keep flowing;
+  5. SET NOT NULL, which trusts the validated CHECK instead of scanning,
+     then drop the CHECK.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e2a7c5f310'
+down_revision = 'c4a8f2e6b913'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+NOW_UTC = "(now() AT TIME ZONE 'utc')"
+CONSTRAINT = 'game_stats_timestamp_not_null'
+
+BACKFILL_SQL = f"""
+UPDATE game_stats
+SET "timestamp" = COALESCE(played_on, {NOW_UTC}), document = NULL
+WHERE "timestamp" IS NULL AND id > :low AND id <= :high
+"""
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    with op.get_context().autocommit_block():
+        # Fail fast rather than queue behind long readers for the short locks
+        op.execute("SET lock_timeout = '10s'")
+
+        # 1. Default first, so rows inserted during the backfill are not NULL
+        op.execute(f'ALTER TABLE game_stats ALTER COLUMN "timestamp" SET DEFAULT {NOW_UTC}')
+
+        # 2. Backfill; every batch commits on its own and only locks its rows
+        max_id = conn.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM game_stats")).scalar()
+        for low in range(0, max_id, BATCH_SIZE):
+            conn.execute(sa.text(BACKFILL_SQL), {"low": low, "high": low + BATCH_SIZE})
+
+        # 3. Enforced for new writes from here on; existing rows are not scanned
+        op.execute(
+            f'ALTER TABLE game_stats ADD CONSTRAINT {CONSTRAINT} '
+            f'CHECK ("timestamp" IS NOT NULL) NOT VALID'
+        )
+        # Rows inserted with an explicit NULL since the backfill began
+        conn.execute(sa.text(BACKFILL_SQL), {"low": max_id, "high": 2 ** 31 - 1})
+
+        # 4. Full scan, but under SHARE UPDATE EXCLUSIVE
+        op.execute(f'ALTER TABLE game_stats VALIDATE CONSTRAINT {CONSTRAINT}')
+
+        # 5. Metadata only: the validated CHECK proves there are no NULLs
+        op.execute('ALTER TABLE game_stats ALTER COLUMN "timestamp" SET NOT NULL')
+        op.execute(f'ALTER TABLE game_stats DROP CONSTRAINT {CONSTRAINT}')
+        op.execute("RESET lock_timeout")
+
+
+def downgrade():
+    op.alter_column('game_stats', 'timestamp', nullable=True, server_default=None)
@@ -0,0 +1,52 @@
+"""Add rating engine tables
+
+Revision ID: e4f7c2b9a816
+Revises: d8b3e5a0c714
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4f7c2b9a816'
+down_revision = 'd8b3e5a0c714'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate from history with scripts/rebuild_ratings.py
+    op.create_table(
+        'player_ratings',
+        sa.Column('name', sa.String(length=100), primary_key=True),
+        sa.Column('rating', sa.Float(), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        'ix_player_ratings_rating_name',
+        'player_ratings',
+        [sa.text('rating DESC'), 'name'],
+    )
+    op.create_table(
+        'rating_events',
+        sa.Column('replay_hash', sa.String(length=64), primary_key=True),
+        sa.Column('game_id', sa.Integer(), sa.ForeignKey('game_stats.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('deltas', postgresql.JSONB(), nullable=False),
+        sa.Column('applied_at', sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        'rating_tree',
+        sa.Column('node', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade():
+    op.drop_table('rating_tree')
+    op.drop_table('rating_events')
+    op.drop_index('ix_player_ratings_rating_name', table_name='player_ratings')
+    op.drop_table('player_ratings')
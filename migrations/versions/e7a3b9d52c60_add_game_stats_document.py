@@ -0,0 +1,26 @@
+"""Add pre-encoded document column to game_stats
+
+Revision ID: e7a3b9d52c60
+Revises: d41f0c2a7b19
+Create Date: 2026-10-19 11:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3b9d52c60'
+down_revision = 'd41f0c2a7b19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable, no default: a metadata-only change, no table rewrite.
+    # Existing finals are filled by scripts/backfill_game_documents.py.
+    op.add_column('game_stats', sa.Column('document', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('game_stats', 'document')
@@ -0,0 +1,37 @@
+"""Add head_to_head matchup aggregates
+
+Revision ID: f1d6a8c3b295
+Revises: e4f7c2b9a816
+Create Date: 2026-10-19 17:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1d6a8c3b295'
+down_revision = 'e4f7c2b9a816'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate with scripts/rebuild_head_to_head.py
+    op.create_table(
+        'head_to_head',
+        sa.Column('player', sa.String(length=100), nullable=False),
+        sa.Column('opponent', sa.String(length=100), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('wins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('losses', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_total', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('duration_games', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_played_on', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('player', 'opponent'),
+    )
+
+
+def downgrade():
+    op.drop_table('head_to_head')
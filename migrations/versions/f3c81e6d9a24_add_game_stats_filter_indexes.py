@@ -0,0 +1,41 @@
+"""Add indexes backing game_stats listing filters
+
+Revision ID: f3c81e6d9a24
+Revises: e7a3b9d52c60
+Create Date: 2026-10-19 13:05:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c81e6d9a24'
+down_revision = 'e7a3b9d52c60'
+branch_labels = None
+depends_on = None
+
+# Expressions must match db/queries.py exactly for the planner to use them.
+INDEXES = {
+    'ix_game_stats_players_doc':
+        "USING gin (CAST(players #>> '{}' AS JSONB) jsonb_path_ops)",
+    'ix_game_stats_map_name_played_on':
+        "((CAST(map AS JSONB) ->> 'name'), played_on)",
+    'ix_game_stats_map_size':
+        "((CAST(map AS JSONB) ->> 'size'))",
+    'ix_game_stats_played_on': "(played_on)",
+    'ix_game_stats_duration': "(duration)",
+    'ix_game_stats_winner': "(winner)",
+}
+
+
+def upgrade():
+    # CONCURRENTLY keeps ingest running while each index builds
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON game_stats {definition}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
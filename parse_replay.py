@@ -4,6 +4,7 @@ import json
 import logging
 import argparse
 import asyncio
+from collections import OrderedDict
 from datetime import datetime
 import requests
 
@@ -12,6 +13,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils.replay_parser import parse_replay_full, hash_replay_file
 from config import load_config, get_api_targets
 from utils.extract_datetime import extract_datetime_from_filename
+from utils.payload_delta import make_delta
+from utils.content_encoding import (
+    IDENTITY,
+    MIN_COMPRESS_BYTES,
+    available_encodings,
+    choose_encoding,
+    compress,
+    parse_accept_encoding,
+)
 
 # ───────────────────────────────────────────────
 # 🔧 Setup
@@ -27,6 +37,102 @@ ENDPOINTS = {
     "render": "https://aoe2hd-parser-api.onrender.com/api/parse_replay"
 }
 
+# Negotiated request Content-Encoding per endpoint (None = not yet known)
+NEGOTIATED_ENCODING = {}
+
+# Last payload each endpoint acknowledged per replay: (endpoint, replay_file) → payload.
+# LRU: a long-running watcher only keeps bases for the replays it touched last.
+LAST_ACKED = OrderedDict()
+LAST_ACKED_MAX = 64
+DELTA_UNSUPPORTED = set()
+
+# ───────────────────────────────────────────────
+# 🗜️ Compressed upload with encoding negotiation
+# ───────────────────────────────────────────────
+def post_json(url: str, payload: dict, headers: dict):
+    """
+    POST `payload` as JSON, compressed with the best coding the server accepts.
+
+    The first upload optimistically uses our preferred coding. Servers that
+    understand it answer with an `Accept-Encoding` header listing what they
+    decode, on errors too, and reject an unsupported coding with 415; we
+    retry once with the best coding they list. A 400/422 without that
+    header comes from an old server that could not read the body, so we
+    retry once uncompressed. Any other 400/422 is a real validation error
+    and is returned as is.
+    """
+    endpoint = url.split("?", 1)[0]
+    raw = json.dumps(payload).encode("utf-8")
+    encoding = NEGOTIATED_ENCODING.get(endpoint) or available_encodings()[0]
+    if len(raw) < MIN_COMPRESS_BYTES:
+        encoding = IDENTITY
+
+    response = _post_encoded(url, raw, encoding, headers)
+    server_codings = parse_accept_encoding(response.headers.get("Accept-Encoding"))
+    rejected = response.status_code == 415 or (
+        response.status_code in (400, 422) and not server_codings
+    )
+    if encoding != IDENTITY and rejected:
+        fallback = choose_encoding(server_codings)
+        logging.warning(f"↩️ {url} rejected {encoding} body, retrying with {fallback}")
+        response = _post_encoded(url, raw, fallback, headers)
+        if response.ok:
+            NEGOTIATED_ENCODING[endpoint] = fallback
+        return response
+
+    if server_codings:
+        NEGOTIATED_ENCODING[endpoint] = choose_encoding(server_codings)
+    elif response.ok and encoding != IDENTITY:
+        NEGOTIATED_ENCODING.setdefault(endpoint, encoding)
+    return response
+
+def _post_encoded(url: str, raw: bytes, encoding: str, headers: dict):
+    headers = {**headers, "Content-Type": "application/json"}
+    if encoding != IDENTITY:
+        headers["Content-Encoding"] = encoding
+    return requests.post(url, data=compress(raw, encoding), headers=headers)
+
+# ───────────────────────────────────────────────
+# 🔀 Live iterations as deltas
+# ───────────────────────────────────────────────
+def send_payload(url: str, query: str, payload: dict, headers: dict, is_final: bool):
+    """
+    Send one iteration to `url`, as a delta against the last acknowledged
+    iteration of the same replay when possible.
+
+    Finals always go out as full documents. A delta the server cannot
+    apply (409 base mismatch, 422 bad patch) or an old server without the
+    delta endpoint falls back to the full document.
+    """
+    key = (url, payload["replay_file"])
+    base = LAST_ACKED.get(key)
+
+    if base and not is_final and url not in DELTA_UNSUPPORTED:
+        delta_body = {
+            "replay_file": payload["replay_file"],
+            "base_iteration": base["parse_iteration"],
+            "base_hash": base["replay_hash"],
+            "delta": make_delta(base, payload),
+        }
+        response = post_json(url.rstrip("/") + "/delta" + query, delta_body, headers)
+        if response.status_code in (404, 405):
+            DELTA_UNSUPPORTED.add(url)
+        if response.status_code in (404, 405, 409, 422):
+            logging.info(f"↩️ Delta not accepted ({response.status_code}), sending full document")
+            response = post_json(url + query, payload, headers)
+    else:
+        response = post_json(url + query, payload, headers)
+
+    if response.ok and not is_final:
+        LAST_ACKED[key] = payload
+        LAST_ACKED.move_to_end(key)
+        while len(LAST_ACKED) > LAST_ACKED_MAX:
+            LAST_ACKED.popitem(last=False)
+    else:
+        # Unacknowledged: the next iteration goes out in full
+        LAST_ACKED.pop(key, None)
+    return response
+
 # ───────────────────────────────────────────────
 # 🧠 Core
 # ───────────────────────────────────────────────
@@ -57,11 +163,11 @@ async def parse_and_send(replay_path: str, force: bool = False, parse_iteration:
 
     for target in api_targets:
         url = ENDPOINTS.get(target) or target
-        full_url = url
+        query = ""
         if force:
-            full_url += "?force=true"
+            query = "?force=true"
         elif is_final:
-            full_url += "?mode=final"
+            query = "?mode=final"
 
         try:
             logging.info(f"📤 Sending to [{target}] → {parsed['replay_file']}")
@@ -70,7 +176,7 @@ async def parse_and_send(replay_path: str, force: bool = False, parse_iteration:
             if token:
                 headers["Authorization"] = f"Bearer {token}"
 
-            response = requests.post(full_url, json=parsed, headers=headers)
+            response = send_payload(url, query, parsed, headers, is_final)
 
             if response.ok:
                 logging.info(f"✅ [{target}] Response: {response.status_code} - {response.text}")
@@ -8,3 +8,8 @@ from . import bets
 from . import user_ping
 from . import chain_id
 from . import traffic_route
+from . import export_routes_async
+from . import player_routes_async
+from . import leaderboard_routes_async
+from . import meta_routes_async
+from . import presence_routes_async
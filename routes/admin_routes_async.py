@@ -5,6 +5,10 @@ from db.models import User
 from db.db import get_async_session
 from datetime import datetime
 from sqlalchemy import desc
+from utils.invalidation import publish
+from utils.user_cache import USER_CHANNEL, user_cache
+from db.presence import presence, publish_removal
+from utils.online_index import online_index, epoch
 import os
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
@@ -47,15 +51,22 @@ async def mark_user_online(
     if not uid:
         raise HTTPException(status_code=400, detail="Missing UID")
 
-    result = await session.execute(select(User).where(User.uid == uid))
-    user = result.scalar_one_or_none()
-
-    if not user:
+    result = await session.execute(
+        select(User.in_game_name, User.verified).where(User.uid == uid)
+    )
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.last_seen = datetime.utcnow()
-    await session.commit()
-    return {"message": "User marked online", "last_seen": user.last_seen.isoformat()}
+    # Buffered like /api/user/ping; written by the presence flusher
+    last_seen = presence.record(uid)
+    user_cache.patch(uid, last_seen=last_seen)
+    online_index.touch(uid, epoch(last_seen), {
+        "uid": uid,
+        "in_game_name": row.in_game_name,
+        "verified": row.verified,
+    })
+    return {"message": "User marked online", "last_seen": last_seen.isoformat()}
 
 # ───────────────────────────────────────────────
 # ❌ Delete User by UID (Admin only)
@@ -76,5 +87,10 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
 
     await session.delete(user)
+    await publish(session, USER_CHANNEL, uid)
+    await publish_removal(session, uid)
     await session.commit()
+    # The NOTIFY reaches this worker too; don't wait for it here
+    presence.forget(uid)
+    online_index.discard(uid)
     return {"message": f"Deleted user {uid}"}
@@ -1,7 +1,10 @@
 # routes/bets.py
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 
+from db.db import get_db
+from db.queries import head_to_head_record
+
 router = APIRouter()
 bets = {}
 
@@ -20,6 +23,12 @@ def create_bet(bet: Bet):
     bets[bet.match_id] = bet.dict()
     return {"message": "Bet created!", "bet_id": bet.match_id}
 
+@router.get("/bets/matchup")
+async def get_matchup(player_1: str, player_2: str, db_gen=Depends(get_db)):
+    """Head-to-head history for pricing a bet, from player_1's side."""
+    async with db_gen as db:
+        return await head_to_head_record(db, player_1, player_2)
+
 @router.post("/bets/accept/{match_id}")
 def accept_bet(match_id: str):
     if match_id not in bets:
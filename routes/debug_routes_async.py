@@ -1,8 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.models import GameStats, User
+from db.models import GameStats, User, PlayerStats, PlayerRating, RatingTreeNode, HeadToHead, CivMetaRollup
 from db.db import get_db
+from db.presence import presence
+from utils.online_index import online_index
+from utils.invalidation import publish
+from utils.response_cache import GAME_STATS_CHANNEL, game_stats_cache
+from utils.token_cache import token_cache
+from utils.user_cache import USER_CHANNEL, user_cache
+from utils.request_logging import log_stats
+from utils.google_certs import cert_store
 import os
 
 router = APIRouter(prefix="/debug", tags=["Debug"])
@@ -10,14 +18,53 @@ router = APIRouter(prefix="/debug", tags=["Debug"])
 
 @router.get("/game_count")
 async def debug_count(db_gen=Depends(get_db)):
+    """
+    Row counts in one pass over ix_game_stats_final_timestamp_id.
+
+    Both aggregates only touch `is_final`, which the index covers, so
+    Postgres answers with a single index-only scan. Finals are unique per
+    replay_hash (uq_replay_final), so `final_games` is the unique count.
+    """
     async with db_gen as db:
-        total = await db.scalar(select(func.count()).select_from(GameStats))
-        finals = await db.scalar(
-            select(func.count())
-            .select_from(GameStats)
-            .where(GameStats.is_final.is_(True))
-        )
-        return {"total_games": total, "final_games": finals}
+        counts = (
+            await db.execute(
+                select(
+                    func.count().label("total"),
+                    func.count().filter(GameStats.is_final.is_(True)).label("finals"),
+                ).select_from(GameStats)
+            )
+        ).one()
+        return {"total_games": counts.total, "final_games": counts.finals}
+
+
+@router.get("/game_stats_cache")
+async def debug_game_stats_cache():
+    return game_stats_cache.stats()
+
+
+@router.get("/auth_cache")
+async def debug_auth_cache():
+    return token_cache.stats()
+
+
+@router.get("/google_certs")
+async def debug_google_certs():
+    return cert_store.stats()
+
+
+@router.get("/user_cache")
+async def debug_user_cache():
+    return user_cache.stats()
+
+
+@router.get("/request_log")
+async def debug_request_log():
+    return log_stats()
+
+
+@router.get("/presence")
+async def debug_presence():
+    return {**presence.stats(), "index": online_index.stats()}
 
 
 @router.delete("/delete_all")
@@ -28,5 +75,10 @@ async def delete_all(db_gen=Depends(get_db)):
 
         await db.execute(delete(GameStats))
         await db.execute(delete(User))
+        # Aggregates derived from the deleted games
+        for model in (PlayerStats, PlayerRating, RatingTreeNode, HeadToHead, CivMetaRollup):
+            await db.execute(delete(model))
+        await publish(db, GAME_STATS_CHANNEL)
+        await publish(db, USER_CHANNEL)
         await db.commit()
         return {"message": "All game stats and users deleted."}
@@ -0,0 +1,112 @@
+# routes/export_routes_async.py
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from db.db import async_session
+from db.models import GameStats
+from db.models.game_stats import serialize_game
+from db.queries import load_game_documents
+
+router = APIRouter(prefix="/api", tags=["export"])
+
+EXPORT_BATCH_SIZE = 500
+CSV_FIELDS = (
+    "id", "replay_hash", "timestamp", "played_on", "game_version", "game_type",
+    "map", "duration", "game_duration", "winner", "players",
+)
+CSV_HEADER = (
+    "id", "replay_hash", "timestamp", "played_on", "game_version", "game_type",
+    "map_name", "map_size", "duration", "game_duration", "winner", "players",
+)
+
+
+def _finals_since(columns, since: datetime | None):
+    # Oldest first so incremental pulls can resume from the last timestamp seen;
+    # walks ix_game_stats_final_timestamp_id backwards.
+    query = select(*columns).where(GameStats.is_final.is_(True))
+    if since:
+        query = query.where(GameStats.timestamp >= since)
+    return (
+        query
+        .order_by(GameStats.timestamp.asc(), GameStats.id.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+async def _ndjson_chunks(since):
+    # The session lives inside the generator: dependencies are torn down
+    # before a StreamingResponse body is sent.
+    async with async_session() as session:
+        result = await session.stream(
+            _finals_since([GameStats.document, GameStats.id], since)
+        )
+        async for rows in result.partitions():
+            docs = await load_game_documents(session, rows)
+            yield b"\n".join(docs) + b"\n"
+
+
+def _csv_row(game: dict) -> list:
+    map_data = game["map"] or {}
+    return [
+        game["id"], game["replay_hash"], game["timestamp"], game["played_on"],
+        game["game_version"], game["game_type"],
+        map_data.get("name"), map_data.get("size"),
+        game["duration"], game["game_duration"], game["winner"],
+        json.dumps(game["players"] or []),
+    ]
+
+
+async def _csv_chunks(since):
+    async with async_session() as session:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+        yield buffer.getvalue().encode("utf-8")
+
+        result = await session.stream(
+            _finals_since([getattr(GameStats, f) for f in CSV_FIELDS], since)
+        )
+        async for rows in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(_csv_row(serialize_game(row, CSV_FIELDS)) for row in rows)
+            yield buffer.getvalue().encode("utf-8")
+
+
+# ───────────────────────────────────────────────
+# 📤 Streaming export of every final
+# ───────────────────────────────────────────────
+@router.get("/game_stats/export")
+async def export_game_stats(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: str | None = Query(None, description="ISO timestamp; only finals ingested at or after it"),
+):
+    """
+    Stream all finals, oldest first, as NDJSON (stored documents) or CSV.
+
+    Rows come off a server-side cursor in batches of EXPORT_BATCH_SIZE and
+    are written out as they arrive, so memory stays flat however long the
+    history is. Pass the last `timestamp` you received as `since` to pull
+    incrementally.
+    """
+    try:
+        since_dt = datetime.fromisoformat(since) if since else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid 'since' timestamp")
+
+    logging.getLogger(__name__).info(f"📤 Exporting finals as {format} since {since_dt}")
+    if format == "csv":
+        return StreamingResponse(
+            _csv_chunks(since_dt),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="game_stats.csv"'},
+        )
+    return StreamingResponse(_ndjson_chunks(since_dt), media_type="application/x-ndjson")
@@ -0,0 +1,46 @@
+# routes/leaderboard_routes_async.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from db.db import get_db
+from db.models import PlayerRating
+from db.ratings import leaderboard_page, rank_of_rating
+
+router = APIRouter(prefix="/api/leaderboard", tags=["leaderboard"])
+
+MAX_LEADERBOARD_PAGE = 100
+
+
+@router.get("")
+async def get_leaderboard(
+    limit: int = Query(default=25, ge=1, le=MAX_LEADERBOARD_PAGE),
+    offset: int = Query(default=0, ge=0),
+    db_gen=Depends(get_db),
+):
+    """
+    GET /api/leaderboard?limit=&offset=
+    Standings by rating; ties within a rating point share a rank.
+    """
+    async with db_gen as db:
+        entries, total = await leaderboard_page(db, limit, offset)
+        return {"players": entries, "total": total, "offset": offset}
+
+
+@router.get("/rank/{name}")
+async def get_player_rank(name: str, db_gen=Depends(get_db)):
+    """
+    GET /api/leaderboard/rank/{name}
+    A player's rating and rank without scanning the leaderboard.
+    """
+    async with db_gen as db:
+        rating = await db.get(PlayerRating, name)
+        if rating is None:
+            raise HTTPException(status_code=404, detail="Player has no rating")
+        rank, total = await rank_of_rating(db, rating.rating)
+        return {
+            "name": rating.name,
+            "rating": round(rating.rating, 1),
+            "games": rating.games,
+            "rank": rank,
+            "total": total,
+        }
@@ -0,0 +1,61 @@
+# routes/meta_routes_async.py
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from db.db import get_db
+from db.queries import civ_meta, civ_meta_monthly
+
+router = APIRouter(prefix="/api/meta", tags=["meta"])
+
+
+def _month(value: str | None, name: str):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must look like YYYY-MM")
+
+
+@router.get("/civs")
+async def get_civ_meta(
+    map: str | None = None,
+    version: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    db_gen=Depends(get_db),
+):
+    """
+    GET /api/meta/civs?map=&version=&since=YYYY-MM&until=YYYY-MM
+    Civ pick and win rates, aggregated from civ_meta_rollup.
+    """
+    filters = {
+        "map": map,
+        "version": version,
+        "since": _month(since, "since"),
+        "until": _month(until, "until"),
+    }
+    async with db_gen as db:
+        return {**await civ_meta(db, **filters), "filters": {
+            "map": map, "version": version, "since": since, "until": until,
+        }}
+
+
+@router.get("/civs/{civilization}/monthly")
+async def get_civ_monthly(
+    civilization: str,
+    map: str | None = None,
+    version: str | None = None,
+    db_gen=Depends(get_db),
+):
+    """
+    GET /api/meta/civs/{civilization}/monthly?map=&version=
+    A civ's picks and win rate per month.
+    """
+    async with db_gen as db:
+        return {
+            "civilization": civilization,
+            "months": await civ_meta_monthly(db, civilization, map=map, version=version),
+        }
@@ -0,0 +1,58 @@
+# routes/player_routes_async.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from db.db import get_db
+from db.models import PlayerStats
+from db.queries import head_to_head_record, opponents_of, search_player_names
+
+router = APIRouter(prefix="/api/player", tags=["player"])
+
+MAX_SEARCH_RESULTS = 25
+
+
+@router.get("/{name}/stats")
+async def get_player_stats(name: str, db_gen=Depends(get_db)):
+    """
+    GET /api/player/{name}/stats
+    Profile aggregates, served by a single primary-key lookup on player_stats.
+    """
+    async with db_gen as db:
+        stats = await db.get(PlayerStats, name)
+        if stats is None:
+            raise HTTPException(status_code=404, detail="Player not found")
+        return stats.to_dict()
+
+
+@router.get("/{name}/opponents")
+async def get_player_opponents(name: str, db_gen=Depends(get_db)):
+    """
+    GET /api/player/{name}/opponents
+    Head-to-head records against everyone this player has faced.
+    """
+    async with db_gen as db:
+        return {"player": name, "opponents": await opponents_of(db, name)}
+
+
+@router.get("/{name}/vs/{opponent}")
+async def get_head_to_head(name: str, opponent: str, db_gen=Depends(get_db)):
+    """
+    GET /api/player/{name}/vs/{opponent}
+    One matchup, from `name`'s side.
+    """
+    async with db_gen as db:
+        return await head_to_head_record(db, name, opponent)
+
+
+@router.get("/search")
+async def search_players(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=MAX_SEARCH_RESULTS),
+    db_gen=Depends(get_db),
+):
+    """
+    GET /api/player/search?q=...&limit=...
+    Typeahead over registered in-game names and names seen in finals.
+    """
+    async with db_gen as db:
+        return {"query": q, "results": await search_player_names(db, q.strip(), limit)}
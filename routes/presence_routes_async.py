@@ -0,0 +1,117 @@
+# routes/presence_routes_async.py
+
+import time
+import asyncio
+import logging
+
+from fastapi import APIRouter, HTTPException, WebSocket
+from starlette.websockets import WebSocketDisconnect, WebSocketState
+
+from db.db import async_session
+from db.presence import presence
+from dependencies.auth import verify_token_cached
+from routes.user_me import load_user
+from utils.online_index import online_index
+from utils.presence_hub import PresenceHub
+
+router = APIRouter(prefix="/api/presence", tags=["presence"])
+logger = logging.getLogger(__name__)
+
+AUTH_TIMEOUT = 10         # seconds to send {"token": ...} after connecting
+
+# Close codes (4000-4999 are application-defined)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_TOKEN_EXPIRED = 4403
+
+presence_hub = PresenceHub(online_index, record=presence.record, leave=presence.leave)
+
+
+async def _authenticate(websocket: WebSocket):
+    """First frame must be {"token": "<Firebase ID token>"}; returns (user, claims) or None."""
+    try:
+        message = await asyncio.wait_for(websocket.receive_json(), AUTH_TIMEOUT)
+        claims = await verify_token_cached(str(message.get("token") or ""))
+    except (asyncio.TimeoutError, WebSocketDisconnect, HTTPException, ValueError, AttributeError, KeyError):
+        return None
+    uid = claims.get("uid")
+    if not uid:
+        return None
+    async with async_session() as db:
+        user = await load_user(uid, db)
+    return (user, claims) if user else None
+
+
+async def _write(websocket: WebSocket, subscriber) -> None:
+    while True:
+        message = await subscriber.queue.get()
+        if message is None:
+            await websocket.close(code=subscriber.close_code)
+            return
+        await websocket.send_text(message)
+
+
+@router.websocket("/ws")
+async def presence_socket(websocket: WebSocket):
+    """
+    WS /api/presence/ws
+    Replaces polling /api/user/ping and /api/user/online_users: the open
+    socket keeps the user online, and the server pushes
+    {"type": "snapshot", "users": [...]} once, then at most one
+    {"type": "diff", "online": [user, ...], "offline": [uid, ...]}
+    per second while presence changes.
+    The socket is closed with 4403 when the ID token expires; reconnect
+    with a fresh one.
+    """
+    await websocket.accept()
+    authenticated = await _authenticate(websocket)
+    if authenticated is None:
+        # Nothing to close if the client already left
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close(code=CLOSE_UNAUTHORIZED)
+        return
+    user, claims = authenticated
+
+    subscriber = presence_hub.attach(user.uid, {
+        "uid": user.uid,
+        "in_game_name": user.in_game_name,
+        "verified": user.verified,
+    })
+    writer = asyncio.create_task(_write(websocket, subscriber))
+    receive = None
+    expires_at = claims.get("exp") or time.time() + 3600
+    try:
+        # Client frames carry nothing; reading only notices disconnects
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                await websocket.close(code=CLOSE_TOKEN_EXPIRED)
+                break
+            if receive is None:
+                receive = asyncio.ensure_future(websocket.receive())
+            done, _ = await asyncio.wait(
+                {writer, receive}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if writer in done:
+                # Retrieve the writer's failure, e.g. a send to a vanished client
+                error = writer.exception()
+                if error is not None and not isinstance(error, WebSocketDisconnect):
+                    logger.debug(f"Presence writer for {user.uid} stopped: {error!r}")
+                break
+            if receive in done:
+                if receive.result()["type"] == "websocket.disconnect":
+                    break
+                receive = None
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"❌ Presence socket for {user.uid} failed: {e}")
+    finally:
+        presence_hub.detach(subscriber)
+        writer.cancel()
+        if receive is not None:
+            receive.cancel()
+
+
+@router.get("/stats")
+async def presence_stats():
+    return presence_hub.stats()
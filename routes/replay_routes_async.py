@@ -1,15 +1,85 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.db import get_db
+from db.ingest import record_final
 from db.models import GameStats, User
 from datetime import datetime
 from routes.user_me import get_current_user
-import json
+from utils.payload_delta import apply_delta
+from utils.invalidation import publish
+from utils.trace_writer import trace_final_game
+from utils.response_cache import GAME_STATS_CHANNEL
+from utils.content_encoding import (
+    IDENTITY,
+    DEFAULT_MAX_DECOMPRESSED_BYTES,
+    StreamingBodyDecoder,
+    UnsupportedEncoding,
+    PayloadTooLarge,
+    accept_encoding_header,
+)
 import logging
+import os
 
-router = APIRouter(prefix="/api", tags=["replay"])
+MAX_DECOMPRESSED_BODY = int(
+    os.getenv("MAX_DECOMPRESSED_BODY_BYTES", DEFAULT_MAX_DECOMPRESSED_BYTES)
+)
+
+
+# ───────────────────────────────────────────────
+# 🗜️ Content-Encoding aware request bodies
+# ───────────────────────────────────────────────
+class DecodedBodyRequest(Request):
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            encoding = self.headers.get("content-encoding", IDENTITY).strip().lower()
+            if encoding in ("", IDENTITY):
+                return await super().body()
+            try:
+                decoder = StreamingBodyDecoder(encoding, MAX_DECOMPRESSED_BODY)
+                async for chunk in self.stream():
+                    decoder.feed(chunk)
+                self._body = decoder.finish()
+            except UnsupportedEncoding:
+                raise HTTPException(
+                    status_code=415,
+                    detail=f"Unsupported Content-Encoding: {encoding}",
+                    headers={"Accept-Encoding": accept_encoding_header()},
+                )
+            except PayloadTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            except (ValueError, OSError) as e:
+                raise HTTPException(status_code=400, detail=f"Malformed {encoding} body: {e}")
+        return self._body
+
+
+class DecodedBodyRoute(APIRoute):
+    """Decompress gzip/zstd bodies and advertise supported codings (RFC 7694)."""
+
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request):
+            # Error responses advertise codings too, so clients can tell a
+            # rejected body from a server that never decodes compression
+            try:
+                response = await original_handler(DecodedBodyRequest(request.scope, request.receive))
+            except StarletteHTTPException as e:
+                response = await http_exception_handler(request, e)
+            except RequestValidationError as e:
+                response = await request_validation_exception_handler(request, e)
+            response.headers["Accept-Encoding"] = accept_encoding_header()
+            return response
+
+        return handler
+
+
+router = APIRouter(prefix="/api", tags=["replay"], route_class=DecodedBodyRoute)
 
 
 class ParseReplayRequest(BaseModel):
@@ -20,13 +90,87 @@ class ParseReplayRequest(BaseModel):
     game_version: str | None = None
     map_name: str = "Unknown"
     map_size: str = "Unknown"
+    map: dict | None = None
     game_type: str | None = None
     duration: int = 0
+    game_duration: int | None = None
     winner: str = "Unknown"
     players: list = []
     played_on: str | None = None
 
 
+class ParseReplayDeltaRequest(BaseModel):
+    replay_file: str
+    base_iteration: int
+    base_hash: str
+    delta: dict
+
+
+def ingest_document(game: GameStats) -> dict:
+    """Rebuild the ingest document (as the watcher sends it) from a stored row."""
+    return {
+        "replay_file": game.replay_file,
+        "replay_hash": game.replay_hash,
+        "parse_iteration": game.parse_iteration,
+        "is_final": game.is_final,
+        "game_version": game.game_version,
+        "map": game.map or {},
+        "game_type": game.game_type,
+        "duration": game.duration,
+        "game_duration": game.game_duration,
+        "winner": game.winner,
+        "players": game.players or [],
+        "played_on": game.played_on.isoformat() if game.played_on else None,
+    }
+
+
+async def store_replay(db: AsyncSession, data: ParseReplayRequest, current_user: User, mode: str | None):
+    if mode == "final" and data.is_final:
+        existing = await db.execute(
+            select(GameStats).where(
+                GameStats.replay_hash == data.replay_hash,
+                GameStats.is_final.is_(True),
+            )
+        )
+        if existing.scalars().first():
+            logging.info(f"🛡️ Skipped duplicate final replay: {data.replay_hash}")
+            return {"message": "Replay already parsed as final. Skipped."}
+
+    map_data = data.map or {"name": data.map_name, "size": data.map_size}
+    game = GameStats(
+        user_uid=current_user.uid,  # ✅ Save user UID
+        replay_file=data.replay_file,
+        replay_hash=data.replay_hash,
+        game_version=data.game_version,
+        map={
+            "name": map_data.get("name", "Unknown"),
+            "size": map_data.get("size", "Unknown"),
+        },
+        game_type=data.game_type,
+        duration=data.duration,
+        game_duration=data.game_duration,
+        winner=data.winner,
+        players=data.players,
+        parse_iteration=data.parse_iteration,
+        is_final=data.is_final,
+        played_on=(
+            datetime.fromisoformat(data.played_on) if data.played_on else None
+        ),
+    )
+    db.add(game)
+    if data.is_final:
+        await db.flush()
+        game.document = game.encode_document()
+        await record_final(db, game)
+        await publish(db, GAME_STATS_CHANNEL)
+    await db.commit()
+
+    if data.is_final:
+        trace_final_game(game)
+
+    return {"message": f"Replay stored (iteration {data.parse_iteration})"}
+
+
 @router.post("/parse_replay")
 async def parse_new_replay(
     data: ParseReplayRequest,
@@ -35,37 +179,45 @@ async def parse_new_replay(
     mode: str = Query(default=None),
 ):
     async with db_gen as db:
-        if mode == "final" and data.is_final:
-            existing = await db.execute(
-                select(GameStats).where(
-                    GameStats.replay_hash == data.replay_hash,
-                    GameStats.is_final.is_(True),
-                )
+        return await store_replay(db, data, current_user, mode)
+
+
+# ───────────────────────────────────────────────
+# 🔀 Live iteration deltas
+# ───────────────────────────────────────────────
+@router.post("/parse_replay/delta")
+async def parse_replay_delta(
+    data: ParseReplayDeltaRequest,
+    db_gen=Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    mode: str = Query(default=None),
+):
+    """
+    Store a live iteration sent as a delta against an earlier iteration.
+
+    Answers 409 `base_mismatch` when the base iteration is not stored here
+    for this user, which tells the watcher to resend the full document.
+    """
+    async with db_gen as db:
+        result = await db.execute(
+            select(GameStats).where(
+                GameStats.user_uid == current_user.uid,
+                GameStats.replay_file == data.replay_file,
+                GameStats.parse_iteration == data.base_iteration,
+                GameStats.replay_hash == data.base_hash,
             )
-            if existing.scalars().first():
-                logging.info(f"🛡️ Skipped duplicate final replay: {data.replay_hash}")
-                return {"message": "Replay already parsed as final. Skipped."}
-
-        game = GameStats(
-            user_uid=current_user.uid,  # ✅ Save user UID
-            replay_file=data.replay_file,
-            replay_hash=data.replay_hash,
-            game_version=data.game_version,
-            map=json.dumps({"name": data.map_name, "size": data.map_size}),
-            game_type=data.game_type,
-            duration=data.duration,
-            winner=data.winner,
-            players=json.dumps(data.players),
-            parse_iteration=data.parse_iteration,
-            is_final=data.is_final,
-            played_on=(
-                datetime.fromisoformat(data.played_on) if data.played_on else None
-            ),
         )
-        db.add(game)
-        await db.commit()
+        base = result.scalars().first()
+        if not base:
+            raise HTTPException(status_code=409, detail="base_mismatch")
+
+        try:
+            doc = apply_delta(ingest_document(base), data.delta)
+            full = ParseReplayRequest(**doc)
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=422, detail=f"Invalid delta: {e}")
 
-        return {"message": f"Replay stored (iteration {data.parse_iteration})"}
+        return await store_replay(db, full, current_user, mode)
 
 
 @router.get("/health")
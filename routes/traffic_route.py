@@ -1,11 +1,11 @@
 # routes/traffic_route.py (full production patch restored)
 
 from fastapi import APIRouter, Depends
-from firebase_admin import auth
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from db.db import get_db
 from db.models import User
+from utils.firebase_utils import get_firebase_app
 import subprocess, os, re, json
 from collections import defaultdict, Counter
 from datetime import datetime, timedelta
@@ -41,8 +41,10 @@ def get_country(ip):
 async def get_traffic_stats(db: AsyncSession = Depends(get_db)):
     try:
         # --- Firebase & Postgres users ---------------------------------
+        from firebase_admin import auth
+
         firebase_emails = []
-        for u in auth.list_users().iterate_all():
+        for u in auth.list_users(app=get_firebase_app()).iterate_all():
             if getattr(u, "email", None):          # skip users without email
                 firebase_emails.append(u.email.strip().lower())
 
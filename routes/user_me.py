@@ -7,20 +7,44 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from db.db import get_db
 from db.models import User
 from dependencies.auth import get_firebase_user
+from utils.user_cache import user_cache
 
 router = APIRouter(tags=["user"])
 
+
+def snapshot_user(user: User) -> dict:
+    return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+
+async def load_user(uid: str, db: AsyncSession) -> User | None:
+    """Detached copy of the `users` row for `uid`, through the user cache."""
+    snapshot = user_cache.get(uid)
+    if snapshot is None:
+        generation = user_cache.generation
+        result = await db.execute(select(User).where(User.uid == uid))
+        user = result.scalar_one_or_none()
+        if not user:
+            return None
+        snapshot = snapshot_user(user)
+        user_cache.put(uid, snapshot, generation)
+    return User(**snapshot)
+
+
 # 🔑 Dependency to retrieve current logged-in user
 async def get_current_user(
     credentials: dict = Depends(get_firebase_user),
     db: AsyncSession = Depends(get_db),
 ) -> User:
+    """
+    The caller's `users` row, served from the per-worker user cache when
+    possible. The result is a detached copy: write through UPDATE statements
+    and publish on USER_CHANNEL rather than mutating it.
+    """
     uid = credentials.get("uid")
     if not uid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
-    result = await db.execute(select(User).where(User.uid == uid))
-    user = result.scalar_one_or_none()
+    user = await load_user(uid, db)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
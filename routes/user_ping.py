@@ -1,12 +1,15 @@
 # routes/user_ping.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from datetime import datetime, timedelta
 
 from db.db import get_db
 from db.models.user import User
+from db.presence import presence
 from routes.user_me import get_current_user
+from utils.user_cache import user_cache
+from utils.online_index import online_index, epoch
 
 router = APIRouter(tags=["user"])
 
@@ -15,28 +18,43 @@ async def ping_anonymous():
     return {"status": "ok"}
 
 @router.get("/online_users")
-async def get_online_users(db: AsyncSession = Depends(get_db)):
-    two_minutes_ago = datetime.utcnow() - timedelta(minutes=2)
+async def get_online_users(
+    mode: str = Query("list", pattern="^(list|count)$"),
+    db: AsyncSession = Depends(get_db),
+):
+    # Served from memory once the worker's online index has been seeded
+    if online_index.ready:
+        if mode == "count":
+            return {"count": online_index.count()}
+        return online_index.online()
+
+    # Cold start: the seed has not finished yet (uses ix_users_last_seen)
+    since = datetime.utcnow() - timedelta(seconds=online_index.window)
+    if mode == "count":
+        total = await db.execute(select(func.count()).select_from(User).where(User.last_seen > since))
+        return {"count": total.scalar()}
 
     result = await db.execute(
-        select(User).where(User.last_seen > two_minutes_ago)
+        select(User.uid, User.in_game_name, User.verified).where(User.last_seen > since)
     )
-    users = result.scalars().all()
-
     return [
         {
-            "uid": u.uid,
-            "in_game_name": u.in_game_name,
-            "verified": u.verified,
+            "uid": uid,
+            "in_game_name": in_game_name,
+            "verified": verified,
         }
-        for u in users
+        for uid, in_game_name, verified in result.all()
     ]
 
 @router.post("/ping")
-async def ping_user(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    user.last_seen = datetime.utcnow()
-    await db.commit()
+async def ping_user(user: User = Depends(get_current_user)):
+    # Buffered; db/presence flushes last_seen in bulk. Not published either:
+    # presence churn would flush every worker's user cache.
+    last_seen = presence.record(user.uid)
+    user_cache.patch(user.uid, last_seen=last_seen)
+    online_index.touch(user.uid, epoch(last_seen), {
+        "uid": user.uid,
+        "in_game_name": user.in_game_name,
+        "verified": user.verified,
+    })
     return {"status": "ok"}
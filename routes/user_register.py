@@ -12,6 +12,8 @@ from db.db import get_db
 from db.models import User
 from db.schemas import UserRegisterRequest
 from dependencies.auth import get_firebase_user
+from utils.invalidation import publish
+from utils.user_cache import USER_CHANNEL
 
 # ✅ Set prefix and tag
 router = APIRouter(tags=["user"])
@@ -67,6 +69,7 @@ async def register_user(
         )
 
         db.add(new_user)
+        await publish(db, USER_CHANNEL, uid)
         await db.commit()
         await db.refresh(new_user)
 
@@ -6,6 +6,8 @@ from sqlalchemy.future import select
 from db.models.user import User
 from db.db import get_db
 from dependencies.auth import get_firebase_user
+from utils.invalidation import publish
+from utils.user_cache import USER_CHANNEL
 
 router = APIRouter(tags=["user"])
 
@@ -36,6 +38,7 @@ async def link_wallet(
         return {"status": "already_linked", "wallet": user.wallet_address}
 
     user.wallet_address = data.wallet_address
+    await publish(db, USER_CHANNEL, uid)
     await db.commit()
 
     return {"status": "linked", "wallet": user.wallet_address}
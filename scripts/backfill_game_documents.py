@@ -0,0 +1,50 @@
+# scripts/backfill_game_documents.py
+#
+# Encode the API document for finals ingested before game_stats.document
+# existed. Works in small id-ordered batches, one commit per batch, so it
+# can run against a live database.
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select
+
+from db.db import async_session
+from db.models import GameStats
+
+
+async def backfill(batch_size: int):
+    last_id, total = 0, 0
+    while True:
+        async with async_session() as session:
+            result = await session.execute(
+                select(GameStats)
+                .where(
+                    GameStats.is_final.is_(True),
+                    GameStats.document.is_(None),
+                    GameStats.id > last_id,
+                )
+                .order_by(GameStats.id)
+                .limit(batch_size)
+            )
+            games = result.scalars().all()
+            if not games:
+                break
+            for game in games:
+                game.document = game.encode_document()
+            await session.commit()
+            last_id = games[-1].id
+            total += len(games)
+            print(f"📄 Encoded {total} documents (up to id {last_id})")
+    print(f"🎯 Backfill complete: {total} documents")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill game_stats.document for finals.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
@@ -0,0 +1,58 @@
+# scripts/backfill_game_players.py
+#
+# Fill game_players for finals ingested before the table existed. Works in
+# id-ordered batches, one commit per batch, and skips games that already
+# have player rows, so it is safe to re-run against a live database.
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select, exists
+
+from db.db import async_session
+from db.ingest import linked_uids
+from db.models import GameStats, GamePlayer
+from db.models.game_player import game_player_rows
+
+
+async def backfill(batch_size: int):
+    last_id, games_done, rows_done = 0, 0, 0
+    while True:
+        async with async_session() as session:
+            result = await session.execute(
+                select(GameStats)
+                .where(
+                    GameStats.is_final.is_(True),
+                    GameStats.id > last_id,
+                    ~exists().where(GamePlayer.game_id == GameStats.id),
+                )
+                .order_by(GameStats.id)
+                .limit(batch_size)
+            )
+            games = result.scalars().all()
+            if not games:
+                break
+            names = (
+                p.get("name") for g in games for p in g.players or [] if isinstance(p, dict)
+            )
+            uids = await linked_uids(session, names)
+            for game in games:
+                rows = game_player_rows(game, uids)
+                session.add_all(rows)
+                rows_done += len(rows)
+            await session.commit()
+            last_id = games[-1].id
+            games_done += len(games)
+            print(f"👥 {rows_done} player rows from {games_done} games (up to id {last_id})")
+    print(f"🎯 Backfill complete: {rows_done} player rows from {games_done} games")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill game_players from game_stats.players.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
@@ -0,0 +1,119 @@
+# scripts/bench_game_filters.py
+#
+# Prove /api/game_stats filters run on index-backed plans at scale.
+#
+# Copies the game_stats definition (columns + indexes) into a scratch
+# `bench` schema, seeds it with --rows synthetic finals, then EXPLAIN
+# ANALYZEs the real listing query for each filter and reports which
+# indexes the plan used. The scratch schema is dropped afterwards unless
+# --keep is given. Never touches public.game_stats data or its id sequence.
+
+import sys
+import json
+import asyncio
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from db.db import engine
+from db.models.game_stats import GAME_FIELD_PRESETS, game_columns
+from db.queries import GameFilters, final_games_query
+
+# Integer civ IDs, as the replay parser stores them (utils/civs.py)
+CIVS = [2, 16, 1, 12, 15, 7, 6, 3]
+MAPS = ["Arabia", "Arena", "Black Forest", "Islands", "Nomad", "Gold Rush"]
+
+SEED_SQL = """
+INSERT INTO game_stats (id, replay_file, replay_hash, map, duration, winner, players,
+                        "timestamp", played_on, parse_iteration, is_final)
+SELECT
+    g,
+    'bench_' || g || '.aoe2record',
+    md5(g::text),
+    jsonb_build_object('name', (:maps)[1 + g % :n_maps], 'size', 'Medium'),
+    600 + (g * 7919) % 5400,
+    'player_' || (g % :n_players),
+    jsonb_build_array(
+        jsonb_build_object('name', 'player_' || (g % :n_players),
+                           'civilization', (:civs)[1 + g % :n_civs], 'winner', true, 'score', 1000),
+        jsonb_build_object('name', 'player_' || ((g * 31) % :n_players),
+                           'civilization', (:civs)[1 + (g / 7) % :n_civs], 'winner', false, 'score', 900)
+    ),
+    timestamp '2023-01-01' + g * interval '1 minute',
+    timestamp '2023-01-01' + g * interval '1 minute',
+    1,
+    true
+FROM generate_series(1, :rows) AS g
+"""
+
+CASES = {
+    "player": GameFilters(player="player_42"),
+    "player + civ": GameFilters(player="player_42", civ="Franks"),
+    "civ": GameFilters(civ="Aztecs"),
+    "winner": GameFilters(winner="player_7"),
+    "map + week": GameFilters(map="Arabia", played_after=datetime(2024, 6, 1), played_before=datetime(2024, 6, 8)),
+    "map size": GameFilters(map_size="Tiny"),
+    "played_on range": GameFilters(played_after=datetime(2024, 6, 1), played_before=datetime(2024, 6, 2)),
+    "duration range": GameFilters(min_duration=5990, max_duration=5995),
+}
+
+
+def index_nodes(plan: dict) -> list:
+    found = []
+    if "Index Name" in plan:
+        found.append(f"{plan['Node Type']} on {plan['Index Name']}")
+    for child in plan.get("Plans", []):
+        found.extend(index_nodes(child))
+    return found
+
+
+async def main(rows: int, keep: bool):
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        await conn.execute(text("CREATE SCHEMA bench"))
+        # No defaults: id would draw from public.game_stats_id_seq; seeds give explicit ids
+        await conn.execute(text(
+            "CREATE TABLE bench.game_stats (LIKE public.game_stats INCLUDING ALL EXCLUDING DEFAULTS)"
+        ))
+        await conn.execute(text("SET search_path TO bench"))
+        print(f"🌱 Seeding {rows:,} rows into bench.game_stats ...")
+        await conn.execute(text(SEED_SQL), {
+            "rows": rows, "maps": MAPS, "n_maps": len(MAPS), "civs": CIVS,
+            "n_civs": len(CIVS), "n_players": max(rows // 200, 10),
+        })
+        await conn.execute(text("ANALYZE game_stats"))
+
+    columns = game_columns(GAME_FIELD_PRESETS["summary"])
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.execute(text("SET search_path TO bench"))
+        for label, filters in CASES.items():
+            query = final_games_query(columns, filters, limit=51)
+            sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            result = await conn.execute(text("EXPLAIN (ANALYZE, FORMAT JSON) " + sql))
+            report = result.scalar()
+            report = json.loads(report) if isinstance(report, str) else report
+            plan = report[0]["Plan"]
+            used = [n for n in index_nodes(plan) if "final_timestamp_id" not in n and "pkey" not in n]
+            status = "✅" if used else "❌"
+            failures += 0 if used else 1
+            print(f"{status} {label:<16} {report[0]['Execution Time']:8.2f} ms  {'; '.join(used) or 'no filter index'}")
+
+    if not keep:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA bench CASCADE"))
+    await engine.dispose()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN game_stats filters on a large synthetic table.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench schema afterwards")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.keep))
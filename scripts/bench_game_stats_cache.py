@@ -0,0 +1,80 @@
+# scripts/bench_game_stats_cache.py
+#
+# Hit-path vs miss-path latency for the /api/game_stats response cache.
+# Runs in-process without a database: the miss path is approximated by
+# serializing a page of synthetic GameStats rows, which is what a miss
+# pays on top of the query itself.
+
+import sys
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from db.models import GameStats
+from utils.response_cache import ResponseCache, etag_matches
+
+PAGE_SIZE = 50
+ROUNDS = 20000
+
+
+def synthetic_page():
+    now = datetime.utcnow()
+    return [
+        GameStats(
+            id=i,
+            replay_file=f"/replays/MP Replay v5.8 @2025.03.19 17421{i}.aoe2record",
+            replay_hash=f"{i:064x}",
+            game_version="Version.HD",
+            map={"name": "Arabia", "size": "Medium"},
+            game_type="VER 9.4",
+            duration=1800 + i,
+            winner="Emaren",
+            players=[
+                {"name": "Emaren", "civilization": "Franks", "winner": True, "score": 2100},
+                {"name": "AS_godofredo", "civilization": "Mayans", "winner": False, "score": 1900},
+            ],
+            timestamp=now - timedelta(minutes=i),
+            parse_iteration=5,
+            is_final=True,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def bench(label, fn, rounds=ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / rounds * 1e6:9.2f} µs/op")
+
+
+def main():
+    page = synthetic_page()
+    cache = ResponseCache()
+    key = (PAGE_SIZE, None)
+
+    def miss():
+        return json.dumps({"games": [g.to_dict() for g in page], "next": None}).encode()
+
+    etag = cache.put(key, miss(), cache.generation)
+
+    def hit_304():
+        cached_etag, _ = cache.get(key)
+        assert etag_matches(etag, cached_etag)
+
+    def hit_200():
+        _, body = cache.get(key)
+        return body
+
+    bench("miss (serialize page)", miss, rounds=500)
+    bench("hit, If-None-Match → 304", hit_304)
+    bench("hit, body → 200", hit_200)
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
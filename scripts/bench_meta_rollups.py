@@ -0,0 +1,111 @@
+# scripts/bench_meta_rollups.py
+#
+# Civ meta from civ_meta_rollup vs. the raw scans it replaces.
+#
+# Seeds a scratch `bench` schema (same synthetic finals as
+# bench_game_filters.py), derives game_players and the rollup from them,
+# then times the /api/meta/civs query against two raw alternatives:
+# unpacking game_stats.players JSON, and aggregating game_players.
+# The scratch schema is dropped afterwards unless --keep is given.
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from db.db import engine
+from db.queries import civ_meta_query
+from scripts.bench_game_filters import SEED_SQL, MAPS, CIVS
+from scripts.rebuild_civ_meta import ROLLUP_SQL
+from utils.civs import civ_name
+
+# Seeded civs are integer IDs, like the parser's; game_players gets their
+# names as ingest writes them (utils.civs.civ_name)
+PLAYERS_SQL = """
+INSERT INTO game_players (game_id, slot, name, civilization, winner, score, played_on)
+SELECT g.id, e.ord - 1, e.p ->> 'name',
+       COALESCE((:civ_names)[(e.p ->> 'civilization')::int], e.p ->> 'civilization'),
+       (e.p ->> 'winner')::boolean, (e.p ->> 'score')::int, g.played_on
+FROM game_stats g, jsonb_array_elements(g.players) WITH ORDINALITY AS e(p, ord)
+"""
+
+RAW_JSON_SQL = """
+SELECT e.p ->> 'civilization' AS civilization, count(*) AS picks,
+       count(*) FILTER (WHERE (e.p ->> 'winner')::boolean) AS wins
+FROM game_stats g, jsonb_array_elements(g.players) AS e(p)
+WHERE g.is_final AND g.map ->> 'name' = :map
+GROUP BY 1
+"""
+
+RAW_PLAYERS_SQL = """
+SELECT p.civilization, count(*) AS picks, count(*) FILTER (WHERE p.winner) AS wins
+FROM game_players p JOIN game_stats g ON g.id = p.game_id
+WHERE g.map ->> 'name' = :map
+GROUP BY 1
+"""
+
+
+async def timed(conn, sql, params, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        (await conn.execute(text(sql), params)).all()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(rows: int, rounds: int, keep: bool):
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        await conn.execute(text("CREATE SCHEMA bench"))
+        for table in ("game_stats", "game_players", "civ_meta_rollup"):
+            await conn.execute(text(f"CREATE TABLE bench.{table} (LIKE public.{table} INCLUDING ALL)"))
+        await conn.execute(text("SET search_path TO bench"))
+        print(f"🌱 Seeding {rows:,} games into the bench schema ...")
+        await conn.execute(text(SEED_SQL), {
+            "rows": rows, "maps": MAPS, "n_maps": len(MAPS), "civs": CIVS,
+            "n_civs": len(CIVS), "n_players": max(rows // 200, 10),
+        })
+        await conn.execute(text(PLAYERS_SQL), {
+            "civ_names": [civ_name(civ_id) for civ_id in range(1, max(CIVS) + 1)],
+        })
+        await conn.execute(text(ROLLUP_SQL))
+        await conn.execute(text("ANALYZE"))
+
+    rollup_sql = str(civ_meta_query(map=MAPS[0]).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    async with engine.connect() as conn:
+        await conn.execute(text("SET search_path TO bench"))
+        rollup_rows = (await conn.execute(text("SELECT count(*) FROM civ_meta_rollup"))).scalar()
+        results = {
+            "raw JSON scan": await timed(conn, RAW_JSON_SQL, {"map": MAPS[0]}, rounds),
+            "raw game_players": await timed(conn, RAW_PLAYERS_SQL, {"map": MAPS[0]}, rounds),
+            "civ_meta_rollup": await timed(conn, rollup_sql, {}, rounds),
+        }
+
+    print(f"📊 Civ meta for map={MAPS[0]!r}, median of {rounds} runs ({rollup_rows:,} rollup rows)")
+    baseline = results["raw JSON scan"]
+    for label, ms in results.items():
+        print(f"   {label:<18} {ms:10.2f} ms   {baseline / ms:8.1f}x")
+
+    if not keep:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA bench CASCADE"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark civ meta rollups against raw scans.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench schema afterwards")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.rounds, args.keep))
@@ -0,0 +1,100 @@
+# scripts/bench_name_search.py
+#
+# Typeahead latency for /api/player/search at realistic name counts.
+#
+# Copies users and player_stats (columns + indexes) into a scratch `bench`
+# schema, seeds --names distinct replay names plus a slice of registered
+# users, then times search_player_names_query for short prefixes, longer
+# fragments and misspellings. Fails when p95 exceeds --budget-ms. The
+# scratch schema is dropped afterwards unless --keep is given. Defaults are
+# not copied, so seeding never draws from public.users' id sequence.
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+
+from db.db import engine
+from db.queries import search_player_names_query
+
+# Names look like "Kavor_Delin42": two pseudo-words and a number
+SEED_PLAYERS_SQL = """
+INSERT INTO player_stats (name, games, wins, duration_total, duration_games,
+                          civ_games, civ_wins, recent_form)
+SELECT DISTINCT ON (name) name, 1, 0, 0, 0, '{}', '{}', ''
+FROM (
+    SELECT initcap(translate(substr(md5(g::text), 1, 5), '0123456789', 'aeiouyrlnm'))
+           || '_' ||
+           initcap(translate(substr(md5((g * 7)::text), 1, 5), '0123456789', 'aeiouyrlnm'))
+           || (g % 100) AS name
+    FROM generate_series(1, :names) AS g
+) names
+"""
+
+SEED_USERS_SQL = """
+INSERT INTO users (id, uid, in_game_name, verified, lock_name, is_admin)
+SELECT n, 'bench_' || n, name, true, false, false
+FROM (SELECT row_number() OVER () AS n, name
+      FROM player_stats TABLESAMPLE SYSTEM (10)) sampled
+"""
+
+QUERIES = ["k", "ka", "Kav", "Kavor", "ab_c", "delin4", "avor_del", "kvaor", "Delin", "zz"]
+
+
+async def main(names: int, rounds: int, budget_ms: float, keep: bool):
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        await conn.execute(text("CREATE SCHEMA bench"))
+        for table in ("users", "player_stats"):
+            await conn.execute(text(f"CREATE TABLE bench.{table} (LIKE public.{table} INCLUDING ALL EXCLUDING DEFAULTS)"))
+        await conn.execute(text("SET search_path TO bench, public"))
+        print(f"🌱 Seeding ~{names:,} names into the bench schema ...")
+        await conn.execute(text(SEED_PLAYERS_SQL), {"names": names})
+        await conn.execute(text(SEED_USERS_SQL))
+        await conn.execute(text("ANALYZE"))
+
+    samples = {}
+    async with engine.connect() as conn:
+        await conn.execute(text("SET search_path TO bench, public"))
+        for q in QUERIES:
+            # Driver dialect, so the trigram % operator is not escaped as %%
+            sql = str(search_player_names_query(q, 10).compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            ))
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                hits = (await conn.exec_driver_sql(sql)).all()
+                timings.append((time.perf_counter() - start) * 1000)
+            samples[q] = (timings, len(hits))
+
+    worst = 0.0
+    print(f"🔎 Search latency over {rounds} rounds (ms)")
+    for q, (timings, hits) in samples.items():
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        worst = max(worst, p95)
+        print(f"   {q!r:<12} p50 {statistics.median(timings):7.2f}   p95 {p95:7.2f}   {hits} hits")
+
+    if not keep:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA bench CASCADE"))
+    await engine.dispose()
+    status = "✅" if worst <= budget_ms else "❌"
+    print(f"{status} worst p95 {worst:.2f} ms (budget {budget_ms} ms)")
+    sys.exit(0 if worst <= budget_ms else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark player name search.")
+    parser.add_argument("--names", type=int, default=300_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=20.0)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench schema afterwards")
+    args = parser.parse_args()
+    asyncio.run(main(args.names, args.rounds, args.budget_ms, args.keep))
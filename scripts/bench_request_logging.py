@@ -0,0 +1,126 @@
+# scripts/bench_request_logging.py
+#
+# Requests per second on GET /api/user/ping with the old print-based
+# BaseHTTPMiddleware versus RequestLogMiddleware (sampled and unsampled).
+# Drives the ASGI app directly (no server, socket or HTTP client), so the
+# numbers are framework + middleware cost only; stdout goes to --log-file
+# to keep terminal speed out of it. Best of --rounds is reported.
+
+import sys
+import asyncio
+import argparse
+import contextlib
+import logging
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from routes import user_ping
+from utils.request_logging import RequestLogMiddleware, start_log_listener, stop_log_listener
+
+
+class LegacyLogMiddleware(BaseHTTPMiddleware):
+    """The middleware app.py used before, verbatim."""
+
+    async def dispatch(self, request: Request, call_next):
+        print(f"📩 Incoming Request: {request.method} {request.url}")
+        if "authorization" in request.headers:
+            token_preview = request.headers["authorization"][:40]
+            print(f"🔑 Auth Header (first 40 chars): {token_preview}...")
+        else:
+            print("⚠️ No Authorization header present.")
+        return await call_next(request)
+
+
+def make_app(middleware=None, **options):
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    app.include_router(user_ping.router, prefix="/api/user")
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/user/ping",
+    "raw_path": b"/api/user/ping",
+    "query_string": b"",
+    "root_path": "",
+    "headers": [
+        (b"host", b"bench"),
+        (b"user-agent", b"bench/1.0"),
+        (b"authorization", b"Bearer " + b"x" * 900),
+    ],
+    "client": ("127.0.0.1", 50000),
+    "server": ("bench", 80),
+}
+
+
+async def call(app):
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(dict(SCOPE), receive, send)
+    assert status == 200, status
+
+
+async def run(app, requests, concurrency):
+    async def worker(n):
+        for _ in range(n):
+            await call(app)
+
+    await worker(50)  # warm up
+    per_worker = requests // concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--log-file", default="/dev/null")
+    args = parser.parse_args()
+
+    cases = [
+        ("no logging", make_app()),
+        ("BaseHTTPMiddleware + print", make_app(LegacyLogMiddleware)),
+        ("ASGI, every request", make_app(RequestLogMiddleware, sampling={"/api/user/ping": 1.0})),
+        ("ASGI, ping sampled 1%", make_app(RequestLogMiddleware)),
+    ]
+
+    with open(args.log_file, "w") as sink, contextlib.redirect_stdout(sink):
+        logging.getLogger().addHandler(logging.StreamHandler(sink))
+        start_log_listener("INFO")
+        best = {label: 0.0 for label, _ in cases}
+        for _ in range(args.rounds):  # interleaved, so drift hits every case alike
+            for label, app in cases:
+                rps = asyncio.run(run(app, args.requests, args.concurrency))
+                best[label] = max(best[label], rps)
+        results = list(best.items())
+        stop_log_listener()
+
+    baseline = results[1][1]
+    for label, rps in results:
+        print(f"{label:<28} {rps:9.0f} req/s  ({rps / baseline - 1:+.0%} vs print)")
+
+
+if __name__ == "__main__":
+    main()
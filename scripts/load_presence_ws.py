@@ -0,0 +1,186 @@
+# scripts/load_presence_ws.py
+#
+# Load test for WS /api/presence/ws: how many presence subscribers one
+# worker core can carry. Starts a uvicorn worker serving the real presence
+# router in a subprocess and opens --connections sockets from this process,
+# each read continuously as a browser would. Then --churn extra users join
+# at once; the hub coalesces their "online" changes into one diff per tick,
+# fanned out to every open socket. Server CPU (utime+stime from /proc) is
+# sampled around each phase, so client-side cost is excluded.
+#
+# Token verification and the users lookup are stubbed in the server (the
+# token is taken as the uid): they run once per connection and are covered
+# by the token/user caches, while this measures connection and fan-out cost.
+#
+#   python scripts/load_presence_ws.py --connections 2000 --churn 50
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import subprocess
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.presence_hub import DIFF_INTERVAL
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+def serve(port: int):
+    import uvicorn
+    from fastapi import FastAPI
+
+    import routes.presence_routes_async as presence_routes
+    from db.models import User
+
+    async def authenticate(websocket):
+        message = await websocket.receive_json()
+        uid = str(message["token"])
+        user = User(uid=uid, in_game_name=f"player-{uid}", verified=False)
+        return user, {"uid": uid, "exp": time.time() + 86400}
+
+    presence_routes._authenticate = authenticate
+    presence_routes.presence_hub.record = None  # no database here
+
+    app = FastAPI()
+    app.include_router(presence_routes.router)
+
+    @app.on_event("startup")
+    async def start_hub():
+        presence_routes.presence_hub.start()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning",
+                ws="websockets", ws_ping_interval=None)
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLK_TCK
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class Client:
+    """One socket plus a reader task recording which uids it has seen go online."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.messages = 0
+        self.seen = set()
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        import json
+
+        async for raw in self.ws:
+            self.messages += 1
+            message = json.loads(raw)
+            users = message.get("users") or message.get("online") or []
+            self.seen.update(user["uid"] for user in users)
+
+    async def close(self):
+        await self.ws.close()
+        await asyncio.gather(self.reader, return_exceptions=True)
+
+
+async def open_socket(url: str, uid: str) -> Client:
+    import websockets
+
+    ws = await websockets.connect(url, max_queue=None, ping_interval=None)
+    await ws.send(f'{{"token": "{uid}"}}')
+    return Client(ws)
+
+
+async def wait_until(predicate, timeout: float = 60):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("subscribers did not receive the expected diffs")
+        await asyncio.sleep(0.05)
+
+
+async def run(args, pid: int):
+    url = f"ws://127.0.0.1:{args.port}/api/presence/ws"
+    baseline_rss = rss_mb(pid)
+
+    cpu0, t0 = cpu_seconds(pid), time.perf_counter()
+    clients = []
+    for start in range(0, args.connections, args.batch):
+        batch = range(start, min(start + args.batch, args.connections))
+        clients += await asyncio.gather(*(open_socket(url, f"u{i}") for i in batch))
+    everyone = {f"u{i}" for i in range(args.connections)}
+    await wait_until(lambda: all(everyone <= c.seen for c in clients))
+    connect_cpu, connect_wall = cpu_seconds(pid) - cpu0, time.perf_counter() - t0
+    rss = rss_mb(pid)
+
+    # Idle: nothing changes, only the heartbeat/sweep tick runs
+    cpu0 = cpu_seconds(pid)
+    await asyncio.sleep(args.idle)
+    idle_cpu = cpu_seconds(pid) - cpu0
+
+    messages0 = sum(c.messages for c in clients)
+    cpu0, t0 = cpu_seconds(pid), time.perf_counter()
+    joined = {f"churn{i}" for i in range(args.churn)}
+    extra = await asyncio.gather(*(open_socket(url, uid) for uid in joined))
+    await wait_until(lambda: all(joined <= c.seen for c in clients))
+    fanout_cpu, fanout_wall = cpu_seconds(pid) - cpu0, time.perf_counter() - t0
+    deliveries = sum(c.messages for c in clients) - messages0
+
+    for client in clients + extra:
+        await client.close()
+
+    # Churn cost includes the extra users' own connects; charge those at the
+    # connect-phase rate so the rest is fan-out
+    per_connect = connect_cpu / args.connections
+    per_delivery = max(fanout_cpu - per_connect * args.churn, 0) / max(deliveries, 1)
+    per_idle = idle_cpu / args.idle / args.connections
+    print(f"connections          {args.connections}")
+    print(f"connect              {connect_wall:.2f}s wall, {per_connect * 1e3:.3f} ms server CPU/conn")
+    print(f"server RSS           {rss:.1f} MB ({(rss - baseline_rss) * 1024 / args.connections:.1f} KB/conn)")
+    print(f"idle                 {per_idle * 1e6:.2f} µs server CPU/conn/s")
+    print(f"fan-out              {args.churn} joins -> {deliveries} diff messages in {fanout_wall:.2f}s, "
+          f"{per_delivery * 1e6:.1f} µs server CPU/delivery")
+    # Diffs are coalesced to at most one message per subscriber per tick, so
+    # the worst case is presence changing every tick
+    worst = per_idle + per_delivery / DIFF_INTERVAL
+    idle = f"~{1 / per_idle:,.0f}" if per_idle else "unmeasured (raise --idle)"  # /proc ticks are 10 ms
+    print(f"connections/core     {idle} idle, ~{1 / worst:,.0f} with a diff every tick")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presence WebSocket load test")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--churn", type=int, default=20, help="users joining during the fan-out phase")
+    parser.add_argument("--idle", type=float, default=5, help="seconds to measure idle cost")
+    parser.add_argument("--batch", type=int, default=100, help="sockets opened concurrently")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--port", str(args.port)],
+        cwd=str(Path(__file__).resolve().parents[1]),
+    )
+    try:
+        time.sleep(3)  # import + bind
+        asyncio.run(run(args, server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
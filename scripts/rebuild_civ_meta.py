@@ -0,0 +1,42 @@
+# scripts/rebuild_civ_meta.py
+#
+# Recompute civ_meta_rollup from game_players + game_stats with the same
+# (map, civ, version, month) keys ingest uses (db/models/civ_meta.py).
+# One transaction under an EXCLUSIVE lock, like rebuild_player_stats.py.
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+
+from db.db import engine
+
+ROLLUP_SQL = """
+INSERT INTO civ_meta_rollup (map, civilization, version, month, picks, wins)
+SELECT
+    left(COALESCE(g.map ->> 'name', 'Unknown'), 100),
+    left(COALESCE(p.civilization, 'Unknown'), 50),
+    left(COALESCE(g.game_version, 'Unknown'), 50),
+    date_trunc('month', COALESCE(g.played_on, g."timestamp"))::date,
+    count(*),
+    count(*) FILTER (WHERE p.winner)
+FROM game_players p
+JOIN game_stats g ON g.id = p.game_id
+GROUP BY 1, 2, 3, 4
+"""
+
+
+async def rebuild():
+    async with engine.begin() as conn:
+        await conn.execute(text("LOCK TABLE civ_meta_rollup IN EXCLUSIVE MODE"))
+        await conn.execute(text("DELETE FROM civ_meta_rollup"))
+        result = await conn.execute(text(ROLLUP_SQL))
+        print(f"🎯 Rebuilt civ_meta_rollup: {result.rowcount} rows")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,74 @@
+# scripts/rebuild_head_to_head.py
+#
+# Recompute head_to_head from game_players + game_stats by replaying every
+# final through db.ingest.head_to_head_rows, the function ingest itself
+# uses. Both therefore count the same pairs: names on both sides or
+# repeated on one side, NULL winners and blank names are handled by one
+# piece of code. One transaction under an EXCLUSIVE lock, like
+# rebuild_player_stats.py.
+
+import sys
+import asyncio
+from itertools import groupby
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select, delete, insert, text
+
+from db.db import async_session, engine
+from db.ingest import head_to_head_rows
+from db.models import GameStats, GamePlayer, HeadToHead
+
+INSERT_BATCH = 1000
+
+
+def merge_rows(totals: dict, rows) -> None:
+    """Fold head_to_head increments into `totals` the way the ingest upsert does."""
+    for row in rows:
+        key = (row["player"], row["opponent"])
+        total = totals.get(key)
+        if total is None:
+            totals[key] = dict(row)
+            continue
+        for field in ("games", "wins", "losses", "duration_total", "duration_games"):
+            total[field] += row[field]
+        # greatest() ignores NULLs
+        played = [d for d in (total["last_played_on"], row["last_played_on"]) if d is not None]
+        total["last_played_on"] = max(played) if played else None
+        total["updated_at"] = row["updated_at"]
+
+
+def replay_history(rows) -> dict:
+    """rows: (game_id, duration, played_on, name, winner) ordered by game_id, slot."""
+    totals = {}
+    for (game_id, duration, played_on), players in groupby(rows, key=lambda r: r[:3]):
+        game = SimpleNamespace(id=game_id, duration=duration, played_on=played_on)
+        players = [SimpleNamespace(name=r[3], winner=r[4]) for r in players]
+        merge_rows(totals, head_to_head_rows(game, players))
+    return totals
+
+
+async def rebuild():
+    async with async_session() as session:
+        await session.execute(text("LOCK TABLE head_to_head IN EXCLUSIVE MODE"))
+        result = await session.execute(
+            select(GamePlayer.game_id, GameStats.duration, GameStats.played_on,
+                   GamePlayer.name, GamePlayer.winner)
+            .join(GameStats, GameStats.id == GamePlayer.game_id)
+            .where(GameStats.is_final.is_(True))
+            .order_by(GamePlayer.game_id, GamePlayer.slot)
+        )
+        totals = list(replay_history(result.all()).values())
+
+        await session.execute(delete(HeadToHead))
+        for i in range(0, len(totals), INSERT_BATCH):
+            await session.execute(insert(HeadToHead), totals[i:i + INSERT_BATCH])
+        await session.commit()
+    print(f"🎯 Rebuilt head_to_head: {len(totals)} player/opponent rows")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,70 @@
+# scripts/rebuild_player_stats.py
+#
+# Recompute player_stats from scratch out of game_players + game_stats.
+# Runs in one transaction holding an EXCLUSIVE lock on player_stats, so
+# ingests wait for it instead of bumping rows that are being replaced.
+# Readers are not blocked. Backfill game_players first
+# (scripts/backfill_game_players.py) if it predates older finals.
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+
+from db.db import engine
+from db.models.player_stats import RECENT_FORM_LENGTH
+
+# recent_form follows ingest (game id) order, like the incremental path
+TOTALS_SQL = """
+INSERT INTO player_stats (name, games, wins, duration_total, duration_games,
+                          civ_games, civ_wins, recent_form, last_played_on, updated_at)
+SELECT
+    p.name,
+    count(*),
+    count(*) FILTER (WHERE p.winner),
+    COALESCE(sum(g.duration), 0),
+    count(g.duration),
+    '{}'::jsonb,
+    '{}'::jsonb,
+    left(string_agg(CASE WHEN p.winner THEN 'W' ELSE 'L' END, '' ORDER BY p.game_id DESC), :form_length),
+    max(p.played_on),
+    now() AT TIME ZONE 'utc'
+FROM game_players p
+JOIN game_stats g ON g.id = p.game_id
+GROUP BY p.name
+"""
+
+CIVS_SQL = """
+UPDATE player_stats s
+SET civ_games = c.civ_games, civ_wins = c.civ_wins
+FROM (
+    SELECT name,
+           jsonb_object_agg(civ, games) AS civ_games,
+           jsonb_object_agg(civ, wins) AS civ_wins
+    FROM (
+        SELECT name, COALESCE(civilization, 'Unknown') AS civ,
+               count(*) AS games, count(*) FILTER (WHERE winner) AS wins
+        FROM game_players
+        GROUP BY 1, 2
+    ) per_civ
+    GROUP BY name
+) c
+WHERE s.name = c.name
+"""
+
+
+async def rebuild():
+    async with engine.begin() as conn:
+        await conn.execute(text("LOCK TABLE player_stats IN EXCLUSIVE MODE"))
+        await conn.execute(text("DELETE FROM player_stats"))
+        result = await conn.execute(text(TOTALS_SQL), {"form_length": RECENT_FORM_LENGTH})
+        await conn.execute(text(CIVS_SQL))
+        print(f"🎯 Rebuilt player_stats for {result.rowcount} players")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,81 @@
+# scripts/rebuild_ratings.py
+#
+# Replay every final in ingest (game id) order through the rating engine
+# and replace player_ratings, rating_events and rating_tree wholesale.
+# Deterministic: the same history always yields the same ratings, and it
+# matches what incremental ingest produced for the same order. Holds the
+# rating advisory lock, so live ingests queue behind the swap.
+
+import sys
+import asyncio
+from collections import Counter
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select, delete, insert
+
+from db.db import async_session, engine
+from db.models import GameStats, GamePlayer, PlayerRating, RatingEvent, RatingTreeNode
+from db.ratings import lock_ratings
+from utils.rating import INITIAL_RATING, elo_deltas, split_sides, rating_bucket, fenwick_node_deltas
+
+INSERT_BATCH = 1000
+
+
+def replay_history(rows):
+    """rows: (game_id, replay_hash, name, winner) ordered by game_id, slot."""
+    ratings, games, events = {}, Counter(), []
+    for (game_id, replay_hash), players in groupby(rows, key=lambda r: (r[0], r[1])):
+        winners, losers = split_sides({"name": r[2], "winner": r[3]} for r in players)
+        deltas = elo_deltas(
+            {n: ratings.get(n, INITIAL_RATING) for n in winners},
+            {n: ratings.get(n, INITIAL_RATING) for n in losers},
+        )
+        if not deltas:
+            continue
+        for name, delta in deltas.items():
+            ratings[name] = ratings.get(name, INITIAL_RATING) + delta
+            games[name] += 1
+        events.append({"replay_hash": replay_hash, "game_id": game_id, "deltas": deltas})
+    return ratings, games, events
+
+
+async def insert_batched(session, model, rows):
+    for i in range(0, len(rows), INSERT_BATCH):
+        await session.execute(insert(model), rows[i:i + INSERT_BATCH])
+
+
+async def rebuild():
+    async with async_session() as session:
+        await lock_ratings(session)
+        result = await session.execute(
+            select(GamePlayer.game_id, GameStats.replay_hash, GamePlayer.name, GamePlayer.winner)
+            .join(GameStats, GameStats.id == GamePlayer.game_id)
+            .where(GameStats.is_final.is_(True))
+            .order_by(GamePlayer.game_id, GamePlayer.slot)
+        )
+        ratings, games, events = replay_history(result.all())
+
+        now = datetime.utcnow()
+        buckets = Counter(rating_bucket(r) for r in ratings.values())
+        for model in (RatingTreeNode, RatingEvent, PlayerRating):
+            await session.execute(delete(model))
+        await insert_batched(session, PlayerRating, [
+            {"name": name, "rating": rating, "games": games[name], "updated_at": now}
+            for name, rating in ratings.items()
+        ])
+        await insert_batched(session, RatingEvent, [{**e, "applied_at": now} for e in events])
+        await insert_batched(session, RatingTreeNode, [
+            {"node": node, "count": count}
+            for node, count in sorted(fenwick_node_deltas(buckets).items())
+        ])
+        await session.commit()
+    print(f"🎯 Rebuilt ratings: {len(ratings)} players from {len(events)} rated games")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
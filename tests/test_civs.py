@@ -0,0 +1,37 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.dialects import postgresql
+
+from db.queries import GameFilters
+from utils.civs import civ_name, civ_values
+
+
+class TestCivs(unittest.TestCase):
+
+    def test_civ_name(self):
+        self.assertEqual(civ_name(2), "Franks")
+        self.assertEqual(civ_name("2"), "Franks")
+        self.assertEqual(civ_name("Franks"), "Franks")
+        self.assertEqual(civ_name(999), "999")
+        self.assertEqual(civ_name(None), "Unknown")
+        self.assertEqual(len(civ_name("x" * 80)), 50)
+
+    def test_civ_values_match_ids_and_names(self):
+        self.assertEqual(civ_values("Franks"), [2, "Franks"])
+        self.assertEqual(civ_values("2"), [2, "Franks"])
+        self.assertEqual(civ_values("Indians"), [20, "Hindustanis", "Indians"])
+        self.assertEqual(civ_values("Custom"), ["Custom"])
+
+    def test_civ_filter_compares_ids(self):
+        (clause,) = GameFilters(player="Emaren", civ="Franks").clauses()
+        sql = str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        self.assertIn('[{"name": "Emaren", "civilization": 2}]', sql)
+        self.assertIn('[{"name": "Emaren", "civilization": "Franks"}]', sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.content_encoding import (
+    StreamingBodyDecoder,
+    PayloadTooLarge,
+    UnsupportedEncoding,
+    available_encodings,
+    choose_encoding,
+    compress,
+    parse_accept_encoding,
+    zstandard,
+)
+
+
+class TestContentEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = json.dumps({"players": [{"name": f"p{i}", "score": i} for i in range(2000)]}).encode()
+
+    def decode(self, encoding, body, limit=10 * 1024 * 1024, chunk=512):
+        decoder = StreamingBodyDecoder(encoding, limit)
+        for i in range(0, len(body), chunk):
+            decoder.feed(body[i:i + chunk])
+        return decoder.finish()
+
+    def test_round_trip(self):
+        for encoding in available_encodings():
+            body = compress(self.raw, encoding)
+            self.assertLess(len(body), len(self.raw))
+            self.assertEqual(self.decode(encoding, body), self.raw)
+
+    def test_limit(self):
+        for encoding in available_encodings():
+            with self.assertRaises(PayloadTooLarge):
+                self.decode(encoding, compress(self.raw, encoding), limit=4096)
+
+    def test_identity_limit(self):
+        with self.assertRaises(PayloadTooLarge):
+            self.decode("identity", self.raw, limit=100)
+
+    def test_truncated_gzip(self):
+        body = compress(self.raw, "gzip")
+        with self.assertRaises(ValueError):
+            self.decode("gzip", body[:len(body) // 2])
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_truncated_zstd(self):
+        body = zstandard.ZstdCompressor(level=3, write_checksum=True).compress(self.raw)
+        for cut in (len(body) // 2, len(body) - 1):
+            with self.assertRaises(ValueError):
+                self.decode("zstd", body[:cut])
+        self.assertEqual(self.decode("zstd", body, chunk=1), self.raw)
+        self.assertEqual(self.decode("zstd", body + compress(b"{}", "zstd")), self.raw + b"{}")
+
+    def test_unsupported(self):
+        with self.assertRaises(UnsupportedEncoding):
+            StreamingBodyDecoder("br")
+
+    def test_negotiation(self):
+        self.assertEqual(parse_accept_encoding("zstd, gzip;q=0.5, br;q=0"), ["zstd", "gzip"])
+        self.assertEqual(choose_encoding(["gzip"]), "gzip")
+        self.assertEqual(choose_encoding([]), "identity")
+
+
+class FakeResponse:
+    def __init__(self, status_code, accept=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {"Accept-Encoding": accept} if accept else {}
+
+
+class TestUploadNegotiation(unittest.TestCase):
+
+    URL = "http://api.test/api/parse_replay"
+
+    def setUp(self):
+        import parse_replay
+        self.client = parse_replay
+        self.sent = []
+        self.responses = []
+        self.original = parse_replay._post_encoded
+        parse_replay._post_encoded = self.fake_post
+        parse_replay.NEGOTIATED_ENCODING.clear()
+        self.payload = {"players": ["x" * 2000]}
+
+    def tearDown(self):
+        self.client._post_encoded = self.original
+
+    def fake_post(self, url, raw, encoding, headers):
+        self.sent.append(encoding)
+        return self.responses.pop(0)
+
+    def test_validation_error_is_not_resent(self):
+        self.responses = [FakeResponse(422, accept="zstd, gzip")]
+        response = self.client.post_json(self.URL, self.payload, {})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(len(self.sent), 1)
+
+    def test_415_retries_with_advertised_coding(self):
+        self.responses = [FakeResponse(415, accept="gzip"), FakeResponse(200, accept="gzip")]
+        self.client.post_json(self.URL, self.payload, {})
+        self.assertEqual(self.sent[1], "gzip")
+
+    def test_old_server_gets_identity(self):
+        self.responses = [FakeResponse(400), FakeResponse(200)]
+        self.client.post_json(self.URL, self.payload, {})
+        self.assertEqual(self.sent[1], "identity")
+        self.assertEqual(self.client.NEGOTIATED_ENCODING[self.URL], "identity")
+
+
+class TestDecodedBodyRoute(unittest.TestCase):
+
+    def test_errors_advertise_codings(self):
+        from fastapi import APIRouter, FastAPI
+        from fastapi.testclient import TestClient
+        from pydantic import BaseModel
+        from routes.replay_routes_async import DecodedBodyRoute
+
+        class Body(BaseModel):
+            n: int
+
+        router = APIRouter(route_class=DecodedBodyRoute)
+
+        @router.post("/echo")
+        async def echo(body: Body):
+            return body
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+        for body, headers, status in (
+            (b'{"n": "x"}', {}, 422),
+            (b"junk", {"Content-Encoding": "br"}, 415),
+            (b'{"n": 1}', {}, 200),
+        ):
+            response = client.post("/echo", content=body, headers={"Content-Type": "application/json", **headers})
+            self.assertEqual(response.status_code, status)
+            self.assertIn("gzip", response.headers["Accept-Encoding"])
+
+
+if __name__ == "__main__":
+    unittest.main()
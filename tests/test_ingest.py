@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.dialects import postgresql
+
+from db.ingest import player_stats_upsert, civ_meta_upsert, head_to_head_rows
+from db.models.game_player import game_player_rows
+from scripts.rebuild_head_to_head import merge_rows, replay_history
+
+
+def final(game_id, civ, winner):
+    return SimpleNamespace(
+        id=game_id, duration=900, played_on=None, timestamp=None,
+        map={"name": "Arabia"}, game_version="VER 9.4",
+        players=[{"name": "Emaren", "civilization": civ, "winner": winner, "score": 1000}],
+    )
+
+
+def compiled(stmt):
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+class TestIngestCivKeys(unittest.TestCase):
+
+    def test_same_civ_bumps_one_text_key(self):
+        # The parser's ID and the legacy name must bump the same counters
+        statements = []
+        for game in (final(1, 2, True), final(2, "Franks", False)):
+            (player,) = game_player_rows(game, {})
+            statements.append(compiled(player_stats_upsert(game, player)))
+
+        for stmt in statements:
+            sql, params = str(stmt), stmt.params
+            self.assertEqual(params["civ_games"], {"Franks": 1})
+            self.assertRegex(sql, r"civ_games ->> %\(param_\d+\)s::VARCHAR")
+            keys = {v for k, v in params.items() if k.startswith("param_")}
+            self.assertEqual(keys, {"Franks"})
+        self.assertEqual(statements[0].params["civ_wins"], {"Franks": 1})
+        self.assertEqual(statements[1].params["civ_wins"], {"Franks": 0})
+
+    def test_civ_meta_takes_parser_civ_ids(self):
+        game = final(1, 2, True)
+        stmt = compiled(civ_meta_upsert(game, game_player_rows(game, {})))
+        self.assertEqual(stmt.params["civilization_m0"], "Franks")
+        # Parser-shaped players straight from the payload, not GamePlayer rows
+        players = [SimpleNamespace(civilization=civ, winner=False) for civ in (2, 999)]
+        stmt = compiled(civ_meta_upsert(game, players))
+        self.assertEqual({stmt.params["civilization_m0"], stmt.params["civilization_m1"]}, {"Franks", "999"})
+
+
+class TestHeadToHeadRebuild(unittest.TestCase):
+
+    def games(self):
+        def game(game_id, players, duration=600, played_on=None):
+            return SimpleNamespace(id=game_id, duration=duration, played_on=played_on, players=[
+                {"name": name, "winner": winner} for name, winner in players
+            ])
+        return [
+            game(1, [("A", True), ("B", False)], played_on=datetime(2026, 1, 1)),
+            game(2, [("A", True), ("A", True), ("B", None)]),          # repeated name, NULL winner
+            game(3, [("A", True), ("B", False), ("B", True), ("C", False)], duration=None),  # B on both sides
+            game(4, [("", True), ("C", False), ("A", False)]),        # blank name, stored as "Unknown"
+            game(5, [("C", True), ("A", False)], played_on=datetime(2025, 1, 1)),
+        ]
+
+    def test_rebuild_matches_incremental_ingest(self):
+        incremental, stored = {}, []
+        for game in self.games():
+            players = game_player_rows(game, {})
+            merge_rows(incremental, head_to_head_rows(game, players))
+            stored += [(game.id, game.duration, game.played_on, p.name, p.winner) for p in players]
+
+        rebuilt = replay_history(stored)
+        strip = lambda rows: {k: {f: v for f, v in r.items() if f != "updated_at"} for k, r in rows.items()}
+        self.assertEqual(strip(rebuilt), strip(incremental))
+
+        a_b = rebuilt[("A", "B")]
+        self.assertEqual((a_b["games"], a_b["wins"], a_b["losses"]), (2, 2, 0))
+        self.assertEqual(a_b["last_played_on"], datetime(2026, 1, 1))
+        a_c = rebuilt[("A", "C")]
+        self.assertEqual((a_c["games"], a_c["wins"], a_c["duration_games"]), (2, 1, 1))
+        self.assertNotIn(("B", "C"), rebuilt)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.online_index import OnlineIndex, epoch
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestOnlineIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.index = OnlineIndex(window=120, clock=self.clock)
+
+    def profile(self, uid):
+        return {"uid": uid, "in_game_name": uid.upper(), "verified": False}
+
+    def test_users_expire_after_window(self):
+        self.index.touch("a", self.clock.now, self.profile("a"))
+        self.index.touch("b", self.clock.now + 60, self.profile("b"))
+        self.assertEqual(self.index.count(), 2)
+        self.clock.now += 120
+        self.assertEqual(self.index.online(), [self.profile("b")])
+        self.clock.now += 60
+        self.assertEqual(self.index.count(), 0)
+
+    def test_repeat_pings_extend_and_stay_compact(self):
+        for i in range(5000):
+            self.index.touch("a", self.clock.now + i)
+        self.assertLess(len(self.index._heap), 1100)
+        self.clock.now += 5000
+        self.assertEqual(self.index.count(), 1)
+        self.index.touch("a", self.clock.now - 1000)  # older than known; ignored
+        self.clock.now += 118
+        self.assertEqual(self.index.count(), 1)
+
+    def test_discard(self):
+        self.index.touch("a", self.clock.now, self.profile("a"))
+        self.index.discard("a")
+        self.assertEqual(self.index.online(), [])
+        self.assertEqual(self.index.count(), 0)
+
+    def test_heartbeat_echo_after_leaving_is_ignored(self):
+        seen = self.clock.now
+        self.index.touch("a", seen, self.profile("a"))
+        self.clock.now += 10
+        self.index.expire_soon("a", 15)
+        self.index.touch("a", seen)  # earlier heartbeat echoed by a presence flush
+        self.clock.now += 16
+        self.assertEqual(self.index.count(), 0)
+        self.index.touch("a", seen)  # echo arriving after expiry
+        self.assertEqual(self.index.count(), 0)
+        self.index.touch("a", self.clock.now)  # genuinely back
+        self.assertEqual(self.index.count(), 1)
+        self.assertEqual(self.index._left, {})
+
+    def test_leave_marks_are_dropped_after_window(self):
+        self.index.touch("a", self.clock.now)
+        self.index.expire_soon("a", 15)
+        self.clock.now += 121
+        self.assertEqual(self.index.count(), 0)
+        self.assertEqual(self.index._left, {})
+
+    def test_epoch_treats_naive_as_utc(self):
+        self.assertEqual(epoch(datetime(1970, 1, 1, 0, 1)), 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
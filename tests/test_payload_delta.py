@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import parse_replay
+from utils.payload_delta import make_delta, apply_delta
+
+
+class TestPayloadDelta(unittest.TestCase):
+
+    def setUp(self):
+        self.base = {
+            "replay_file": "MP Replay.aoe2record",
+            "replay_hash": "aaa",
+            "parse_iteration": 3,
+            "map": {"name": "Arabia", "size": "Medium"},
+            "duration": 600,
+            "players": [{"name": "A", "score": 100}, {"name": "B", "score": 90}],
+            "key_events": ["castle"],
+            "played_on": None,
+        }
+
+    def test_only_changes_are_sent(self):
+        new = dict(self.base, replay_hash="bbb", parse_iteration=4, duration=660,
+                   key_events=["castle", "imperial"])
+        delta = make_delta(self.base, new)
+        self.assertEqual(delta["set"], {"replay_hash": "bbb", "parse_iteration": 4, "duration": 660})
+        self.assertEqual(delta["append"], {"key_events": ["imperial"]})
+        self.assertNotIn("unset", delta)
+        self.assertEqual(apply_delta(self.base, delta), new)
+
+    def test_replaced_and_removed_fields(self):
+        new = dict(self.base, players=[{"name": "A", "score": 120}, {"name": "B", "score": 95}])
+        del new["key_events"]
+        delta = make_delta(self.base, new)
+        self.assertEqual(delta["unset"], ["key_events"])
+        self.assertEqual(apply_delta(self.base, delta), new)
+
+    def test_identical_documents(self):
+        self.assertEqual(make_delta(self.base, dict(self.base)), {})
+
+    def test_append_to_missing_field(self):
+        with self.assertRaises(ValueError):
+            apply_delta({}, {"append": {"key_events": ["x"]}})
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+class TestSendPayload(unittest.TestCase):
+
+    URL = "http://api.test/api/parse_replay"
+
+    def setUp(self):
+        self.posts = []
+        self.statuses = []
+        self.original = parse_replay.post_json
+        parse_replay.post_json = self.fake_post
+        parse_replay.LAST_ACKED.clear()
+        parse_replay.DELTA_UNSUPPORTED.clear()
+
+    def tearDown(self):
+        parse_replay.post_json = self.original
+
+    def fake_post(self, url, payload, headers):
+        self.posts.append(url)
+        return FakeResponse(self.statuses.pop(0) if self.statuses else 200)
+
+    def iteration(self, n):
+        return {"replay_file": "r.aoe2record", "replay_hash": f"h{n}", "parse_iteration": n, "duration": n}
+
+    def test_unappliable_delta_resends_full_document(self):
+        parse_replay.send_payload(self.URL, "", self.iteration(1), {}, is_final=False)
+        self.statuses = [422]
+        response = parse_replay.send_payload(self.URL, "", self.iteration(2), {}, is_final=False)
+        self.assertTrue(response.ok)
+        self.assertEqual(self.posts, [self.URL, self.URL + "/delta", self.URL])
+        # The full resend is the new base, so deltas resume
+        parse_replay.send_payload(self.URL, "", self.iteration(3), {}, is_final=False)
+        self.assertEqual(self.posts[-1], self.URL + "/delta")
+
+    def test_acked_bases_are_capped_lru(self):
+        max_size = parse_replay.LAST_ACKED_MAX
+        replay = lambda i: dict(self.iteration(1), replay_file=f"r{i}.aoe2record")
+        for i in range(max_size + 5):
+            parse_replay.send_payload(self.URL, "", replay(i), {}, is_final=False)
+            if i == max_size - 1:
+                # Touching the oldest replay keeps it over newer ones
+                parse_replay.send_payload(self.URL, "", replay(0), {}, is_final=False)
+        self.assertEqual(len(parse_replay.LAST_ACKED), max_size)
+        files = [f for _, f in parse_replay.LAST_ACKED]
+        self.assertIn("r0.aoe2record", files)
+        self.assertNotIn("r1.aoe2record", files)
+        self.assertEqual(files[-1], f"r{max_size + 4}.aoe2record")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db.presence import PresenceBuffer, presence, _on_presence
+from utils.online_index import online_index
+
+
+class FakeResult:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class FakeSession:
+    def __init__(self, statements, fail=False):
+        self.statements = statements
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        params = stmt.compile().params
+        self.statements.append(params)
+        return FakeResult(sum(1 for value in params.values() if isinstance(value, str)))
+
+    async def commit(self):
+        pass
+
+
+class TestPresenceBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = PresenceBuffer()
+        self.statements = []
+        self.t0 = datetime(2026, 1, 1, 12, 0, 0)
+
+    def flush(self, fail=False):
+        return asyncio.run(self.buffer.flush(lambda: FakeSession(self.statements, fail)))
+
+    def test_pings_coalesce_per_uid(self):
+        for i in range(10):
+            self.buffer.record("u1", self.t0 + timedelta(seconds=i))
+        self.buffer.record("u2", self.t0)
+        self.buffer.record("u1", self.t0)  # out of order; must not win
+        self.assertEqual(self.flush(), 2)
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn(self.t0 + timedelta(seconds=9), self.statements[0].values())
+        self.assertEqual(self.flush(), 0)  # nothing changed since
+        self.assertEqual(self.buffer.stats()["recorded"], 12)
+
+    def test_failed_flush_keeps_pending(self):
+        self.buffer.record("u1", self.t0)
+        with self.assertRaises(ConnectionError):
+            self.flush(fail=True)
+        self.buffer.record("u1", self.t0 - timedelta(seconds=5))
+        self.assertEqual(self.buffer.stats()["pending"], 1)
+        self.assertEqual(self.flush(), 1)
+        self.assertIn(self.t0, self.statements[0].values())
+
+
+    def test_removal_payload_drops_user_everywhere(self):
+        _on_presence('[["gone", 1e12, "Gone", false]]')
+        presence.record("gone")
+        self.assertIn("gone", [u["uid"] for u in online_index.online()])
+        _on_presence('[["gone", null, null, null]]')
+        self.assertNotIn("gone", [u["uid"] for u in online_index.online()])
+        self.assertEqual(presence.stats()["pending"], 0)
+
+    def test_leave_payload_shortens_expiry_on_other_workers(self):
+        seen = online_index.clock()
+        _on_presence(f'[["left", {seen}, "Left", false]]')
+        _on_presence(f'[["left", {seen + 1}, null, null, 15]]')
+        _on_presence(f'[["left", {seen}, "Left", false]]')  # the heartbeat again
+        self.assertLessEqual(online_index._expires["left"], seen + 16)
+        online_index.discard("left")
+
+
+if __name__ == "__main__":
+    unittest.main()
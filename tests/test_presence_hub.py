@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.online_index import OnlineIndex
+from utils.presence_hub import PresenceHub, SEND_QUEUE_SIZE
+
+
+def profile(uid):
+    return {"uid": uid, "in_game_name": uid.upper(), "verified": False}
+
+
+def drain(subscriber):
+    messages = []
+    while not subscriber.queue.empty():
+        message = subscriber.queue.get_nowait()
+        messages.append(None if message is None else json.loads(message))
+    return messages
+
+
+class TestPresenceHub(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.recorded, self.left = [], []
+        self.hub = PresenceHub(
+            OnlineIndex(window=120),
+            record=self.recorded.append,
+            leave=lambda uid, grace: self.left.append(uid),
+        )
+
+    async def test_snapshot_then_coalesced_diffs(self):
+        a = self.hub.attach("a", profile("a"))
+        self.assertEqual(drain(a), [{"type": "snapshot", "users": [profile("a")]}])
+
+        b = self.hub.attach("b", profile("b"))
+        c = self.hub.attach("c", profile("c"))
+        self.hub.index.discard("c")
+        self.hub.flush_changes()
+        self.assertEqual(drain(a), [{"type": "diff", "online": [profile("b")], "offline": ["c"]}])
+        self.assertEqual(drain(b)[0]["type"], "snapshot")
+        self.assertEqual(self.recorded, ["a", "b", "c"])
+
+        self.hub.flush_changes()  # nothing pending
+        self.assertEqual(drain(a), [])
+
+    async def test_slow_subscriber_is_evicted(self):
+        slow = self.hub.attach("slow", profile("slow"))
+        for i in range(SEND_QUEUE_SIZE):
+            self.hub.index.touch(f"u{i}", profile=profile(f"u{i}"))
+            self.hub.flush_changes()
+        self.assertEqual(self.hub.stats()["evictions"], 1)
+        self.assertEqual(drain(slow), [None])
+        self.assertEqual(slow.close_code, 1013)
+        self.assertEqual(self.hub.stats()["subscribers"], 0)
+
+    async def test_last_socket_close_shortens_expiry(self):
+        first = self.hub.attach("a", profile("a"))
+        second = self.hub.attach("a", profile("a"))
+        self.hub.detach(first)
+        self.assertGreater(self.hub.index._expires["a"] - self.hub.index.clock(), 119)
+        self.assertEqual(self.left, [])
+        self.hub.detach(second)
+        self.assertLess(self.hub.index._expires["a"] - self.hub.index.clock(), 20)
+        self.assertEqual(self.left, ["a"])
+        await self.hub.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
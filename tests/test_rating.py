@@ -0,0 +1,71 @@
+import os
+import sys
+import random
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.rating import (
+    INITIAL_RATING,
+    K_FACTOR,
+    elo_deltas,
+    split_sides,
+    rating_bucket,
+    fenwick_node_deltas,
+    rank_from_nodes,
+)
+
+
+class TestRating(unittest.TestCase):
+
+    def test_even_1v1(self):
+        deltas = elo_deltas({"A": INITIAL_RATING}, {"B": INITIAL_RATING})
+        self.assertAlmostEqual(deltas["A"], K_FACTOR / 2)
+        self.assertAlmostEqual(deltas["B"], -K_FACTOR / 2)
+
+    def test_upset_moves_more(self):
+        upset = elo_deltas({"A": 1400}, {"B": 1600})["A"]
+        expected = elo_deltas({"A": 1600}, {"B": 1400})["A"]
+        self.assertGreater(upset, expected)
+
+    def test_team_game_is_zero_sum_per_side(self):
+        deltas = elo_deltas({"A": 1500, "B": 1600}, {"C": 1550, "D": 1550})
+        self.assertAlmostEqual(deltas["A"], deltas["B"])
+        self.assertAlmostEqual(deltas["A"], -deltas["C"])
+
+    def test_split_sides(self):
+        players = [
+            {"name": "A", "winner": True},
+            {"name": "B", "winner": False},
+            {"name": "C", "winner": False},
+            {"name": "", "winner": True},
+        ]
+        self.assertEqual(split_sides(players), (["A"], ["B", "C"]))
+        self.assertEqual(split_sides(p for p in players), (["A"], ["B", "C"]))
+        self.assertEqual(split_sides([{"name": "A", "winner": False}]), ([], ["A"]))
+
+    def test_fenwick_rank_matches_sort(self):
+        rng = random.Random(7)
+        ratings = [rng.gauss(1500, 200) for _ in range(500)]
+        counts = fenwick_node_deltas({})
+        for r in ratings:
+            for node, delta in fenwick_node_deltas({rating_bucket(r): 1}).items():
+                counts[node] = counts.get(node, 0) + delta
+        buckets = [rating_bucket(r) for r in ratings]
+        for b in rng.sample(buckets, 50):
+            expected = 1 + sum(1 for other in buckets if other > b)
+            self.assertEqual(rank_from_nodes(counts, b), expected)
+
+    def test_fenwick_moves(self):
+        counts = fenwick_node_deltas({1500: 2, 1600: 1})
+        self.assertEqual(rank_from_nodes(counts, 1500), 2)
+        # one player at 1500 climbs past 1600
+        for node, delta in fenwick_node_deltas({1500: -1, 1700: 1}).items():
+            counts[node] = counts.get(node, 0) + delta
+        self.assertEqual(rank_from_nodes(counts, 1700), 1)
+        self.assertEqual(rank_from_nodes(counts, 1600), 2)
+        self.assertEqual(rank_from_nodes(counts, 1500), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import asyncio
+import logging
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.request_logging import RequestLogMiddleware, parse_sampling, redact_query
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def endpoint(status):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+def request(app, path="/api/user/ping", query=b""):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "query_string": query,
+        "headers": [(b"authorization", b"Bearer secret-token")],
+        "client": ("10.0.0.1", 1234),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    asyncio.run(app(scope, receive, send))
+
+
+class TestRequestLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = CaptureHandler()
+        self.logger = logging.getLogger("api.requests")
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(logging.NOTSET)
+
+    def test_parse_sampling(self):
+        self.assertEqual(
+            parse_sampling("/api/user/ping=0.5, /api/x=2,bad,/api/y=nope"),
+            {"/api/user/ping": 0.5, "/api/x": 1.0},
+        )
+
+    def test_redact_query(self):
+        self.assertEqual(redact_query(""), "")
+        self.assertEqual(
+            redact_query("API_KEY=k&q=a b&password=&page=2"),
+            "API_KEY=%2A%2A%2A&q=a+b&password=%2A%2A%2A&page=2",
+        )
+
+    def test_redacts_secrets(self):
+        request(RequestLogMiddleware(endpoint(200), sampling={"/": 1.0}),
+                path="/api/game_stats", query=b"token=abc&limit=5")
+        fields = self.handler.records[0].fields
+        self.assertEqual(fields["auth"], "Bearer")
+        self.assertEqual(fields["query"], "token=%2A%2A%2A&limit=5")
+        self.assertNotIn("secret-token", repr(fields))
+
+    def test_sampled_route_still_logs_errors(self):
+        request(RequestLogMiddleware(endpoint(200), sampling={"/api/user/ping": 0.0}))
+        self.assertEqual(self.handler.records, [])
+        request(RequestLogMiddleware(endpoint(503), sampling={"/api/user/ping": 0.0}))
+        self.assertEqual(self.handler.records[0].fields["status"], 503)
+        self.assertEqual(self.handler.records[0].levelno, logging.WARNING)
+
+    def test_warning_level_keeps_errors_only(self):
+        self.logger.setLevel(logging.WARNING)
+        app = RequestLogMiddleware(endpoint(200), sampling={"/": 1.0})
+        request(app)
+        self.assertEqual(self.handler.records, [])
+        request(RequestLogMiddleware(endpoint(500), sampling={"/": 1.0}))
+        self.assertEqual([r.fields["status"] for r in self.handler.records], [500])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import subprocess
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# pm2 restarts workers with restart_delay: 500; importing the app and running
+# its startup hooks must stay well inside a couple of seconds even on a cold
+# interpreter. Override with STARTUP_BUDGET_SECONDS on slow CI machines.
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
+
+# Runs in a fresh interpreter so nothing is already imported. Startup must
+# not wait on the database or Firebase, so no services are needed.
+SCRIPT = """
+import asyncio, sys, time
+t0 = time.perf_counter()
+import app
+imported = time.perf_counter() - t0
+eager = [m for m in ("firebase_admin", "google.auth", "requests") if m in sys.modules]
+
+async def main():
+    await app.startup_event()
+    await app.shutdown_event()
+
+asyncio.run(main())
+print(imported, time.perf_counter() - t0, ",".join(eager) or "-")
+"""
+
+
+class TestStartupTime(unittest.TestCase):
+
+    def test_import_and_startup_within_budget(self):
+        env = dict(os.environ, DATABASE_URL="postgresql+asyncpg://u:p@127.0.0.1:1/none")
+        result = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        imported, total, eager = result.stdout.strip().splitlines()[-1].split(" ")
+        self.assertLess(float(total), STARTUP_BUDGET_SECONDS,
+                        f"import app took {float(imported):.2f}s, startup total {float(total):.2f}s")
+        self.assertEqual(eager, "-", "heavy SDKs should load on first use, not at import")
+
+
+if __name__ == "__main__":
+    unittest.main()
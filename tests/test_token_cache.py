@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.token_cache import EXPIRY_LEEWAY, TokenCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TokenCache(max_entries=2, negative_ttl=30, clock=self.clock)
+        self.claims = {"uid": "u1", "exp": self.clock.now + 3600}
+
+    def test_hit_until_exp(self):
+        self.assertIsNone(self.cache.get("tok"))
+        self.cache.put("tok", self.claims)
+        self.assertEqual(self.cache.get("tok"), self.claims)
+        self.clock.now = self.claims["exp"] - EXPIRY_LEEWAY
+        self.assertIsNone(self.cache.get("tok"))
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_expired_token_not_cached(self):
+        self.cache.put("tok", {"uid": "u1", "exp": self.clock.now})
+        self.assertIsNone(self.cache.get("tok"))
+
+    def test_negative_cache(self):
+        self.cache.reject("bad")
+        self.assertIs(self.cache.get("bad"), TokenCache.REJECTED)
+        self.clock.now += 31
+        self.assertIsNone(self.cache.get("bad"))
+
+    def test_lru_cap(self):
+        self.cache.put("a", self.claims)
+        self.cache.put("b", self.claims)
+        self.cache.get("a")
+        self.cache.put("c", self.claims)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+
+    def test_stats(self):
+        self.cache.put("tok", self.claims)
+        self.cache.get("tok")
+        self.cache.get("other")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
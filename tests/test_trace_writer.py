@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.trace_writer import TraceWriter
+
+
+class GatedTraceWriter(TraceWriter):
+    """Holds the first batch until released, so the queue can be filled deterministically."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def _write(self, batch):
+        self.writing.set()
+        self.release.wait(5)
+        self.batches.append(len(batch))
+        super()._write(batch)
+
+
+class TestTraceWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.tmp.name, "trace.index")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def replay(self, i):
+        return os.path.join(self.tmp.name, f"r{i}.aoe2record")
+
+    def start_gated(self, maxsize):
+        writer = GatedTraceWriter(index_path=self.index_path, maxsize=maxsize)
+        writer.submit(self.replay(0), "block 0")
+        self.assertTrue(writer.writing.wait(5))  # the writer holds record 0
+        return writer
+
+    def test_submit_batches_traces_and_index(self):
+        writer = self.start_gated(maxsize=10)
+        for i in range(1, 4):
+            writer.submit(self.replay(i), f"block {i}")
+        writer.release.set()
+        writer.stop()
+
+        self.assertEqual(writer.batches, [1, 3])
+        for i in range(4):
+            with open(self.replay(i) + ".trace") as f:
+                self.assertEqual(f.read(), f"block {i}\n")
+        with open(self.index_path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual([line.split(" - ")[1] for line in lines], [self.replay(i) for i in range(4)])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = self.start_gated(maxsize=2)
+        start = time.monotonic()
+        for i in range(1, 6):
+            writer.submit(self.replay(i), f"block {i}")
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(writer.dropped, 3)
+
+        writer.release.set()
+        writer.stop()
+        self.assertEqual(writer.batches, [1, 2])
+        self.assertFalse(os.path.exists(self.replay(3) + ".trace"))
+
+    def test_stop_without_submit(self):
+        writer = TraceWriter(index_path=self.index_path)
+        writer.stop()
+        self.assertFalse(os.path.exists(self.index_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.user_cache import UserCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestUserCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = UserCache(ttl=60, max_entries=2, clock=self.clock)
+        self.snapshot = {"uid": "u1", "in_game_name": "Alice", "is_admin": False}
+
+    def test_hit_until_ttl(self):
+        self.assertIsNone(self.cache.get("u1"))
+        self.cache.put("u1", self.snapshot, self.cache.generation)
+        self.assertEqual(self.cache.get("u1"), self.snapshot)
+        self.clock.now += 60
+        self.assertIsNone(self.cache.get("u1"))
+        self.assertEqual(self.cache.stats()["hit_ratio"], round(1 / 3, 4))
+
+    def test_invalidate_one_uid(self):
+        self.cache.put("u1", self.snapshot, self.cache.generation)
+        self.cache.put("u2", {"uid": "u2"}, self.cache.generation)
+        self.cache.invalidate("u1")
+        self.assertIsNone(self.cache.get("u1"))
+        self.assertIsNotNone(self.cache.get("u2"))
+        self.cache.invalidate("")
+        self.assertIsNone(self.cache.get("u2"))
+
+    def test_stale_read_not_stored(self):
+        generation = self.cache.generation
+        self.cache.invalidate("u1")  # write lands while the miss is querying
+        self.cache.put("u1", self.snapshot, generation)
+        self.assertIsNone(self.cache.get("u1"))
+
+    def test_patch_keeps_entry(self):
+        self.cache.put("u1", self.snapshot, self.cache.generation)
+        self.cache.patch("u1", last_seen="now")
+        self.assertEqual(self.cache.get("u1")["last_seen"], "now")
+        self.assertEqual(self.snapshot.get("last_seen"), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# utils/civs.py
+
+# ───────────────────────────────────────────────
+# 🏰 Civilization IDs ↔ names
+# ───────────────────────────────────────────────
+#
+# The replay parser stores players' civilizations as the integer civ IDs
+# mgz reads from the header; older rows and hand-fixed games hold names.
+# Everything keyed by civ (game_players, player_stats, civ_meta_rollup)
+# goes through civ_name() so both spellings land on the same key.
+
+UNKNOWN_CIV = "Unknown"
+
+CIV_NAMES = {
+    1: "Britons", 2: "Franks", 3: "Goths", 4: "Teutons", 5: "Japanese",
+    6: "Chinese", 7: "Byzantines", 8: "Persians", 9: "Saracens", 10: "Turks",
+    11: "Vikings", 12: "Mongols", 13: "Celts", 14: "Spanish", 15: "Aztecs",
+    16: "Mayans", 17: "Huns", 18: "Koreans", 19: "Italians", 20: "Hindustanis",
+    21: "Incas", 22: "Magyars", 23: "Slavs", 24: "Portuguese", 25: "Ethiopians",
+    26: "Malians", 27: "Berbers", 28: "Khmer", 29: "Malay", 30: "Burmese",
+    31: "Vietnamese", 32: "Bulgarians", 33: "Tatars", 34: "Cumans", 35: "Lithuanians",
+    36: "Burgundians", 37: "Sicilians", 38: "Poles", 39: "Bohemians", 40: "Dravidians",
+    41: "Bengalis", 42: "Gurjaras", 43: "Romans", 44: "Armenians", 45: "Georgians",
+}
+CIV_IDS = {name.lower(): civ_id for civ_id, name in CIV_NAMES.items()}
+CIV_IDS["indians"] = 20  # pre-2022 name for Hindustanis
+
+
+def _as_civ_id(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def civ_name(value, max_length: int = 50) -> str:
+    """Name for a civ ID or name; unmapped IDs become their decimal string."""
+    civ_id = _as_civ_id(value)
+    if civ_id is not None:
+        name = CIV_NAMES.get(civ_id, str(civ_id))
+    else:
+        name = str(value).strip() if value not in (None, "") else UNKNOWN_CIV
+    return name[:max_length] or UNKNOWN_CIV
+
+
+def civ_values(query: str) -> list:
+    """Every way a civ given by name or ID may be stored in game_stats.players."""
+    civ_id = _as_civ_id(query)
+    if civ_id is None:
+        civ_id = CIV_IDS.get(str(query).strip().lower())
+    values = []
+    if civ_id is not None:
+        values += [civ_id, CIV_NAMES.get(civ_id)]
+    if _as_civ_id(query) is None:
+        values.append(str(query).strip())
+    return list(dict.fromkeys(v for v in values if v is not None))
@@ -0,0 +1,226 @@
+# utils/content_encoding.py
+
+import gzip
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+# ───────────────────────────────────────────────
+# 📦 Request body codings (client + server share these)
+# ───────────────────────────────────────────────
+IDENTITY = "identity"
+DEFAULT_MAX_DECOMPRESSED_BYTES = 8 * 1024 * 1024
+MIN_COMPRESS_BYTES = 1024
+
+
+class UnsupportedEncoding(ValueError):
+    pass
+
+
+class PayloadTooLarge(ValueError):
+    pass
+
+
+def available_encodings():
+    """Codings this process can both produce and decode, best first."""
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def accept_encoding_header():
+    return ", ".join(available_encodings())
+
+
+def parse_accept_encoding(value):
+    """Parse an `Accept-Encoding` header into a list of coding names."""
+    if not value:
+        return []
+    codings = []
+    for part in value.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params:
+            key, _, val = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    pass
+        if name and q > 0:
+            codings.append(name)
+    return codings
+
+
+def choose_encoding(server_codings):
+    """Pick the best coding supported by both sides, or identity."""
+    for name in available_encodings():
+        if name in server_codings:
+            return name
+    return IDENTITY
+
+
+def compress(raw: bytes, encoding: str) -> bytes:
+    if encoding == IDENTITY:
+        return raw
+    if encoding == "gzip":
+        return gzip.compress(raw, compresslevel=6)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    raise UnsupportedEncoding(encoding)
+
+
+# ───────────────────────────────────────────────
+# 🌊 Streaming decoder with a hard output limit
+# ───────────────────────────────────────────────
+class _LimitedSink:
+    def __init__(self, limit):
+        self.limit = limit
+        self.buffer = bytearray()
+
+    def write(self, data):
+        if len(self.buffer) + len(data) > self.limit:
+            raise PayloadTooLarge(f"Decompressed body exceeds {self.limit} bytes")
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+class _ZstdFrameTracker:
+    """
+    Follow zstd frame and block headers (RFC 8878) through the compressed
+    bytes, skipping block contents, to tell whether the body ended on a
+    frame boundary. The streaming writer decodes a cut-off frame without
+    complaint, so finish() asks this instead.
+    """
+
+    ZSTD_MAGIC = 0xFD2FB528
+    SKIPPABLE_MAGIC = 0x184D2A50  # low 4 bits are free
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._state = "magic"
+        self._skip = 0            # bytes still to skip in the current state
+        self._last = False        # current block is the frame's last
+        self._checksum = False    # current frame ends with a 4-byte checksum
+        self.frames = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.frames > 0 and self._state == "magic" and not self._buffer
+
+    def feed(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        while self._step():
+            pass
+
+    def _skipped(self) -> bool:
+        taken = min(self._skip, len(self._buffer))
+        del self._buffer[:taken]
+        self._skip -= taken
+        return self._skip == 0
+
+    def _step(self) -> bool:
+        buffer = self._buffer
+        if self._state == "magic":
+            if len(buffer) < 8:
+                return False
+            magic = int.from_bytes(buffer[:4], "little")
+            if magic & 0xFFFFFFF0 == self.SKIPPABLE_MAGIC:
+                self._skip, self._state = 8 + int.from_bytes(buffer[4:8], "little"), "skippable"
+                return True
+            if magic != self.ZSTD_MAGIC:
+                raise ValueError("Invalid zstd frame")
+            descriptor = buffer[4]
+            single_segment = (descriptor >> 5) & 1
+            self._checksum = bool((descriptor >> 2) & 1)
+            self._skip = (
+                5 + (1 - single_segment)
+                + (0, 1, 2, 4)[descriptor & 3]                      # dictionary ID
+                + (single_segment, 2, 4, 8)[descriptor >> 6]        # frame content size
+            )
+            self._state = "frame_header"
+            return True
+        if self._state == "block":
+            if len(buffer) < 3:
+                return False
+            header = int.from_bytes(buffer[:3], "little")
+            del buffer[:3]
+            block_type = (header >> 1) & 3
+            if block_type == 3:
+                raise ValueError("Invalid zstd block")
+            self._last = bool(header & 1)
+            self._skip = 1 if block_type == 1 else header >> 3    # RLE blocks hold one byte
+            self._state = "block_content"
+            return True
+        if not self._skipped():
+            return False
+        if self._state == "frame_header":
+            self._state = "block"
+        elif self._state == "block_content" and not self._last:
+            self._state = "block"
+        elif self._state == "block_content" and self._checksum:
+            self._skip, self._state = 4, "checksum"
+        else:
+            if self._state != "skippable":
+                self.frames += 1
+            self._state = "magic"
+        return True
+
+
+class StreamingBodyDecoder:
+    """
+    Incrementally decode a request body chunk by chunk.
+
+    Output is never allowed to grow past `limit` bytes, so a small
+    compressed body cannot expand into an unbounded allocation.
+    """
+
+    def __init__(self, encoding: str, limit: int = DEFAULT_MAX_DECOMPRESSED_BYTES):
+        self.encoding = (encoding or IDENTITY).strip().lower()
+        self._sink = _LimitedSink(limit)
+        self._zlib = None
+        self._zstd = None
+        self._zstd_frames = None
+
+        if self.encoding == "gzip":
+            self._zlib = zlib.decompressobj(wbits=31)
+        elif self.encoding == "deflate":
+            self._zlib = zlib.decompressobj(wbits=15)
+        elif self.encoding == "zstd" and zstandard is not None:
+            self._zstd = zstandard.ZstdDecompressor().stream_writer(
+                self._sink, write_size=64 * 1024, closefd=False
+            )
+            self._zstd_frames = _ZstdFrameTracker()
+        elif self.encoding != IDENTITY:
+            raise UnsupportedEncoding(self.encoding)
+
+    def feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        if self._zlib is not None:
+            data = chunk
+            while data:
+                room = self._sink.limit - len(self._sink.buffer)
+                self._sink.write(self._zlib.decompress(data, room + 1))
+                data = self._zlib.unconsumed_tail
+        elif self._zstd is not None:
+            self._zstd_frames.feed(chunk)
+            self._zstd.write(chunk)
+        else:
+            self._sink.write(chunk)
+
+    def finish(self) -> bytes:
+        if self._zlib is not None:
+            self._sink.write(self._zlib.flush())
+            if not self._zlib.eof:
+                raise ValueError("Truncated compressed body")
+        elif self._zstd is not None:
+            self._zstd.flush()
+            if not self._zstd_frames.complete:
+                raise ValueError("Truncated compressed body")
+        return bytes(self._sink.buffer)
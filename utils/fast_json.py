@@ -0,0 +1,22 @@
+# utils/fast_json.py
+
+import json
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+# ───────────────────────────────────────────────
+# ⚡ Bytes-in / bytes-out JSON, orjson when available
+# ───────────────────────────────────────────────
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,21 +1,26 @@
 """
-Single-point Firebase-Admin initialisation **plus** a synchronous helper
-for verifying Firebase ID tokens.  Import `verify_firebase_token()` from
-your FastAPI dependencies (no await needed).
+Single-point Firebase-Admin initialisation **plus** helpers for verifying
+Firebase ID tokens.  Async code should await `decode_id_token_async()`,
+which keeps the signature check off the event loop; `verify_firebase_token()`
+remains the synchronous entry point.
+
+firebase_admin and google.auth are imported, and the service-account file
+read, on first use only, so importing this module costs a worker nothing.
 """
 
 from __future__ import annotations
 
 import os
+import asyncio
+import threading
 import traceback
-import jwt  # PyJWT – comes in via firebase-admin
+from concurrent.futures import ThreadPoolExecutor
 
-import firebase_admin
-from firebase_admin import auth, credentials, exceptions as fb_exc
+from utils.google_certs import cert_store
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# 🔐  Initialise the Admin SDK exactly once
+# 🔐  Initialise the Admin SDK exactly once, on first use
 # ──────────────────────────────────────────────────────────────────────────────
 _CERT_PATH = os.getenv(
     "GOOGLE_APPLICATION_CREDENTIALS",
@@ -25,12 +30,92 @@ _CERT_PATH = os.getenv(
 # Let callers override the project if they need to (e.g. multiple SA keys)
 _PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
 
-if not firebase_admin._apps:
-    cred = credentials.Certificate(_CERT_PATH)
-    firebase_admin.initialize_app(
-        cred,
-        {"projectId": _PROJECT_ID or cred.project_id},
-    )
+_init_lock = threading.Lock()
+
+
+def get_firebase_app():
+    """The default firebase_admin app, initialised on the first call."""
+    import firebase_admin
+    from firebase_admin import credentials
+
+    if not firebase_admin._apps:
+        with _init_lock:
+            if not firebase_admin._apps:
+                cred = credentials.Certificate(_CERT_PATH)
+                firebase_admin.initialize_app(
+                    cred,
+                    {"projectId": _PROJECT_ID or cred.project_id},
+                )
+    return firebase_admin.get_app()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧮  Token decoding (sync core + executor wrapper)
+# ──────────────────────────────────────────────────────────────────────────────
+# RSA checks hold the GIL only briefly, so a few threads keep up with a
+# worker's cache misses without ever blocking the loop.
+VERIFY_WORKERS = int(os.getenv("FIREBASE_VERIFY_WORKERS", "4"))
+_verify_executor = ThreadPoolExecutor(
+    max_workers=VERIFY_WORKERS, thread_name_prefix="firebase-verify"
+)
+
+
+def _decode_with_cached_certs(id_token: str, certs: dict) -> dict:
+    """Same checks as auth.verify_id_token, against the background-refreshed certs."""
+    from firebase_admin import auth
+    from google.auth import jwt as google_jwt
+
+    project_id = _PROJECT_ID or get_firebase_app().project_id
+    try:
+        decoded = google_jwt.decode(id_token, certs=certs, audience=project_id)
+    except ValueError as err:
+        raise auth.InvalidIdTokenError(f"Invalid ID token: {err}", cause=err)
+    if decoded.get("iss") != f"https://securetoken.google.com/{project_id}":
+        raise auth.InvalidIdTokenError("ID token has an unexpected issuer")
+    sub = decoded.get("sub")
+    if not isinstance(sub, str) or not sub or len(sub) > 128:
+        raise auth.InvalidIdTokenError("ID token has an invalid subject")
+    decoded["uid"] = sub
+    return decoded
+
+
+def decode_id_token(id_token: str) -> dict:
+    """
+    Verify a Firebase ID token and return its claims (blocking).
+
+    Uses the background-refreshed Google certs when they cover the token's
+    key id; otherwise falls back to firebase_admin, which fetches certs
+    itself. Emulator tokens are unsigned and only decoded.
+    """
+    from firebase_admin import auth
+    from google.auth import jwt as google_jwt
+
+    if not id_token:
+        raise auth.InvalidIdTokenError("ID token is empty")
+
+    # Running against the Auth emulator?  Its tokens are unsigned.
+    if os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
+        import jwt  # PyJWT – comes in via firebase-admin
+
+        decoded = jwt.decode(id_token, options={"verify_signature": False})
+        decoded.setdefault("uid", decoded.get("user_id") or decoded.get("sub"))
+        return decoded
+
+    certs = cert_store.certs
+    try:
+        kid = google_jwt.decode_header(id_token).get("kid")
+    except ValueError as err:
+        raise auth.InvalidIdTokenError(f"Malformed ID token: {err}", cause=err)
+    if certs and kid in certs:
+        return _decode_with_cached_certs(id_token, certs)
+
+    # Signature + expiry only – no revocation checks (quicker + fewer 401s)
+    return auth.verify_id_token(id_token, check_revoked=False, app=get_firebase_app())
+
+
+async def decode_id_token_async(id_token: str) -> dict:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_verify_executor, decode_id_token, id_token)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -48,21 +133,15 @@ def verify_firebase_token(id_token: str) -> tuple[str, bool, str | None]:
     ------
     firebase_admin.exceptions.*  – caller should translate into HTTP 401.
     """
-    if not id_token:
-        raise fb_exc.InvalidIdTokenError("ID token is empty")
+    from firebase_admin import exceptions as fb_exc
 
-    # Running against the Auth emulator?  Its tokens are unsigned.
-    if os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
-        decoded = jwt.decode(id_token, options={"verify_signature": False})
-    else:
-        try:
-            # Signature + expiry only – no revocation checks (quicker + fewer 401s)
-            decoded = auth.verify_id_token(id_token, check_revoked=False)
-        except fb_exc.FirebaseError as err:
-            # Push a clear traceback to the console for debugging
-            print("🛑 Firebase verification failed:", err)
-            traceback.print_exc()
-            raise
+    try:
+        decoded = decode_id_token(id_token)
+    except fb_exc.FirebaseError as err:
+        # Push a clear traceback to the console for debugging
+        print("🛑 Firebase verification failed:", err)
+        traceback.print_exc()
+        raise
 
     uid: str = decoded["uid"]
     provider: str = decoded.get("firebase", {}).get("sign_in_provider", "")
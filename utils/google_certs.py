@@ -0,0 +1,100 @@
+# utils/google_certs.py
+
+import re
+import time
+import asyncio
+import logging
+
+# ───────────────────────────────────────────────
+# 📜 Google ID-token signing certs, refreshed in the background
+# ───────────────────────────────────────────────
+#
+# firebase_admin fetches these lazily inside verify_id_token, i.e. with a
+# blocking HTTPS call in whatever request happens to find them expired.
+# Here a per-worker task refreshes them ahead of their Cache-Control
+# max-age and keeps serving the last good set if Google is unreachable.
+
+logger = logging.getLogger(__name__)
+
+CERT_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+DEFAULT_MAX_AGE = 3600
+REFRESH_MARGIN = 300      # refresh this many seconds before max-age runs out
+RETRY_DELAY = 30
+FETCH_TIMEOUT = 10
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: str | None) -> int:
+    match = _MAX_AGE_RE.search(cache_control or "")
+    return int(match.group(1)) if match else DEFAULT_MAX_AGE
+
+
+class CertStore:
+    def __init__(self, url: str = CERT_URL):
+        self.url = url
+        self.certs = None        # {kid: PEM}; last good set, never cleared on failure
+        self.expires_at = 0.0
+        self.refreshes = 0
+        self.failures = 0
+
+    def fetch(self) -> int:
+        """Blocking fetch; run it in an executor. Returns the max-age in seconds."""
+        import requests
+
+        response = requests.get(self.url, timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        certs = response.json()
+        if not isinstance(certs, dict) or not certs:
+            raise ValueError("Unexpected cert payload")
+        max_age = parse_max_age(response.headers.get("Cache-Control"))
+        self.certs = certs
+        self.expires_at = time.time() + max_age
+        self.refreshes += 1
+        return max_age
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.certs is not None,
+            "kids": sorted(self.certs or {}),
+            "expires_in": round(self.expires_at - time.time()) if self.certs else None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+
+cert_store = CertStore()
+_refresh_task = None
+
+
+async def _refresh_forever(store: CertStore):
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            max_age = await loop.run_in_executor(None, store.fetch)
+            delay = max(max_age - REFRESH_MARGIN, RETRY_DELAY)
+            logger.info(f"📜 Refreshed Google signing certs; next refresh in {delay}s")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            store.failures += 1
+            delay = RETRY_DELAY
+            logger.warning(f"🔁 Cert refresh failed, keeping last good certs: {e}")
+        await asyncio.sleep(delay)
+
+
+def start_cert_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(_refresh_forever(cert_store))
+
+
+async def stop_cert_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
@@ -0,0 +1,101 @@
+# utils/invalidation.py
+
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import event, text
+
+# ───────────────────────────────────────────────
+# 📣 Cross-worker cache invalidation over Postgres LISTEN/NOTIFY
+# ───────────────────────────────────────────────
+#
+# Writers call `publish()` inside their transaction; Postgres delivers the
+# NOTIFY to every listening worker only once the transaction commits. The
+# publishing worker runs its own callbacks right after commit so it never
+# waits on the round trip.
+
+logger = logging.getLogger(__name__)
+
+_callbacks = defaultdict(list)
+_listener_task = None
+RECONNECT_DELAY = 5
+
+
+def subscribe(channel: str, callback) -> None:
+    """Register `callback(payload: str)` for notifications on `channel`."""
+    _callbacks[channel].append(callback)
+
+
+def _dispatch(channel: str, payload: str) -> None:
+    for callback in _callbacks.get(channel, []):
+        try:
+            callback(payload)
+        except Exception as e:
+            logger.warning(f"❌ Invalidation callback for {channel} failed: {e}")
+
+
+async def publish(session, channel: str, payload: str = "") -> None:
+    """Queue a notification that is sent when `session` commits."""
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": payload},
+    )
+    event.listen(
+        session.sync_session,
+        "after_commit",
+        lambda _session: _dispatch(channel, payload),
+        once=True,
+    )
+
+
+# ───────────────────────────────────────────────
+# 👂 Listener task (one dedicated connection per worker)
+# ───────────────────────────────────────────────
+async def _listen_forever():
+    import asyncpg
+    from db.db import DATABASE_URL, connect_args
+
+    dsn = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(dsn, ssl=connect_args.get("ssl"))
+            for channel in list(_callbacks):
+                await conn.add_listener(
+                    channel, lambda _conn, _pid, chan, payload: _dispatch(chan, payload)
+                )
+            # Anything published while we were disconnected was missed
+            for channel in list(_callbacks):
+                _dispatch(channel, "")
+            logger.info(f"👂 Listening for invalidations on {sorted(_callbacks)}")
+
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            await closed.wait()
+            logger.warning("🔌 Invalidation listener connection closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"🔁 Invalidation listener failed: {e}")
+        finally:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+def start_listener() -> None:
+    global _listener_task
+    if _listener_task is None and _callbacks:
+        _listener_task = asyncio.create_task(_listen_forever())
+
+
+async def stop_listener() -> None:
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
@@ -0,0 +1,136 @@
+# utils/online_index.py
+
+import time
+import heapq
+from datetime import datetime, timezone
+
+# ───────────────────────────────────────────────
+# 🟢 Who is online, ordered by expiry
+# ───────────────────────────────────────────────
+#
+# `_expires` holds each uid's current expiry; the heap holds (expiry, uid)
+# pairs and may contain outdated ones, which are skipped when popped. A
+# ping is one dict write plus one heappush, O(log n). Expired users are
+# pruned lazily from the heap top, so reading the list is O(k) in the
+# number of users online (plus amortised pruning).
+#
+# `on_change(kind, uid, profile)` is called with "online" when a uid joins
+# and "offline" when it expires or is discarded; the WebSocket presence hub
+# turns these into pushed diffs.
+#
+# expire_soon() marks when a user left (last socket closed). Touches seen
+# before that moment, such as the echo of an earlier heartbeat arriving
+# through a presence flush, must not push the expiry back out, so they
+# are ignored until the user is seen again.
+
+ONLINE_WINDOW = 120       # seconds; same 2 minutes the SQL query used
+COMPACT_SLACK = 1024      # outdated heap entries tolerated beyond 2×live
+
+
+def epoch(dt: datetime) -> float:
+    """Naive datetimes in this codebase are UTC (datetime.utcnow)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class OnlineIndex:
+    def __init__(self, window: float = ONLINE_WINDOW, clock=time.time):
+        self.window = window
+        self.clock = clock
+        # False until seeded from the database after a worker (re)start
+        self.ready = False
+        self._expires = {}     # uid -> expires_at
+        self._profiles = {}    # uid -> {"uid", "in_game_name", "verified"}
+        self._left = {}        # uid -> when its last socket closed, until seen again
+        self._heap = []
+        self.on_change = None
+
+    def _changed(self, kind: str, uid: str, profile: dict | None) -> None:
+        if self.on_change is not None:
+            self.on_change(kind, uid, profile)
+
+    def touch(self, uid: str, seen_at: float | None = None, profile: dict | None = None) -> None:
+        seen_at = seen_at if seen_at is not None else self.clock()
+        left_at = self._left.get(uid)
+        if left_at is not None:
+            if seen_at <= left_at:
+                return
+            del self._left[uid]
+        expires_at = seen_at + self.window
+        if profile is not None:
+            self._profiles[uid] = profile
+        current = self._expires.get(uid)
+        if current is not None and current >= expires_at:
+            return
+        self._expires[uid] = expires_at
+        heapq.heappush(self._heap, (expires_at, uid))
+        if len(self._heap) > 2 * (len(self._expires) + len(self._left)) + COMPACT_SLACK:
+            self._compact()
+        if current is None:
+            self._changed("online", uid, self._profiles.get(uid))
+
+    def expire_soon(self, uid: str, delay: float, left_at: float | None = None) -> None:
+        """Expire a uid `delay` seconds after it left (its last socket closed)."""
+        current = self._expires.get(uid)
+        left_at = left_at if left_at is not None else self.clock()
+        # Unknown, seen again since leaving (e.g. reconnected elsewhere), or
+        # an older leave arriving late
+        if current is None or current - self.window > left_at or self._left.get(uid, left_at) > left_at:
+            return
+        self._left[uid] = left_at
+        heapq.heappush(self._heap, (left_at + self.window, uid))  # drops the mark
+        expires_at = left_at + delay
+        if expires_at < current:
+            self._expires[uid] = expires_at
+            heapq.heappush(self._heap, (expires_at, uid))
+
+    def discard(self, uid: str) -> None:
+        # The heap entry goes stale and is skipped when it surfaces
+        self._left.pop(uid, None)
+        if self._expires.pop(uid, None) is not None:
+            self._changed("offline", uid, self._profiles.pop(uid, None))
+
+    def profile(self, uid: str) -> dict | None:
+        return self._profiles.get(uid)
+
+    def _prune(self) -> None:
+        now = self.clock()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, uid = heapq.heappop(heap)
+            if self._expires.get(uid) == expires_at:
+                del self._expires[uid]
+                self._changed("offline", uid, self._profiles.pop(uid, None))
+            # A leave mark outlives the user: echoes seen before it stay
+            # ignored until they could no longer be online anyway
+            left_at = self._left.get(uid)
+            if left_at is not None and left_at + self.window <= now:
+                del self._left[uid]
+
+    def _compact(self) -> None:
+        self._heap = [(expires_at, uid) for uid, expires_at in self._expires.items()]
+        self._heap += [(left_at + self.window, uid) for uid, left_at in self._left.items()]
+        heapq.heapify(self._heap)
+
+    def sweep(self) -> None:
+        """Expire due entries now rather than on the next read."""
+        self._prune()
+
+    def online(self) -> list:
+        self._prune()
+        return [self._profiles.get(uid) or {"uid": uid} for uid in self._expires]
+
+    def count(self) -> int:
+        self._prune()
+        return len(self._expires)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "online": self.count(),
+            "heap_entries": len(self._heap),
+        }
+
+
+online_index = OnlineIndex()
@@ -0,0 +1,23 @@
+# utils/pagination.py
+
+import base64
+import json
+from datetime import datetime
+
+# ───────────────────────────────────────────────
+# 🔖 Opaque keyset cursors over (timestamp, id)
+# ───────────────────────────────────────────────
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of `encode_cursor`; raises ValueError for anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # game_stats.timestamp is NOT NULL; a null here never came from us
+        return datetime.fromisoformat(ts), int(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
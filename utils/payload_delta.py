@@ -0,0 +1,48 @@
+# utils/payload_delta.py
+
+# ───────────────────────────────────────────────
+# 🔀 Top-level deltas between two ingest documents
+# ───────────────────────────────────────────────
+#
+#   {"set":    {key: value, ...},     changed or added keys
+#    "unset":  [key, ...],            removed keys
+#    "append": {key: [items], ...}}   list keys that only grew at the end
+#
+# Live iterations of one game mostly change a handful of scalars
+# (duration, hash, iteration) plus scores and newly appended events,
+# so a flat delta is small and trivial to apply on the server.
+
+
+def make_delta(base: dict, new: dict) -> dict:
+    delta = {"set": {}, "unset": [], "append": {}}
+    for key, value in new.items():
+        if key not in base:
+            delta["set"][key] = value
+            continue
+        old = base[key]
+        if old == value:
+            continue
+        if (
+            isinstance(old, list)
+            and isinstance(value, list)
+            and len(value) > len(old)
+            and value[:len(old)] == old
+        ):
+            delta["append"][key] = value[len(old):]
+        else:
+            delta["set"][key] = value
+    delta["unset"] = [key for key in base if key not in new]
+    return {k: v for k, v in delta.items() if v}
+
+
+def apply_delta(base: dict, delta: dict) -> dict:
+    doc = dict(base)
+    for key in delta.get("unset", []):
+        doc.pop(key, None)
+    for key, items in delta.get("append", {}).items():
+        existing = doc.get(key)
+        if not isinstance(existing, list):
+            raise ValueError(f"Cannot append to non-list field '{key}'")
+        doc[key] = existing + list(items)
+    doc.update(delta.get("set", {}))
+    return doc
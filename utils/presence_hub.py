@@ -0,0 +1,164 @@
+# utils/presence_hub.py
+
+import time
+import asyncio
+import logging
+from collections import Counter
+
+from utils import fast_json
+
+# ───────────────────────────────────────────────
+# 📡 Pushed presence diffs for WebSocket subscribers
+# ───────────────────────────────────────────────
+#
+# An open socket keeps its user online: one hub task re-touches every
+# connected uid each HEARTBEAT_SECONDS, so there are no per-connection
+# timers and no client pings. Online/offline changes come from the online
+# index (pings, sockets, other workers' flushes, expiry) and are coalesced
+# per DIFF_INTERVAL: each tick sends at most one diff message, encoded once
+# and put on every subscriber's bounded queue without awaiting. A burst of
+# joins (e.g. clients reconnecting after a deploy) therefore costs one
+# delivery per subscriber, not one per join. A subscriber whose queue is
+# still full is too slow to keep up and is disconnected rather than
+# buffered without limit.
+
+logger = logging.getLogger(__name__)
+
+SEND_QUEUE_SIZE = 16
+HEARTBEAT_SECONDS = 30
+DIFF_INTERVAL = 1.0
+DISCONNECT_GRACE = 15     # seconds a user stays online after the last socket closes
+
+
+class Subscriber:
+    __slots__ = ("uid", "queue", "close_code")
+
+    def __init__(self, uid: str):
+        self.uid = uid
+        self.queue = asyncio.Queue(SEND_QUEUE_SIZE)
+        self.close_code = None
+
+    def evict(self, code: int = 1013) -> None:
+        """Wake the writer with a None sentinel; it closes the socket with `code`."""
+        self.close_code = code
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class PresenceHub:
+    def __init__(self, index, record=None, leave=None):
+        self.index = index
+        self.record = record      # e.g. db.presence.presence.record, to persist last_seen
+        self.leave = leave        # e.g. db.presence.presence.leave, to tell other workers
+        self._subscribers = set()
+        self._connections = Counter()   # uid -> open sockets on this worker
+        self._changes = {}              # uid -> profile (online) or None (offline); last wins
+        self._task = None
+        self.messages = 0
+        self.deliveries = 0
+        self.evictions = 0
+        index.on_change = self.publish_change
+
+    # ── subscribers ──
+    def attach(self, uid: str, profile: dict) -> Subscriber:
+        subscriber = Subscriber(uid)
+        self._connections[uid] += 1
+        self.index.touch(uid, time.time(), profile)
+        if self.record is not None:
+            self.record(uid)
+        # Snapshot first; diffs still pending may repeat in it, and applying
+        # them again is harmless
+        subscriber.queue.put_nowait(
+            fast_json.dumps({"type": "snapshot", "users": self.index.online()}).decode("utf-8")
+        )
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def detach(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        uid = subscriber.uid
+        self._connections[uid] -= 1
+        if self._connections[uid] <= 0:
+            del self._connections[uid]
+            self.index.expire_soon(uid, DISCONNECT_GRACE)
+            if self.leave is not None:
+                self.leave(uid, DISCONNECT_GRACE)
+
+    # ── fan-out ──
+    def publish_change(self, kind: str, uid: str, profile: dict | None) -> None:
+        if self._subscribers:
+            self._changes[uid] = (profile or {"uid": uid}) if kind == "online" else None
+
+    def flush_changes(self) -> None:
+        if not self._changes:
+            return
+        changes, self._changes = self._changes, {}
+        if not self._subscribers:
+            return
+        self.broadcast(fast_json.dumps({
+            "type": "diff",
+            "online": [profile for profile in changes.values() if profile is not None],
+            "offline": [uid for uid, profile in changes.items() if profile is None],
+        }).decode("utf-8"))
+
+    def broadcast(self, message: str) -> None:
+        self.messages += 1
+        slow = []
+        for subscriber in self._subscribers:
+            try:
+                subscriber.queue.put_nowait(message)
+                self.deliveries += 1
+            except asyncio.QueueFull:
+                slow.append(subscriber)
+        for subscriber in slow:
+            self._subscribers.discard(subscriber)
+            subscriber.evict()
+            self.evictions += 1
+
+    # ── heartbeat / sweep task ──
+    def heartbeat(self) -> None:
+        now = time.time()
+        for uid in self._connections:
+            self.index.touch(uid, now)
+            if self.record is not None:
+                self.record(uid)
+
+    async def _run(self):
+        last_beat = time.monotonic()
+        while True:
+            await asyncio.sleep(DIFF_INTERVAL)
+            try:
+                if time.monotonic() - last_beat >= HEARTBEAT_SECONDS:
+                    last_beat = time.monotonic()
+                    self.heartbeat()
+                # Expire due users now so their offline diffs go out this tick
+                self.index.sweep()
+                self.flush_changes()
+            except Exception as e:
+                logger.warning(f"❌ Presence hub tick failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscriber in list(self._subscribers):
+            subscriber.evict(1001)  # going away
+        self._subscribers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "connected_users": len(self._connections),
+            "messages": self.messages,
+            "deliveries": self.deliveries,
+            "evictions": self.evictions,
+        }
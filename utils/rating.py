@@ -0,0 +1,88 @@
+# utils/rating.py
+
+# ───────────────────────────────────────────────
+# 📈 Elo ratings for finals (1v1 and team games)
+# ───────────────────────────────────────────────
+#
+# A game is rated as winners vs. losers: each side plays at the mean
+# rating of its members and every member moves by the side's delta, so
+# a rated game is zero-sum between the two sides. Pure functions only;
+# storage lives in db/ratings.py.
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+# Ranks come from a Fenwick tree over integer rating buckets
+RATING_BUCKETS = 4096
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400.0))
+
+
+def split_sides(players) -> tuple[list, list]:
+    """(winners, losers) as sorted name lists; a name on both sides is dropped."""
+    players = list(players)
+    winners = {p["name"] for p in players if p.get("name") and p.get("winner")}
+    losers = {p["name"] for p in players if p.get("name") and not p.get("winner")}
+    both = winners & losers
+    return sorted(winners - both), sorted(losers - both)
+
+
+def elo_deltas(winners: dict, losers: dict, k: float = K_FACTOR) -> dict:
+    """Rating change per player, given `{name: rating}` for each side."""
+    if not winners or not losers:
+        return {}
+    winner_rating = sum(winners.values()) / len(winners)
+    loser_rating = sum(losers.values()) / len(losers)
+    delta = k * (1.0 - expected_score(winner_rating, loser_rating))
+    deltas = {name: delta for name in winners}
+    deltas.update({name: -delta for name in losers})
+    return deltas
+
+
+def rating_bucket(rating: float) -> int:
+    return min(max(int(round(rating)), 0), RATING_BUCKETS - 1)
+
+
+# ───────────────────────────────────────────────
+# 🌲 Fenwick (binary indexed) tree helpers
+# ───────────────────────────────────────────────
+#
+# Node i (1-based) holds the player count of buckets (i - lowbit(i), i].
+# Both helpers return node indexes so the same arithmetic drives the
+# in-memory tree and the rating_tree table.
+
+def fenwick_update_nodes(bucket: int, size: int = RATING_BUCKETS) -> list:
+    """Nodes to adjust when the count of `bucket` changes."""
+    nodes, i = [], bucket + 1
+    while i <= size:
+        nodes.append(i)
+        i += i & -i
+    return nodes
+
+
+def fenwick_prefix_nodes(bucket: int) -> list:
+    """Nodes whose sum is the count of buckets 0..bucket inclusive."""
+    nodes, i = [], bucket + 1
+    while i > 0:
+        nodes.append(i)
+        i -= i & -i
+    return nodes
+
+
+def fenwick_node_deltas(bucket_deltas: dict, size: int = RATING_BUCKETS) -> dict:
+    """Fold `{bucket: count change}` into `{node: count change}`, dropping zeros."""
+    nodes = {}
+    for bucket, delta in bucket_deltas.items():
+        if delta:
+            for node in fenwick_update_nodes(bucket, size):
+                nodes[node] = nodes.get(node, 0) + delta
+    return {node: delta for node, delta in nodes.items() if delta}
+
+
+def rank_from_nodes(counts: dict, bucket: int, size: int = RATING_BUCKETS) -> int:
+    """Competition rank (1 = best) of a rating in `bucket`, given node counts."""
+    total = sum(counts.get(n, 0) for n in fenwick_prefix_nodes(size - 1))
+    at_or_below = sum(counts.get(n, 0) for n in fenwick_prefix_nodes(bucket))
+    return total - at_or_below + 1
@@ -0,0 +1,219 @@
+# utils/request_logging.py
+
+import os
+import sys
+import time
+import queue
+import random
+import logging
+import logging.handlers
+from urllib.parse import parse_qsl, urlencode
+
+from utils import fast_json
+
+# ───────────────────────────────────────────────
+# 🪵 Structured request logs, written off the event loop
+# ───────────────────────────────────────────────
+#
+# RequestLogMiddleware is plain ASGI: no extra task or stream wrapping per
+# request, just a wrapped `send` to catch the status. Records go through a
+# QueueHandler on the root logger; a QueueListener thread owns the real
+# handlers, so the loop never touches a file descriptor. Routes can be
+# sampled, and errors and slow requests are always kept.
+
+logger = logging.getLogger("api.requests")
+
+QUEUE_SIZE = 10_000
+SLOW_REQUEST_MS = 1000
+REDACTED = "***"
+
+# Path prefix → fraction of requests logged; the longest matching prefix wins
+DEFAULT_SAMPLING = {
+    "/api/user/ping": 0.01,
+    "/api/health": 0.0,
+}
+
+SECRET_PARAMS = {"token", "id_token", "access_token", "key", "api_key", "password", "secret"}
+
+
+def parse_sampling(spec: str | None) -> dict:
+    """`"/api/user/ping=0.01,/api/replay=1"` → `{prefix: rate}`; bad entries are skipped."""
+    rules = {}
+    for item in (spec or "").split(","):
+        prefix, _, rate = item.strip().rpartition("=")
+        try:
+            rules[prefix] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return {prefix: rate for prefix, rate in rules.items() if prefix}
+
+
+def redact_query(query_string: str) -> str:
+    if not query_string:
+        return ""
+    pairs = parse_qsl(query_string, keep_blank_values=True)
+    return urlencode([(k, REDACTED if k.lower() in SECRET_PARAMS else v) for k, v in pairs])
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; request fields are merged in from `record.fields`."""
+
+    def format(self, record):
+        doc = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            doc.update(fields)
+        if record.exc_info:
+            doc["exc"] = self.formatException(record.exc_info)
+        return fast_json.dumps(doc).decode("utf-8")
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never blocks or writes on the loop: a full queue drops the record."""
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Leave formatting to the listener thread; only freeze the message
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# ───────────────────────────────────────────────
+# 🧵 Listener lifecycle (one per worker)
+# ───────────────────────────────────────────────
+_listener = None
+_queue_handler = None
+
+
+def start_log_listener(level: str | None = None) -> None:
+    """Move the root logger's handlers behind a queue; adds a JSON stdout handler if none."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    root = logging.getLogger()
+    handlers = root.handlers[:] or [logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        root.removeHandler(handler)
+        if handler.formatter is None:
+            handler.setFormatter(JsonFormatter())
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(QUEUE_SIZE))
+    root.addHandler(_queue_handler)
+    root.setLevel(level or os.getenv("LOG_LEVEL", "INFO"))
+    _listener = logging.handlers.QueueListener(
+        _queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and give the root logger its handlers back."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+    _queue_handler = None
+
+
+def log_stats() -> dict:
+    return {
+        "listening": _listener is not None,
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+    }
+
+
+# ───────────────────────────────────────────────
+# 🧩 ASGI middleware
+# ───────────────────────────────────────────────
+class RequestLogMiddleware:
+    def __init__(self, app, sampling: dict | None = None, slow_ms: float = SLOW_REQUEST_MS):
+        self.app = app
+        self.sampling = dict(DEFAULT_SAMPLING)
+        self.sampling.update(parse_sampling(os.getenv("REQUEST_LOG_SAMPLING")))
+        if sampling:
+            self.sampling.update(sampling)
+        # Longest prefix first, so "/api/user/ping" wins over "/api/user"
+        self._prefixes = sorted(self.sampling, key=len, reverse=True)
+        self._rates = {}
+        self.slow_ms = slow_ms
+
+    def sample_rate(self, path: str) -> float:
+        rate = self._rates.get(path)
+        if rate is None:
+            rate = next(
+                (self.sampling[p] for p in self._prefixes if path.startswith(p)), 1.0
+            )
+            # Memoised for hot paths only; paths with ids would grow it forever
+            if len(self._rates) < 1024:
+                self._rates[path] = rate
+        return rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._log(scope, status, (time.perf_counter() - start) * 1000)
+
+    def _log(self, scope, status: int, duration_ms: float) -> None:
+        # Errors are kept even when the level filters out ordinary requests
+        level = logging.WARNING if status >= 500 else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        path = scope["path"]
+        if status < 500 and duration_ms < self.slow_ms:
+            rate = self.sample_rate(path)
+            if rate < 1.0 and random.random() >= rate:
+                return
+
+        headers = dict(scope.get("headers") or ())
+        client = scope.get("client")
+        fields = {
+            "method": scope["method"],
+            "path": path,
+            "endpoint": getattr(scope.get("route"), "name", None),
+            "status": status,
+            "duration_ms": round(duration_ms, 2),
+            "client": client[0] if client else None,
+            "user_agent": headers.get(b"user-agent", b"").decode("latin-1")[:200] or None,
+            # Only whether and how the caller authenticated; never the credential
+            "auth": headers.get(b"authorization", b"").split(b" ", 1)[0].decode("latin-1") or None,
+        }
+        query = scope.get("query_string")
+        if query:
+            fields["query"] = redact_query(query.decode("latin-1"))
+        logger.log(level, "request", extra={"fields": fields})
@@ -0,0 +1,78 @@
+# utils/response_cache.py
+
+import hashlib
+from collections import OrderedDict
+
+from utils.invalidation import subscribe
+
+# ───────────────────────────────────────────────
+# 🧊 In-process cache of serialized responses with strong ETags
+# ───────────────────────────────────────────────
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the body, so every worker agrees on it."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+class ResponseCache:
+    """
+    LRU of `key → (etag, body)` that is dropped wholesale on invalidation.
+
+    `generation` increases on every invalidation; a miss captures it before
+    querying and `put()` refuses to store a body computed against an older
+    generation, so a write that lands mid-query cannot be cached stale.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, body: bytes, generation: int):
+        etag = make_etag(body)
+        if generation == self.generation:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+    def invalidate(self, _payload: str = "") -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# ───────────────────────────────────────────────
+# 📊 Shared cache for /api/game_stats listings
+# ───────────────────────────────────────────────
+GAME_STATS_CHANNEL = "game_stats_changed"
+game_stats_cache = ResponseCache()
+subscribe(GAME_STATS_CHANNEL, game_stats_cache.invalidate)
@@ -0,0 +1,87 @@
+# utils/token_cache.py
+
+import time
+import hashlib
+from collections import OrderedDict
+
+# ───────────────────────────────────────────────
+# 🎟️ Verified Firebase ID-token cache
+# ───────────────────────────────────────────────
+#
+# An ID token is valid for up to an hour and the client resends the same
+# one on every request, so after one signature check its claims can be
+# reused until the token's own `exp`. Keys are SHA-256 digests: raw tokens
+# never sit in memory longer than the request that carried them.
+# Recently rejected tokens are remembered briefly so a client retrying a
+# bad token does not pay for the crypto every time.
+
+EXPIRY_LEEWAY = 10        # seconds; drop entries a little before `exp`
+NEGATIVE_TTL = 30         # seconds to remember a rejected token
+MAX_ENTRIES = 10_000
+
+
+def token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class TokenCache:
+    REJECTED = object()
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, negative_ttl: float = NEGATIVE_TTL,
+                 clock=time.time):
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, claims | REJECTED)
+
+    def get(self, token: str):
+        """Cached claims, `TokenCache.REJECTED`, or None on a miss."""
+        key = token_key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry[1] is self.REJECTED:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry[1]
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        expires_at = exp - EXPIRY_LEEWAY
+        if expires_at > self.clock():
+            self._store(token_key(token), expires_at, claims)
+
+    def reject(self, token: str) -> None:
+        self._store(token_key(token), self.clock() + self.negative_ttl, self.REJECTED)
+
+    def _store(self, key: bytes, expires_at: float, value) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else None,
+        }
+
+
+token_cache = TokenCache()
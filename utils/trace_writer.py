@@ -0,0 +1,143 @@
+# utils/trace_writer.py
+
+import os
+import queue
+import logging
+import threading
+from datetime import datetime
+from pprint import pformat
+
+# ───────────────────────────────────────────────
+# 🧾 Background writer for per-replay .trace files
+# ───────────────────────────────────────────────
+#
+# Tracing used to happen inside GameStats.to_dict, i.e. twice per row on
+# every read, with synchronous file writes on the event loop. Finals are
+# now traced once at ingest: the request thread only formats the record
+# and enqueues it, and a daemon thread batches the writes.
+
+logger = logging.getLogger(__name__)
+
+TRACE_INDEX_PATH = "trace.index"
+QUEUE_SIZE = 1000
+BATCH_SIZE = 100
+STOP_TIMEOUT = 5.0  # seconds shutdown waits for the queue to drain
+
+_STOP = object()
+
+
+def is_render():
+    return os.getenv("RENDER") == "1"
+
+
+def trace_enabled():
+    return os.getenv("ENABLE_TRACE_LOGS", "true").lower() == "true" and not is_render()
+
+
+def format_trace(game) -> str:
+    map_data = game.map or {}
+    players = game.players or []
+
+    resigns = sum(1 for e in (game.event_types or []) if e == "resign")
+    anomalies = any("anomaly" in k.lower() for k in (game.key_events or {}))
+
+    return (
+        "\n📊 Final Game Parsed\n"
+        f"📁 File: {game.replay_file}\n"
+        f"📎 Original: {game.original_filename or 'N/A'}\n"
+        f"🏷️  Hash: {game.replay_hash}\n"
+        f"⚙️  Source: {game.parse_source or 'unknown'}\n"
+        f"🧪 Reason: {game.parse_reason or 'unspecified'}\n"
+        f"⏱️  Duration: {game.duration} sec\n"
+        f"🗺️  Map: {map_data.get('name', 'Unknown')} ({map_data.get('size', 'Unknown')})\n"
+        f"🏆 Winner: {game.winner or 'Unknown'}\n"
+        f"🧩 Iteration: {game.parse_iteration}\n"
+        f"🚪 Resigns: {resigns}\n"
+        f"🚨 Anomalies: {'Yes' if anomalies else 'No'}\n"
+        f"❌ Disconnect: {'Yes' if game.disconnect_detected else 'No'}\n"
+        f"👥 Players:\n{pformat(players)}"
+    )
+
+
+class TraceWriter:
+    def __init__(self, index_path=TRACE_INDEX_PATH, maxsize=QUEUE_SIZE):
+        self.index_path = index_path
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, replay_file: str, block: str) -> None:
+        """Enqueue a trace record; never blocks, drops when the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((replay_file, block, datetime.utcnow().isoformat()))
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="trace-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """Write out everything queued so far and stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        try:
+            # The writer is draining, so this only waits while it catches up
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("⚠️ Trace writer did not drain before shutdown")
+            return
+        thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch, item = [], self._queue.get()
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            if item is _STOP:
+                return
+
+    def _write(self, batch):
+        index_lines = []
+        for replay_file, block, ts in batch:
+            try:
+                with open(replay_file + ".trace", "w") as f:
+                    f.write(block + "\n")
+                index_lines.append(f"{ts} - {replay_file}\n")
+            except Exception as e:
+                logger.warning(f"❌ Failed to write trace file: {e}")
+        if index_lines:
+            try:
+                with open(self.index_path, "a") as idx:
+                    idx.writelines(index_lines)
+            except Exception as e:
+                logger.warning(f"❌ Failed to append {self.index_path}: {e}")
+
+
+trace_writer = TraceWriter()
+
+
+def trace_final_game(game) -> None:
+    """Trace a freshly ingested final once; a no-op when tracing is off."""
+    if not trace_enabled():
+        return
+    block = format_trace(game)
+    logger.debug(block)
+    trace_writer.submit(game.replay_file, block)
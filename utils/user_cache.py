@@ -0,0 +1,87 @@
+# utils/user_cache.py
+
+import time
+from collections import OrderedDict
+
+from utils.invalidation import subscribe
+
+# ───────────────────────────────────────────────
+# 👤 Per-worker cache of current-user rows, keyed by Firebase uid
+# ───────────────────────────────────────────────
+#
+# Every authenticated request resolves its uid to a `users` row, and the
+# row almost never changes. Writers publish the uid on USER_CHANNEL inside
+# their transaction (an empty payload drops everything); the TTL bounds
+# staleness should a notification ever be missed.
+
+USER_CHANNEL = "user_changed"
+USER_TTL = 60             # seconds
+MAX_ENTRIES = 10_000
+
+
+class UserCache:
+    """
+    LRU of `uid → column snapshot` with a per-entry TTL.
+
+    Like ResponseCache, a miss captures `generation` before querying and
+    `put()` drops a snapshot read before a later invalidation.
+    """
+
+    def __init__(self, ttl: float = USER_TTL, max_entries: int = MAX_ENTRIES,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # uid -> (expires_at, snapshot)
+
+    def get(self, uid: str):
+        entry = self._entries.get(uid)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[uid]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(uid)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, uid: str, snapshot: dict, generation: int) -> None:
+        if generation != self.generation:
+            return
+        self._entries[uid] = (self.clock() + self.ttl, snapshot)
+        self._entries.move_to_end(uid)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def patch(self, uid: str, **values) -> None:
+        """Apply a local write to a cached snapshot without invalidating it."""
+        entry = self._entries.get(uid)
+        if entry is not None:
+            self._entries[uid] = (entry[0], {**entry[1], **values})
+
+    def invalidate(self, uid: str = "") -> None:
+        self.generation += 1
+        self.invalidations += 1
+        if uid:
+            self._entries.pop(uid, None)
+        else:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+user_cache = UserCache()
+subscribe(USER_CHANNEL, user_cache.invalidate)